@@ -0,0 +1,72 @@
+# 파일명: bench/admin_rerun.py
+# ==========================================
+# ⏱️ 관리자 화면 1회 실행(rerun)당 DB 호출 수 / 소요 시간 측정
+#   python bench/admin_rerun.py                      (현재 pages/Admin.py)
+#   python bench/admin_rerun.py --file 이전버전.py     (비교용)
+#   - DB 대신 bench/stub_supabase.py 대역을 쓰고 요청마다 지연(latency)을 넣음
+#   - 패널별로 [첫 진입] / [같은 패널에서 다시 실행] 을 나눠서 측정
+# ==========================================
+import argparse
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from stub_supabase import StubClient  # noqa: E402
+
+
+def seed_tables(n_orders=200, n_logs=400, n_defects=50):
+    orders = [{"lot_no": f"ROLL2610{i:04d}", "customer": "A건설", "product": "스마트글라스",
+               "dimension": "1200x2400 [없음]", "spec": "Full | 1단계", "status": "작업대기",
+               "note": "", "fabric_lot_no": "ROLL-A", "created_at": f"2026-10-18T09:{i % 60:02d}:00"} for i in range(n_orders)]
+    logs = [{"lot_no": f"ROLL2610{i % n_orders:04d}", "step": "Full Cut", "data": "-", "worker": "작업자A",
+             "result": "OK", "created_at": f"2026-10-18T10:{i % 60:02d}:00"} for i in range(n_logs)]
+    defects = [{"lot_no": f"ROLL2610{i:04d}", "step": "Half Cut", "defect_type": "이물질", "note": "",
+                "status": "조치대기", "worker": "작업자B", "created_at": "2026-10-18T11:00:00"} for i in range(n_defects)]
+    fabric = [{"lot_no": "ROLL-A", "name": "PDLC", "width": 1200, "total_len": 100.0, "used_len": 10.0, "short_code": "ROLL"}]
+    return {"work_orders": orders, "production_logs": logs, "defects": defects, "fabric_stock": fabric}
+
+
+def install_stub(client):
+    fake = types.ModuleType("connection")
+    fake.get_supabase_client = lambda: client
+    sys.modules["connection"] = fake
+
+
+def measure(at, client, panel=None):
+    before = len(client.calls)
+    if panel is not None:
+        at.session_state["admin_panel"] = panel
+    t0 = time.perf_counter()
+    at.run(timeout=120)
+    ms = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return len(client.calls) - before, ms
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", default=os.path.join(ROOT, "pages", "Admin.py"))
+    ap.add_argument("--latency", type=float, default=0.05, help="DB 왕복 지연(초)")
+    args = ap.parse_args()
+
+    client = StubClient(seed_tables(), latency=args.latency)
+    install_stub(client)
+    os.chdir(ROOT)
+
+    at = AppTest.from_file(os.path.abspath(args.file), default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["user_role"] = "Admin"
+
+    panels = ["📝 작업 입력", "🧵 원단 재고", "📊 발행 이력", "🚨 불량 현황", "📑 견적서 작성"]
+    print(f"{os.path.relpath(args.file, ROOT)} (DB 지연 {args.latency * 1000:.0f}ms)")
+    print(f"{'패널':<14} {'첫 진입':>18} {'다시 실행':>18}")
+    for p in panels:
+        c1, m1 = measure(at, client, p)
+        c2, m2 = measure(at, client)
+        print(f"{p:<14} {c1:4d}회 {m1:8.0f}ms   {c2:4d}회 {m2:8.0f}ms")
@@ -0,0 +1,58 @@
+# 파일명: bench/bench_label_export.py
+# ==========================================
+# 📦 라벨 파일 내보내기 - 최대 메모리(RSS) / 시간 / 파일 크기 비교
+#   python bench/bench_label_export.py
+#   python bench/bench_label_export.py --sizes 100 1000 2000 5000
+#   - 측정마다 별도 프로세스에서 실행해서 최대 메모리가 섞이지 않게 함
+# ==========================================
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(fmt, n):
+    import resource
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("BT_QR_CACHE_DIR", tempfile.mkdtemp(prefix="bench_qr_"))
+    import fonts
+    from label_export import export_labels_pdf, export_labels_zip
+    from label_render import create_label_strip_image
+
+    fonts.preload()
+    items = [{"lot": f"EXPO261018G{i:04d}", "cust": "A건설", "w": 1200, "h": 2400, "elec": "가로(W) 양쪽"} for i in range(n)]
+    base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    with tempfile.TemporaryFile() as f:
+        if fmt == "png":
+            f.write(create_label_strip_image(items, workers=1))
+        elif fmt == "pdf":
+            export_labels_pdf(items, f, workers=1)
+        else:
+            export_labels_zip(items, f, workers=1)
+        size = f.tell()
+    dt = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"sec": dt, "size": size, "peak_mb": peak_kb / 1024, "extra_mb": (peak_kb - base_kb) / 1024}))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 2000])
+    args = ap.parse_args()
+
+    print(f"{'라벨 수':>8} {'형식':>6} {'시간(s)':>9} {'파일(KB)':>10} {'추가 메모리(MB)':>16}")
+    for n in args.sizes:
+        for fmt in ("png", "pdf", "zip"):
+            out = subprocess.run([sys.executable, __file__, "--child", fmt, str(n)], capture_output=True, text=True, check=True)
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{n:>8} {fmt:>6} {r['sec']:>9.2f} {r['size'] / 1024:>10,.0f} {r['extra_mb']:>16.1f}")
@@ -0,0 +1,61 @@
+# 파일명: bench/bench_label_render.py
+# ==========================================
+# 🏷️ 라벨 렌더링 처리량 측정 (라벨 수 x 프로세스 수)
+#   python bench/bench_label_render.py
+#   python bench/bench_label_render.py --sizes 100 1000 --workers 1 2 4 8
+#   - 매 측정마다 새 LOT 번호를 써서 QR 인코딩 비용까지 포함해서 잼
+# ==========================================
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# QR 디스크 캐시는 임시 폴더로 분리 (실제 .qr_cache 를 건드리지 않도록)
+os.environ.setdefault("BT_QR_CACHE_DIR", tempfile.mkdtemp(prefix="bench_qr_"))
+
+import qr_assets  # noqa: E402
+import fonts  # noqa: E402
+import label_render  # noqa: E402
+
+
+def make_items(n, tag):
+    return [{"lot": f"{tag}261018G{i:04d}", "cust": "A건설", "w": 1200, "h": 2400, "elec": "가로(W) 양쪽"} for i in range(n)]
+
+
+def default_workers():
+    cpu = os.cpu_count() or 1
+    out, w = [], 1
+    while w < cpu:
+        out.append(w)
+        w *= 2
+    return out + [cpu]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = ap.parse_args()
+
+    fonts.preload()
+    print(f"CPU {os.cpu_count()}개 | 라벨 {label_render.LABEL_W}x{label_render.LABEL_H}px | 폰트 {fonts.resolve_font_path()}")
+    print(f"{'라벨 수':>8} {'프로세스':>8} {'시간(s)':>10} {'라벨/초':>10} {'배속':>6}")
+    run = 0
+    for n in args.sizes:
+        base = None
+        for w in args.workers:
+            run += 1
+            items = make_items(n, f"B{run:03d}")
+            qr_assets._mem.clear()
+            if w > 1:
+                label_render._get_pool(w).submit(int).result()  # 프로세스 기동 시간은 제외
+            t0 = time.perf_counter()
+            tiles = label_render.render_labels(items, workers=w)
+            dt = time.perf_counter() - t0
+            assert len(tiles) == n
+            base = base or dt
+            print(f"{n:>8} {w:>8} {dt:>10.2f} {n / dt:>10.0f} {base / dt:>5.1f}x")
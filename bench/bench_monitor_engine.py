@@ -0,0 +1,125 @@
+# 파일명: bench/bench_monitor_engine.py
+# ==========================================
+# 📊 모니터 상태 계산 - 예전 화면 로직(iterrows + LOT 별 로그 필터) vs monitor_engine
+#   python bench/bench_monitor_engine.py                      (작업 10,000 / 로그 100,000)
+#   python bench/bench_monitor_engine.py --orders 100 --logs 200
+#   - [집계] 상단 박스 7개 / [1페이지] 8행 상태 계산 / [전체] 모든 행 상태 계산
+#   - 결과 비교: 예전 로직에 '시간순' 로그를 넣으면(= 최신 공정 기준) 엔진 결과와 같아야 함
+# ==========================================
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from monitor_engine import build_board, kpi_counts  # noqa: E402
+
+STATUSES = ["작업대기", "Full Cut 완료", "Half Cut 완료", "전극 작업", "접합대기", "접합", "접합 완료", "출고", "⛔ 불량(이물질)", "단품 작업대기"]
+STEPS = ["Full Cut", "Half Cut", "전극 부착", "접합 대기", "접합 진행", "접합 완료"]
+SPECS = ["Full | 1단계", "Half | 2단계", "No Lam", "접합 생략"]
+
+
+def make_data(n_orders, n_logs, seed=1):
+    rng = random.Random(seed)
+    orders = pd.DataFrame({
+        "lot_no": [f"BENCH{i:06d}" for i in range(n_orders)],
+        "status": [rng.choice(STATUSES) for _ in range(n_orders)],
+        "spec": [rng.choice(SPECS) for _ in range(n_orders)],
+        "created_at": [f"2026-10-18T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}" for i in range(n_orders)],
+    })
+    logs = pd.DataFrame({
+        "lot_no": [f"BENCH{rng.randrange(n_orders):06d}" for _ in range(n_logs)],
+        "step": [rng.choice(STEPS) for _ in range(n_logs)],
+        "created_at": [f"2026-10-18T{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}.{i:06d}" for i in range(n_logs)],
+    })
+    return orders, logs.sort_values("created_at", ascending=False, ignore_index=True)
+
+
+# ------------------------------------------
+# 예전 pages/Monitor.py 로직 그대로
+# ------------------------------------------
+def legacy_kpis(df):
+    c = dict.fromkeys(("ready", "full", "half", "elec", "lam_wait", "lam_ing", "done"), 0)
+    for _, row in df.iterrows():
+        s = str(row['status'])
+        if "불량" in s: pass
+        elif "완료" in s or "출고" in s: c["done"] += 1
+        elif "접합대기" in s: c["lam_wait"] += 1
+        elif "접합" in s: c["lam_ing"] += 1
+        elif "전극" in s: c["elec"] += 1
+        elif "Half" in s or "하프" in s: c["half"] += 1
+        elif "Full" in s or "풀" in s or "원단" in s or "Cut" in s: c["full"] += 1
+        elif "대기" in s: c["ready"] += 1
+    return c
+
+
+def legacy_rows(df_view, df_log):
+    out = []
+    for _, row in df_view.iterrows():
+        lot = row['lot_no']; spec = row['spec']; status_txt_db = str(row['status'])
+        step_pct = 5; badge = "badge-white"; txt = "작업 대기"; bar = "bg-w"
+        is_short_product = "단품" in status_txt_db or "생략" in str(spec) or "No Lam" in str(spec)
+        if not df_log.empty:
+            my_logs = df_log[df_log['lot_no'] == lot]
+            if not my_logs.empty:
+                last_step = str(my_logs.iloc[-1]['step'])
+                if "Full" in last_step or "풀" in last_step or "원단" in last_step:
+                    step_pct = 20 if not is_short_product else 30; txt = "✂️ 원단 풀커팅"; badge = "badge-blue"; bar = "bg-b"
+                elif "Half" in last_step or "하프" in last_step:
+                    step_pct = 40 if not is_short_product else 60; txt = "🔪 정밀 하프커팅"; badge = "badge-purple"; bar = "bg-p"
+                elif "전극" in last_step:
+                    if is_short_product: step_pct = 100; txt = "✅ 생산 완료 (단품)"; badge = "badge-green"; bar = "bg-g"
+                    else: step_pct = 60; txt = "⚡ 전극 부착"; badge = "badge-blue"; bar = "bg-b"
+                elif "접합" in last_step:
+                    if "완료" in last_step: step_pct = 100; txt = "✅ 생산 완료"; badge = "badge-green"; bar = "bg-g"
+                    elif "대기" in last_step: step_pct = 70; txt = "⏳ 접합 대기"; badge = "badge-yellow"; bar = "bg-y"
+                    else: step_pct = 85; txt = "🔥 접합 진행중"; badge = "badge-orange"; bar = "bg-o"
+        if "접합대기" in status_txt_db: step_pct = 70; txt = "⏳ 접합 대기"; badge = "badge-yellow"; bar = "bg-y"
+        elif "접합" in status_txt_db and "대기" not in status_txt_db: step_pct = 85; txt = "🔥 접합 진행중"; badge = "badge-orange"; bar = "bg-o"
+        elif "불량" in status_txt_db: step_pct = 100; txt = "⛔ 불량 발생"; badge = "badge-red"; bar = "bg-r"
+        elif "완료" in status_txt_db or "출고" in status_txt_db: step_pct = 100; txt = "✅ 생산 완료"; badge = "badge-green"; bar = "bg-g"
+        out.append((step_pct, txt, badge, bar))
+    return out
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    r = fn(*args)
+    return r, (time.perf_counter() - t0) * 1000
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--orders", type=int, default=10_000)
+    ap.add_argument("--logs", type=int, default=100_000)
+    ap.add_argument("--full-legacy-rows", type=int, default=500, help="예전 로직 [전체] 측정 행 수 (너무 느려서 일부만 재고 환산)")
+    args = ap.parse_args()
+
+    df, df_log = make_data(args.orders, args.logs)
+    print(f"작업 {args.orders:,} / 로그 {args.logs:,}")
+
+    board, ms_engine = timed(build_board, df, df_log)
+    kpis, ms_kpi = timed(kpi_counts, board)
+    old_kpis, ms_old_kpi = timed(legacy_kpis, df)
+    _, ms_old_page = timed(legacy_rows, df.iloc[:8], df_log)
+    n = min(args.full_legacy_rows, len(df))
+    _, ms_old_part = timed(legacy_rows, df.iloc[:n], df_log)
+    ms_old_full = ms_old_part * len(df) / n
+
+    print(f"{'항목':<14} {'예전(ms)':>12} {'엔진(ms)':>10}")
+    print(f"{'집계 박스':<14} {ms_old_kpi:>12,.1f} {ms_kpi:>10,.1f}")
+    print(f"{'1페이지(8행)':<14} {ms_old_page:>12,.1f} {'-':>10}")
+    print(f"{'전체 행':<14} {ms_old_full:>12,.0f} {ms_engine:>10,.1f}   (예전은 {n}행 측정 후 환산)")
+
+    # 결과 비교
+    sample = df.sample(min(300, len(df)), random_state=3)
+    want = legacy_rows(sample, df_log.iloc[::-1])  # 시간순 로그 → iloc[-1] 이 최신 공정
+    got = list(board.loc[sample.index, ['pct', 'txt', 'badge', 'bar']].itertuples(index=False, name=None))
+    stale = legacy_rows(sample, df_log)
+    print(f"집계 일치: {'✅' if kpis == old_kpis else '❌'} / 행 상태 일치(최신 공정 기준): {'✅' if got == want else '❌'}"
+          f" / 예전 화면과 다른 행(오래된 공정 표시 버그): {sum(a != b for a, b in zip(stale, got))}/{len(got)}")
@@ -0,0 +1,66 @@
+# 파일명: bench/bench_qr_payload.py
+# ==========================================
+# 🔳 인쇄 문서 QR 방식 비교 (PNG data URI vs 인라인 SVG)
+#   python bench/bench_qr_payload.py            (작업 지시서 400장 / 라벨 400장)
+#   python bench/bench_qr_payload.py --cards 1000
+#   - HTML 크기(원본 / gzip), 생성 시간(캐시 없음 / 캐시 있음)
+#   - playwright + chromium 이 설치돼 있으면 브라우저 렌더링 시간도 측정
+#   ※ 1비트 PNG(deflate) 가 워낙 작아서 HTML 원본 크기는 SVG 가 더 큼 - SVG 는 gzip(웹소켓 압축) 기준으로만 작음
+# ==========================================
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("BT_QR_CACHE_DIR", tempfile.mkdtemp(prefix="bench_qr_"))
+
+import qr_assets  # noqa: E402
+from print_docs import get_work_order_html, get_label_content_html  # noqa: E402
+
+
+def make_items(n, tag):
+    return [{"lot": f"{tag}261018G{i:04d}", "cust": "A건설", "prod": "스마트글라스", "w": 1200, "h": 2400,
+             "elec": "가로(W) 양쪽", "fabric": "ROLL-A", "spec_cut": "Full(50/80/20)", "spec_lam": "1단계", "note": "-"}
+            for i in range(n)]
+
+
+def browser_render_ms(html):
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page()
+            t0 = time.perf_counter()
+            page.set_content(html, wait_until="load")
+            page.evaluate("() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
+            ms = (time.perf_counter() - t0) * 1000
+            browser.close()
+            return ms
+    except Exception:
+        return None
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cards", type=int, default=400)
+    args = ap.parse_args()
+
+    print(f"{'문서':<10} {'QR':>4} {'HTML(KB)':>10} {'gzip(KB)':>10} {'생성-첫회(ms)':>14} {'생성-캐시(ms)':>14} {'브라우저(ms)':>12}")
+    for doc, builder in (("작업지시서", get_work_order_html), ("라벨", get_label_content_html)):
+        for mode in ("png", "svg"):
+            items = make_items(args.cards, f"Q{mode.upper()}{doc[:1]}")
+            qr_assets._mem.clear(); qr_assets._svg_mem.clear()
+            t0 = time.perf_counter(); html = builder(items, qr_mode=mode); cold = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter(); builder(items, qr_mode=mode); warm = (time.perf_counter() - t0) * 1000
+            raw = html.encode("utf-8")
+            render = browser_render_ms(html)
+            render_txt = f"{render:>12.0f}" if render is not None else f"{'(생략)':>12}"
+            print(f"{doc:<10} {mode:>4} {len(raw) / 1024:>10,.1f} {len(gzip.compress(raw)) / 1024:>10,.1f} "
+                  f"{cold:>14.0f} {warm:>14.0f} {render_txt}")
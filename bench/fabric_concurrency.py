@@ -0,0 +1,56 @@
+# 파일명: bench/fabric_concurrency.py
+# ==========================================
+# 🧵 동시 발행 시 원단 차감 유실 여부 확인
+#   python bench/fabric_concurrency.py
+#   - 관리자 N명이 같은 원단으로 동시에 여러 번 발행하는 상황을 재현
+#   - [기존] 읽기→계산→쓰기 방식 vs [신규] consume_fabric RPC 결과 비교
+# ==========================================
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from publish import apply_fabric_deductions, _apply_fabric_deductions_rmw  # noqa: E402
+from stub_supabase import StubClient, stub_consume_fabric  # noqa: E402
+
+ADMINS = 8
+PUBLISHES_PER_ADMIN = 10
+METERS = 1.5
+LATENCY = 0.005  # 요청 1회당 왕복 지연 (초)
+
+
+def run(label, deduct, use_rpc):
+    client = StubClient({"fabric_stock": [{"lot_no": "ROLL-A", "total_len": 500.0, "used_len": 0.0}]}, latency=LATENCY)
+    if use_rpc:
+        client.register_rpc("consume_fabric", stub_consume_fabric)
+
+    start = threading.Barrier(ADMINS)
+
+    def admin():
+        start.wait()
+        for _ in range(PUBLISHES_PER_ADMIN):
+            deduct(client, {"ROLL-A": METERS})
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=admin) for _ in range(ADMINS)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - t0
+
+    expected = ADMINS * PUBLISHES_PER_ADMIN * METERS
+    used = client.tables["fabric_stock"][0]['used_len']
+    lost = expected - used
+    print(f"{label:<22} 기대 {expected:7.1f}m | 실제 {used:7.1f}m | 유실 {lost:6.1f}m | "
+          f"요청 {len(client.calls):4d}회 | {elapsed * 1000:7.1f}ms")
+    return lost
+
+
+if __name__ == "__main__":
+    print(f"관리자 {ADMINS}명 x 발행 {PUBLISHES_PER_ADMIN}회 x {METERS}m (왕복 지연 {LATENCY * 1000:.0f}ms)")
+    run("[기존] read-modify-write", _apply_fabric_deductions_rmw, use_rpc=False)
+    lost = run("[신규] consume_fabric", apply_fabric_deductions, use_rpc=True)
+    if lost:
+        sys.exit("❌ RPC 경로에서 차감분 유실 발생")
+    print("✅ RPC 경로: 동시 발행에서도 차감분 유실 없음")
@@ -0,0 +1,97 @@
+# 파일명: bench/fetch_latency.py
+# ==========================================
+# 🚚 독립 조회 동시 실행(db_fetch.fetch_all) 효과 - 차례대로(BT_FETCH_WORKERS=0) vs 동시에
+#   python bench/fetch_latency.py
+#   python bench/fetch_latency.py --latency 0.1 --repeat 5
+#   - DB 는 bench/stub_supabase.py 대역 (요청마다 왕복 지연 주입)
+#   - [모니터] 조회기 첫 화면 / 수동 새로고침: 작업 지시 + 로그 + 집계(monitor_kpis)
+#   - [관리자] 제품 추적 검색: work_orders 1행 + 로그 이력 (pages/Admin.py 를 AppTest 로 실행)
+#   - [제한 시간] 로그 조회만 2초 걸릴 때 0.5초 제한 → 나머지 결과는 바로 받고 로그만 시간 초과
+# ==========================================
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db_cache  # noqa: E402
+import db_fetch  # noqa: E402
+from admin_rerun import install_stub, seed_tables  # noqa: E402
+from monitor_sync import MonitorFeed  # noqa: E402
+from stub_supabase import StubClient, stub_monitor_kpis  # noqa: E402
+
+
+def monitor_ms(latency, repeat):
+    first, manual = [], []
+    for _ in range(repeat):
+        client = StubClient(seed_tables(), latency=latency)
+        client.register_rpc("monitor_kpis", stub_monitor_kpis)
+        feed = MonitorFeed(client)
+        t0 = time.perf_counter()
+        feed.start().snapshot()
+        first.append((time.perf_counter() - t0) * 1000)
+        time.sleep(0.3)   # 첫 화면 직후 이어지는 정기 조회가 끝난 뒤에 측정
+        t0 = time.perf_counter()
+        feed.refresh()
+        manual.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(first), statistics.median(manual)
+
+
+def admin_tracking_ms(latency, repeat):
+    from streamlit.testing.v1 import AppTest
+    client = StubClient(seed_tables(), latency=latency)
+    install_stub(client)
+    at = AppTest.from_file(os.path.join(ROOT, "pages", "Admin.py"), default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["user_role"] = "Admin"
+    at.session_state["admin_panel"] = "🔍 제품 추적"
+    at.run()
+    out = []
+    for _ in range(repeat):
+        db_cache._cache.clear()
+        at.text_input[0].input("ROLL26100007")
+        t0 = time.perf_counter()
+        at.button[0].click().run()
+        out.append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return statistics.median(out)
+
+
+def timeout_demo(latency):
+    client = StubClient(seed_tables(), latency=latency, slow={"production_logs": 2.0})
+    t0 = time.perf_counter()
+    res, errs = db_fetch.fetch_all({
+        "wo": lambda: client.table("work_orders").select("*").limit(10).execute().data,
+        "defects": lambda: client.table("defects").select("*").execute().data,
+        "logs": (lambda: client.table("production_logs").select("*").execute().data, 0.5),
+    })
+    return (time.perf_counter() - t0) * 1000, sorted(res), {k: type(e).__name__ for k, e in errs.items()}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.05, help="DB 왕복 지연(초)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    os.chdir(ROOT)
+
+    workers = db_fetch.FETCH_WORKERS
+    print(f"DB 왕복 지연 {args.latency * 1000:.0f}ms (중앙값, {args.repeat}회)")
+    print(f"{'항목':<20} {'차례대로(ms)':>12} {'동시에(ms)':>12}")
+    rows = {}
+    for mode, n in (("seq", 0), ("par", workers)):
+        db_fetch.FETCH_WORKERS = n
+        first, manual = monitor_ms(args.latency, args.repeat)
+        rows.setdefault("모니터 첫 화면", {})[mode] = first
+        rows.setdefault("모니터 수동 새로고침", {})[mode] = manual
+        rows.setdefault("관리자 제품 추적", {})[mode] = admin_tracking_ms(args.latency, args.repeat)
+    for name, r in rows.items():
+        print(f"{name:<20} {r['seq']:>12,.0f} {r['par']:>12,.0f}")
+
+    db_fetch.FETCH_WORKERS = workers
+    ms, ok, errs = timeout_demo(args.latency)
+    print(f"제한 시간 0.5초 (로그 조회 2초): {ms:,.0f}ms 만에 반환 / 받은 결과 {ok} / 오류 {errs}")
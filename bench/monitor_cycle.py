@@ -0,0 +1,157 @@
+# 파일명: bench/monitor_cycle.py
+# ==========================================
+# 🖥️ 모니터 화면 갱신 1회차 비용 - 실제 Streamlit 서버를 띄우고 화면(웹소켓 접속) N개로 측정
+#   python bench/monitor_cycle.py                                   (현재 pages/Monitor.py)
+#   python bench/monitor_cycle.py --file 이전버전.py --screens 10
+#   - 브라우저 대신 웹소켓으로 접속해서 첫 실행을 요청하고,
+#     서버가 fragment 자동 재실행(auto_rerun)을 알려주면 브라우저처럼 주기마다 재실행 요청을 보냄
+#   - 서버 프로세스의 CPU 사용 시간 / 스레드 수를 /proc 에서 읽음 (리눅스 전용)
+#   - DB 는 bench/stub_supabase.py 대역, 화면 전환 간격은 --flip 초로 줄여서 측정
+#   - 실행 횟수: 전체 실행 + fragment 재실행 (script_finished 메시지 수)
+#   - 받은 데이터: 서버 → 화면 메시지 크기 (압축 풀린 크기)
+#   - BT_MONITOR_LIVE_TABLE=0 python bench/monitor_cycle.py  → 예전 표(페이지 HTML 전체) 방식
+# ==========================================
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def serve(script, port):
+    # 자식 프로세스: DB 대역을 connection 모듈로 끼워 넣고 Streamlit 서버 실행
+    import types
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, HERE)
+    from admin_rerun import seed_tables
+    from stub_supabase import StubClient
+
+    client = StubClient(seed_tables())
+    fake = types.ModuleType("connection")
+    fake.get_supabase_client = lambda: client
+    sys.modules["connection"] = fake
+
+    from streamlit.web import bootstrap
+    os.chdir(ROOT)
+    bootstrap.load_config_options({"server.port": port, "server.headless": True,
+                                   "browser.gatherUsageStats": False, "server.fileWatcherType": "none"})
+    bootstrap.run(script, False, [], {})
+
+
+def proc_cpu_threads(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        parts = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(parts[11]) + int(parts[12])) / ticks   # utime + stime
+    with open(f"/proc/{pid}/status") as f:
+        threads = next(int(line.split()[1]) for line in f if line.startswith("Threads:"))
+    return cpu, threads
+
+
+async def screen(port, stop, counter):
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    def rerun(fragment_id=""):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+            msg.rerun_script.is_auto_rerun = True
+        return msg.SerializeToString()
+
+    timers = []
+    async with websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None) as ws:
+        await ws.send(rerun())
+
+        async def auto(fragment_id, interval):
+            # 브라우저의 setInterval 과 같은 역할
+            while not stop.is_set():
+                await asyncio.sleep(interval)
+                await ws.send(rerun(fragment_id))
+
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            counter[1] += len(raw)
+            msg = ForwardMsg()
+            msg.ParseFromString(raw)
+            kind = msg.WhichOneof("type")
+            if kind == "auto_rerun" and msg.auto_rerun.fragment_id not in [t[0] for t in timers]:
+                timers.append((msg.auto_rerun.fragment_id, asyncio.ensure_future(auto(msg.auto_rerun.fragment_id, msg.auto_rerun.interval))))
+            elif kind == "script_finished":
+                counter[0] += 1
+        for _, t in timers:
+            t.cancel()
+
+
+async def drive(port, pid, screens, warmup, seconds):
+    stop = asyncio.Event()
+    counter = [0, 0]   # [실행 횟수, 받은 바이트]
+    tasks = [asyncio.ensure_future(screen(port, stop, counter)) for _ in range(screens)]
+    await asyncio.sleep(warmup)
+    cpu0, _ = proc_cpu_threads(pid)
+    runs0, bytes0 = counter
+    threads = []
+    t_end = time.monotonic() + seconds
+    while time.monotonic() < t_end:
+        await asyncio.sleep(0.2)
+        threads.append(proc_cpu_threads(pid)[1])
+    cpu1, _ = proc_cpu_threads(pid)
+    runs = counter[0] - runs0
+    received = counter[1] - bytes0
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return cpu1 - cpu0, runs, threads, received
+
+
+def wait_port(port, timeout=60):
+    t_end = time.monotonic() + timeout
+    while time.monotonic() < t_end:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.3)
+    raise RuntimeError("서버가 뜨지 않음")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--serve":
+        serve(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", default=os.path.join(ROOT, "pages", "Monitor.py"))
+    ap.add_argument("--screens", type=int, nargs="+", default=[1, 5])
+    ap.add_argument("--seconds", type=int, default=15)
+    ap.add_argument("--flip", default="1", help="화면 전환 간격(초) - BT_MONITOR_FLIP_SEC")
+    ap.add_argument("--warmup", type=float, default=8, help="첫 실행(모듈 import 등)이 끝날 때까지 측정 제외(초)")
+    ap.add_argument("--port", type=int, default=8611)
+    args = ap.parse_args()
+
+    env = dict(os.environ, BT_MONITOR_FLIP_SEC=args.flip, BT_MONITOR_FETCH_SEC=args.flip)
+    print(f"{os.path.relpath(os.path.abspath(args.file), ROOT)} (화면 전환 {args.flip}초, 측정 {args.seconds}초)")
+    print(f"{'화면 수':>6} {'실행 횟수':>9} {'CPU(ms)/실행':>13} {'CPU(ms)/초/화면':>16} {'받은 데이터(B)/실행':>16} {'서버 스레드(평균/최대)':>22}")
+    for n in args.screens:
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", os.path.abspath(args.file), str(args.port)],
+                                  env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_port(args.port)
+            _, base_threads = proc_cpu_threads(server.pid)
+            cpu, runs, threads, received = asyncio.run(drive(args.port, server.pid, n, args.warmup, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        per = cpu * 1000 / runs if runs else float("nan")
+        per_screen = cpu * 1000 / args.seconds / n
+        per_bytes = received / runs if runs else float("nan")
+        print(f"{n:>6} {runs:>9,} {per:>13.1f} {per_screen:>16.1f} {per_bytes:>16,.0f} {sum(threads) / len(threads):>14.1f} / {max(threads)}  (접속 전 {base_threads})")
@@ -0,0 +1,95 @@
+# 파일명: bench/monitor_delta.py
+# ==========================================
+# 🖥️ 모니터 조회 방식 비교 - 매번 전체 조회 vs 증분 조회(monitor_sync.DeltaSync)
+#   python bench/monitor_delta.py
+#   python bench/monitor_delta.py --minutes 60 --scans 20 --tvs 3
+#   - 가상 시계로 N분을 5초 간격 화면 전환으로 돌림 (실제로 기다리지 않음)
+#   - 중간중간 작업자 스캔(로그 추가 + 상태 변경)을 넣고, 마지막에 두 방식의 화면 데이터가 같은지 확인
+# ==========================================
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import monitor_sync  # noqa: E402
+from monitor_sync import DeltaSync  # noqa: E402
+from stub_supabase import StubClient  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def monotonic(self):
+        return self.t
+
+
+def seed(n_orders=300, n_logs=600):
+    base = datetime(2026, 10, 18, 0, 0, tzinfo=timezone.utc)
+    orders = [{"id": i + 1, "lot_no": f"MON2610{i:04d}", "customer": "A건설", "product": "스마트글라스", "dimension": "1200x2400",
+               "spec": "Full | 1단계", "status": "작업대기", "created_at": (base + timedelta(seconds=i)).isoformat(),
+               "updated_at": (base + timedelta(seconds=i)).isoformat()} for i in range(n_orders)]
+    logs = [{"id": i + 1, "lot_no": f"MON2610{i % n_orders:04d}", "step": "Full Cut", "worker": "작업자A",
+             "created_at": (base + timedelta(seconds=n_orders + i)).isoformat()} for i in range(n_logs)]
+    return {"work_orders": orders, "production_logs": logs}
+
+
+def full_rows(client):
+    orders = client.table("work_orders").select("*").order("created_at", desc=True).limit(100).execute().data
+    logs = client.table("production_logs").select("*").order("created_at", desc=True).limit(200).execute().data
+    return orders, logs
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--minutes", type=int, default=60)
+    ap.add_argument("--scans", type=int, default=20, help="측정 시간 동안 작업자 스캔 횟수")
+    ap.add_argument("--tvs", type=int, default=3, help="모니터 화면 수")
+    args = ap.parse_args()
+
+    clock = FakeClock()
+    monitor_sync.time.monotonic = clock.monotonic
+    client = StubClient(seed())
+    client.seq = 10_000
+    syncs = [(DeltaSync(client, "work_orders", 100, "updated_at"), DeltaSync(client, "production_logs", 200, "created_at", key=("lot_no", "step", "created_at")))
+             for _ in range(args.tvs)]
+
+    rng = random.Random(7)
+    ticks = args.minutes * 60 // 5
+    scan_at = set(rng.sample(range(ticks), min(args.scans, ticks)))
+    full_calls = full_rows_n = 0
+
+    for tick in range(ticks):
+        clock.t += 5
+        if tick in scan_at:
+            lot = f"MON2610{rng.randrange(200, 300):04d}"
+            client.table("production_logs").insert({"lot_no": lot, "step": "Half Cut", "worker": "작업자B"}).execute()
+            client.table("work_orders").update({"status": "Half Cut 완료"}).eq("lot_no", lot).execute()
+        for order_sync, log_sync in syncs:
+            order_sync.poll()
+            log_sync.poll()
+            # 예전 방식: 화면마다 5초마다 전체 조회
+            o, l = full_rows(client)
+            full_calls += 2
+            full_rows_n += len(o) + len(l)
+
+    # 마지막 스캔이 대기 간격 안에 있을 수 있으므로 한 번씩 더 조회한 뒤 비교
+    want_o, want_l = full_rows(client)
+    for order_sync, log_sync in syncs:
+        order_sync.poll(force=True)
+        log_sync.poll(force=True)
+    ok = all(list(zip(s[0].frame()['id'], s[0].frame()['status'])) == [(r['id'], r['status']) for r in want_o]
+             and list(s[1].frame()['id']) == [r['id'] for r in want_l] for s in syncs)
+    stats = [s.stats() for pair in syncs for s in pair]
+    delta_calls = sum(s['polls'] for s in stats)
+    delta_rows = sum(s['rows_fetched'] for s in stats)
+
+    print(f"{args.minutes}분 / 화면 {args.tvs}대 / 스캔 {len(scan_at)}회")
+    print(f"{'방식':<8} {'DB 호출':>8} {'받은 행':>10}")
+    print(f"{'전체조회':<8} {full_calls:>8,} {full_rows_n:>10,}")
+    print(f"{'증분조회':<8} {delta_calls:>8,} {delta_rows:>10,}")
+    print(f"최종 화면 데이터 일치: {'✅' if ok else '❌'}")
@@ -0,0 +1,72 @@
+# 파일명: bench/monitor_feed.py
+# ==========================================
+# 🛰️ 모니터 화면 수에 따른 DB 호출 수 - 화면마다 조회 vs 공용 스냅샷(monitor_sync.MonitorFeed)
+#   python bench/monitor_feed.py
+#   python bench/monitor_feed.py --screens 1 10 50 --seconds 10
+#   - 시간을 줄여서 측정: 조회 간격 0.5초 / 화면 전환 0.5초 (실제 운영은 5초)
+#   - 작업자 스캔을 1초마다 1건 넣음
+# ==========================================
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("BT_MONITOR_FETCH_SEC", "0.5")
+
+from monitor_sync import DeltaSync, MonitorFeed  # noqa: E402
+from monitor_delta import seed  # noqa: E402
+from stub_supabase import StubClient  # noqa: E402
+
+FLIP_SEC = 0.5
+
+
+def run(screens, seconds, shared):
+    client = StubClient(seed(), latency=0.02)
+    client.seq = 10_000
+    stop = threading.Event()
+    feed = MonitorFeed(client).start() if shared else None
+    reads = [0]
+
+    def screen():
+        syncs = None if shared else (DeltaSync(client, "work_orders", 100), DeltaSync(client, "production_logs", 200, "created_at", key=("lot_no", "step", "created_at")))
+        while not stop.is_set():
+            if shared:
+                feed.snapshot()
+            else:
+                syncs[0].poll(); syncs[1].poll()
+            reads[0] += 1
+            stop.wait(FLIP_SEC)
+
+    def worker():
+        i = 0
+        while not stop.wait(1.0):
+            lot = f"MON2610{250 + i % 50:04d}"
+            client.table("production_logs").insert({"lot_no": lot, "step": "Half Cut", "worker": "작업자B"}).execute()
+            client.table("work_orders").update({"status": "Half Cut 완료"}).eq("lot_no", lot).execute()
+            i += 1
+
+    threads = [threading.Thread(target=screen) for _ in range(screens)] + [threading.Thread(target=worker)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    db = sum(1 for target, _ in client.calls if target in ("work_orders", "production_logs")) - 2 * int(seconds)
+    return db, reads[0]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--screens", type=int, nargs="+", default=[1, 10, 50])
+    ap.add_argument("--seconds", type=int, default=10)
+    args = ap.parse_args()
+
+    print(f"{'화면 수':>6} {'방식':>8} {'화면 갱신':>9} {'DB 조회':>8}")
+    for n in args.screens:
+        for shared in (False, True):
+            db, reads = run(n, args.seconds, shared)
+            print(f"{n:>6} {'공용' if shared else '화면별':>8} {reads:>9,} {db:>8,}")
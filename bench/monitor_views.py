@@ -0,0 +1,125 @@
+# 파일명: bench/monitor_views.py
+# ==========================================
+# 🔎 화면별 모니터 보기 - 조건을 DB 쿼리에 넣기(monitor_sync.MonitorView) vs 최근 100건 받아서 화면에서 거르기
+#   python bench/monitor_views.py
+#   python bench/monitor_views.py --orders 5000 --changes 300
+#   - [DB] work_orders.bucket 컬럼 있음 (sql/monitor_views.sql 적용) / [대체] 컬럼 없음 → 나머지 조건만 DB, 분류는 화면 서버
+#   - 정답: 전체 작업에서 조건에 맞는 최신 100건
+#   - 상태 변경(보기에 들어오고/빠지는 행)을 증분 조회로 따라간 뒤에도 정답과 같은지 확인
+#   - 보기 안에 남는 수정(규격 변경)은 증분 조회만으로 반영 - 전체 다시 읽기가 늘면 실패
+# ==========================================
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import monitor_sync  # noqa: E402
+from monitor_sync import DeltaSync, MonitorView  # noqa: E402
+from stub_supabase import StubClient, add_monitor_bucket  # noqa: E402
+
+STATUSES = ["작업대기", "Full Cut 완료", "Half Cut 완료", "전극 작업", "접합대기", "접합 진행", "출고", "⛔ 불량(이물질)"]
+CUSTOMERS = ["A건설", "B산업", "C유리", "D인테리어"]
+PRODUCTS = ["스마트글라스", "스마트필름", "PDLC 접합유리"]
+
+VIEWS = {
+    "전체": MonitorView(),
+    "접합 라인": MonitorView(bucket="lam_wait,lam_ing"),
+    "A건설": MonitorView(customer="A건설"),
+    "A건설 30일": MonitorView(customer="A건설", days=30),
+    "필름 2일 완료": MonitorView(bucket="done", product="스마트필름", days=2),
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def monotonic(self):
+        return self.t
+
+
+def seed(n_orders, rng):
+    now = datetime.now(timezone.utc)
+    orders = []
+    for i in range(n_orders):
+        at = (now - timedelta(minutes=(n_orders - i) * 10 * 1440 // n_orders)).isoformat()
+        orders.append({"id": i + 1, "lot_no": f"VIEW{i:06d}", "customer": rng.choice(CUSTOMERS), "product": rng.choice(PRODUCTS),
+                       "dimension": "1200x2400", "spec": "Full | 1단계", "status": rng.choice(STATUSES),
+                       "created_at": at, "updated_at": at})
+    return {"work_orders": orders}
+
+
+def truth(client, view, limit=100):
+    rows = [r for r in client.tables["work_orders"] if view.keep(r)]
+    rows.sort(key=lambda r: r['created_at'], reverse=True)
+    return [r['lot_no'] for r in rows[:limit]]
+
+
+def legacy_rows(client, view, limit=100):
+    # 예전 방식: 최신 100건을 받아서 화면에서 거름
+    data = client.table("work_orders").select("*").order("created_at", desc=True).limit(limit).execute().data
+    return [r['lot_no'] for r in data if view.keep(r)], len(data)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--orders", type=int, default=3000)
+    ap.add_argument("--changes", type=int, default=200, help="증분 조회 중 상태 변경 횟수")
+    args = ap.parse_args()
+
+    clock = FakeClock()
+    monitor_sync.time.monotonic = clock.monotonic
+    rng = random.Random(11)
+    tables = seed(args.orders, rng)
+
+    failed = False
+    print(f"작업 {args.orders:,} / 보기별 최신 100건 / 상태 변경 {args.changes}회")
+    print(f"{'보기':<12} {'정답 행':>6} {'예전 표시/받은 행':>16} {'[DB] 표시/받은 행':>18} {'[대체] 표시/받은 행':>18} {'변경 후 일치':>10}")
+    for name, view in VIEWS.items():
+        results = []
+        for generated in (True, False):
+            client = StubClient(tables)
+            client.seq = 1_000_000
+            if generated:
+                add_monitor_bucket(client)
+            sync = DeltaSync(client, "work_orders", 100, "updated_at", view=view)
+            df, _ = sync.poll(force=True)
+            first = (list(df['lot_no']) if not df.empty else [], sync.stats()['rows_fetched'])
+
+            # 보기 안에 남는 수정 → 전체 다시 읽기 없이 증분 조회로만 반영돼야 함
+            full_before = sync.full_loads
+            for lot in (list(df['lot_no'])[:5] if not df.empty else []):
+                client.table("work_orders").update({"dimension": "1500x3000"}).eq("lot_no", lot).execute()
+                clock.t += 5
+                sync.poll(force=True)
+            in_view_full = sync.full_loads - full_before
+
+            # 상태 변경 → 증분 조회로 반영
+            r2 = random.Random(5)
+            for _ in range(args.changes):
+                lot = f"VIEW{r2.randrange(args.orders - 400, args.orders):06d}"
+                client.table("work_orders").update({"status": r2.choice(STATUSES)}).eq("lot_no", lot).execute()
+                clock.t += 5
+                sync.poll()
+            df, _ = sync.poll(force=True)
+            final_ok = (list(df['lot_no']) if not df.empty else []) == truth(client, view)
+            results.append((first, final_ok and in_view_full == 0, sync.stats()['bucket_filter']))
+            if in_view_full:
+                print(f"   ❌ {name}: 보기 안 수정 5건에 전체 다시 읽기 {in_view_full}번")
+                failed = True
+
+        client = StubClient(tables)
+        want = truth(client, view)
+        shown, fetched = legacy_rows(client, view)
+        (db_rows, db_n), db_ok, _ = results[0]
+        (fb_rows, fb_n), fb_ok, fb_bucket = results[1]
+        mark = lambda rows, want=want: "✅" if rows == want else "❌"
+        print(f"{name:<12} {len(want):>6} {mark(shown)} {len(shown):>5} / {fetched:>5} {mark(db_rows)} {len(db_rows):>7} / {db_n:>5}"
+              f" {mark(fb_rows)} {len(fb_rows):>7} / {fb_n:>5} {'✅' if db_ok and fb_ok else '❌':>10}")
+
+    if failed:
+        sys.exit("❌ 보기 안 수정이 전체 다시 읽기로 처리됨")
@@ -0,0 +1,307 @@
+# 파일명: bench/qr_decode_bench.py
+# ==========================================
+# 📷 작업자 QR 인식 벤치 (pages/Worker.py 와 같은 qr_decode.decode_qr 경로)
+#   python bench/qr_decode_bench.py                      (라벨/지시서 × 조건별 20장, 1280x720 카메라)
+#   python bench/qr_decode_bench.py --per 50 --frame 1920x1080
+#   python bench/qr_decode_bench.py --legacy             (예전 방식도 같이: 원본 컬러 디코딩 + 매번 새 검출기)
+#   python bench/qr_decode_bench.py --save bench/qr_baseline.json       (결과 저장)
+#   python bench/qr_decode_bench.py --baseline bench/qr_baseline.json   (성공률이 떨어지면 종료 코드 1)
+#
+#   - 사진 원본
+#       label      : label_render.create_label_strip_image 로 만든 라벨 1장
+#       work_order : print_docs.get_work_order_html 의 QR(PNG) 을 지시서 카드 모양(QR 칸 80px, 여백 없음)에 배치
+#   - 카메라 사진처럼: 배경 위에 손으로 든 각도(±8°)로 놓고 조건 적용 → JPEG (st.camera_input 과 같은 형식)
+#       clean / blur(초점·흔들림) / glare(반사광) / perspective(기울여 찍음) / low_light(어두움+노이즈) / mixed
+#   - 같은 --seed 면 같은 사진 → bench/.qr_corpus/ 에 저장해 두고 재사용 (--regen 으로 다시 생성)
+#   - 인터넷/DB 없이 실행 (opencv-python-headless, qrcode, Pillow, 저장소 폰트만 사용)
+# ==========================================
+import argparse
+import base64
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from PIL import Image, ImageDraw  # noqa: E402
+
+import fonts  # noqa: E402
+import qr_decode  # noqa: E402
+from label_render import QR_SIZE, LABEL_H, create_label_strip_image  # noqa: E402
+from print_docs import get_work_order_html  # noqa: E402
+from qr_assets import lot_qr_data  # noqa: E402
+
+CORPUS_DIR = os.path.join(ROOT, "bench", ".qr_corpus")
+SOURCES = ("label", "work_order")
+CONDITIONS = ("clean", "blur", "glare", "perspective", "low_light", "mixed")
+CUSTOMERS = ["A건설", "B산업", "C유리", "D인테리어"]
+
+
+# ------------------------------------------
+# 🏷️ 원본 (라벨 / 지시서 카드) - (흑백 이미지, QR 사각형 x, y, 크기)
+# ------------------------------------------
+def make_item(i):
+    return {"lot": f"{'ABCD'[i % 4]}-261018-G{i:04d}", "cust": CUSTOMERS[i % 4], "prod": "스마트글라스",
+            "w": 900 + i % 7 * 100, "h": 2400, "elec": "가로(W) 양쪽", "fabric": "ROLL-A",
+            "spec_cut": "Full(50/80/20)", "spec_lam": "1단계", "note": "-"}
+
+
+def label_doc(item):
+    png = create_label_strip_image([item])
+    img = np.array(Image.open(io.BytesIO(png)).convert("L"))
+    return img, (10, (LABEL_H - QR_SIZE) // 2, QR_SIZE)
+
+
+def work_order_doc(item, scale=3):
+    # 지시서 HTML 에 들어간 QR PNG 를 그대로 꺼내 카드 크기(CSS px × scale)로 배치
+    html = get_work_order_html([item], qr_mode="png")
+    b64 = re.search(r'data:image/png;base64,([^"]+)"', html).group(1)
+    qr = Image.open(io.BytesIO(base64.b64decode(b64))).convert("L")
+
+    cw, ch, head, dim, cell = 370, 236, 24, 40, 80
+    card = Image.new("RGB", (cw * scale, ch * scale), "white")
+    d = ImageDraw.Draw(card)
+    d.rectangle([0, 0, cw * scale - 1, head * scale], fill="#e0e0e0")
+    d.rectangle([0, 0, cw * scale - 1, ch * scale - 1], outline="black", width=2 * scale)
+    d.line([0, head * scale, cw * scale, head * scale], fill="black", width=scale)
+    d.line([0, (ch - dim) * scale, cw * scale, (ch - dim) * scale], fill="black", width=2 * scale)
+    d.line([(2 + cell) * scale, head * scale, (2 + cell) * scale, (ch - dim) * scale], fill="black", width=scale)
+    fonts.draw_text(card, (8 * scale, 4 * scale), item["lot"], 13 * scale)
+    for k, txt in enumerate([f"원단  {item['fabric']}", f"커팅  {item['spec_cut']}", f"접합  {item['spec_lam']}"]):
+        fonts.draw_text(card, ((cell + 8) * scale, (head + 12 + k * 30) * scale), txt, 11 * scale)
+    fonts.draw_text(card, (110 * scale, (ch - dim + 6) * scale), f"{item['w']} X {item['h']}", 24 * scale)
+
+    # width:100% → QR 이 칸 폭(카드 테두리 2px ~ 칸 오른쪽 선)을 꽉 채움 (흰 여백 없음)
+    size = cell * scale
+    qr = qr.resize((size, size), Image.NEAREST)
+    x, y = 2 * scale, (head + (ch - head - dim - cell) // 2) * scale
+    card.paste(qr, (x, y))
+    return np.array(card.convert("L")), (x, y, size)
+
+
+# ------------------------------------------
+# 📸 카메라 사진 흉내
+# ------------------------------------------
+def background(rng, w, h):
+    base = rng.uniform(90, 170)
+    gx = np.linspace(0, rng.uniform(-40, 40), w, dtype=np.float32)
+    gy = np.linspace(0, rng.uniform(-40, 40), h, dtype=np.float32)
+    bg = base + gx[None, :] + gy[:, None] + rng.normal(0, 8, (h, w)).astype(np.float32)
+    return cv2.GaussianBlur(bg, (0, 0), 3)
+
+
+def place(rng, doc, frame, jitter):
+    # 문서를 화면의 50~85% 크기로, 약간 돌리고(±8°) 모서리를 흔들어(jitter) 배경에 놓는 변환 행렬
+    fw, fh = frame
+    dh, dw = doc.shape[:2]
+    fill = rng.uniform(0.5, 0.85)
+    s = min(fw * fill / dw, fh * fill / dh)
+    w, h = dw * s, dh * s
+    cx, cy = fw / 2 + rng.uniform(-0.1, 0.1) * fw, fh / 2 + rng.uniform(-0.1, 0.1) * fh
+    a = np.deg2rad(rng.uniform(-8, 8))
+    rot = np.array([[np.cos(a), -np.sin(a)], [np.sin(a), np.cos(a)]])
+    corners = np.array([[-w / 2, -h / 2], [w / 2, -h / 2], [w / 2, h / 2], [-w / 2, h / 2]])
+    dst = corners @ rot.T + [cx, cy]
+    dst += rng.uniform(-jitter, jitter, (4, 2)) * [w, h]
+    src = np.float32([[0, 0], [dw, 0], [dw, dh], [0, dh]])
+    return cv2.getPerspectiveTransform(src, np.float32(dst))
+
+
+def motion_kernel(rng):
+    n = int(rng.integers(9, 16))
+    k = np.zeros((n, n), np.float32)
+    k[n // 2, :] = 1
+    m = cv2.getRotationMatrix2D((n / 2 - 0.5, n / 2 - 0.5), rng.uniform(0, 180), 1)
+    k = cv2.warpAffine(k, m, (n, n))
+    return k / k.sum()
+
+
+def photograph(rng, doc, qr_box, cond, frame):
+    fw, fh = frame
+    jitter = {"perspective": 0.16, "mixed": 0.08}.get(cond, 0.02)
+    H = place(rng, doc, frame, jitter)
+    img = background(rng, fw, fh)
+    paper = cv2.warpPerspective(doc.astype(np.float32), H, (fw, fh), flags=cv2.INTER_AREA)
+    mask = cv2.warpPerspective(np.ones(doc.shape, np.float32), H, (fw, fh))
+    img = img * (1 - mask) + paper * mask
+
+    x, y, s = qr_box
+    qc = cv2.perspectiveTransform(np.float32([[[x + s / 2, y + s / 2]]]), H)[0, 0]
+    qs = np.linalg.norm(cv2.perspectiveTransform(np.float32([[[x, y]], [[x + s, y]]]), H)[1, 0]
+                        - cv2.perspectiveTransform(np.float32([[[x, y]]]), H)[0, 0])
+
+    quality = 85
+    if cond == "blur":
+        if rng.random() < 0.5:
+            img = cv2.GaussianBlur(img, (0, 0), rng.uniform(1.5, 2.5))
+        else:
+            img = cv2.filter2D(img, -1, motion_kernel(rng))
+    elif cond == "glare":
+        # QR 위에 반사광 (밝은 타원 얼룩)
+        yy, xx = np.mgrid[0:fh, 0:fw].astype(np.float32)
+        gx, gy = qc + rng.uniform(-0.35, 0.35, 2) * qs
+        r = qs * rng.uniform(0.25, 0.5)
+        blob = np.exp(-(((xx - gx) / r) ** 2 + ((yy - gy) / (r * rng.uniform(0.5, 1.0))) ** 2))
+        img = img + blob * rng.uniform(120, 220)
+    elif cond == "low_light":
+        img = img * rng.uniform(0.15, 0.3) + rng.normal(0, 6, img.shape)
+        quality = 70
+    elif cond == "mixed":
+        img = cv2.GaussianBlur(img, (0, 0), 1.2)
+        img = img * 0.4 + rng.normal(0, 5, img.shape)
+        quality = 75
+    img = img + rng.normal(0, 3, img.shape)   # 센서 노이즈
+
+    img = np.clip(img, 0, 255).astype(np.uint8)
+    ok, jpg = cv2.imencode(".jpg", cv2.cvtColor(img, cv2.COLOR_GRAY2BGR), [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return jpg.tobytes()
+
+
+def build_corpus(path, per, frame, seed):
+    os.makedirs(path, exist_ok=True)
+    manifest = []
+    n = 0
+    for src in SOURCES:
+        for ci, cond in enumerate(CONDITIONS):
+            for i in range(per):
+                item = make_item(n)
+                n += 1
+                doc, qr_box = label_doc(item) if src == "label" else work_order_doc(item)
+                rng = np.random.default_rng([seed, SOURCES.index(src), ci, i])
+                name = f"{src}_{cond}_{i:03d}.jpg"
+                with open(os.path.join(path, name), "wb") as f:
+                    f.write(photograph(rng, doc, qr_box, cond, frame))
+                manifest.append({"file": name, "source": src, "condition": cond, "expected": lot_qr_data(item["lot"])})
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def load_corpus(per, frame, seed, regen):
+    path = os.path.join(CORPUS_DIR, f"{frame[0]}x{frame[1]}_s{seed}_n{per}")
+    mf = os.path.join(path, "manifest.json")
+    if regen or not os.path.exists(mf):
+        t0 = time.perf_counter()
+        manifest = build_corpus(path, per, frame, seed)
+        print(f"사진 {len(manifest)}장 생성 ({time.perf_counter() - t0:.1f}초) → {os.path.relpath(path, ROOT)}")
+    else:
+        with open(mf, encoding="utf-8") as f:
+            manifest = json.load(f)
+    for m in manifest:
+        with open(os.path.join(path, m["file"]), "rb") as f:
+            m["bytes"] = f.read()
+    return manifest
+
+
+# ------------------------------------------
+# ⏱️ 인식 + 집계
+# ------------------------------------------
+def legacy_decode(image_bytes):
+    # 예전 pages/Worker.py: 원본 컬러 디코딩 → 흑백 → 매번 새 검출기 → 1번 시도
+    t0 = time.perf_counter()
+    img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    text, _, _ = cv2.QRCodeDetector().detectAndDecode(gray)
+    return qr_decode.DecodeResult(text or None, "legacy" if text else None, ["legacy"], (time.perf_counter() - t0) * 1000)
+
+
+def pct(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def run(manifest, decode):
+    decode(manifest[0]["bytes"])   # 검출기 생성 등 첫 호출 비용 제외
+    groups = {}
+    for m in manifest:
+        res = decode(m["bytes"])
+        g = groups.setdefault(f"{m['source']}/{m['condition']}", {"ms": [], "ok": 0, "first": 0, "wrong": 0, "steps": Counter()})
+        g["ms"].append(res.ms)
+        if res.text == m["expected"]:
+            g["ok"] += 1
+            g["first"] += len(res.attempts) == 1
+            g["steps"][res.step] += 1
+        elif res.text is not None:
+            g["wrong"] += 1
+    out = {}
+    for key, g in groups.items():
+        n = len(g["ms"])
+        out[key] = {"n": n, "success": g["ok"] / n, "first_try": g["first"] / n, "wrong": g["wrong"],
+                    "p50_ms": pct(g["ms"], 50), "p90_ms": pct(g["ms"], 90), "p99_ms": pct(g["ms"], 99),
+                    "steps": dict(g["steps"].most_common())}
+    all_ms = [ms for g in groups.values() for ms in g["ms"]]
+    n = len(all_ms)
+    out["total"] = {"n": n, "success": sum(g["ok"] for g in groups.values()) / n,
+                    "first_try": sum(g["first"] for g in groups.values()) / n,
+                    "wrong": sum(g["wrong"] for g in groups.values()),
+                    "p50_ms": pct(all_ms, 50), "p90_ms": pct(all_ms, 90), "p99_ms": pct(all_ms, 99), "steps": {}}
+    return out
+
+
+def print_table(title, result):
+    print(f"\n[{title}]")
+    print(f"{'원본/조건':<24} {'장':>4} {'성공':>6} {'첫시도':>6} {'오인식':>4} {'p50':>8} {'p90':>8} {'p99':>8}  성공 단계")
+    for key, r in result.items():
+        steps = ", ".join(f"{k} {v}" for k, v in r["steps"].items())
+        print(f"{key:<24} {r['n']:>4} {r['success']:>6.0%} {r['first_try']:>6.0%} {r['wrong']:>4} "
+              f"{r['p50_ms']:>6.1f}ms {r['p90_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms  {steps}")
+
+
+def compare(result, baseline_path, tolerance):
+    # 성공률이 기준보다 tolerance 넘게 떨어지면 실패 / 시간은 PC 마다 달라서 참고로만 표시
+    with open(baseline_path, encoding="utf-8") as f:
+        base = json.load(f)["result"]
+    failed = []
+    print(f"\n[기준 비교] {os.path.relpath(baseline_path, ROOT)}")
+    for key, r in result.items():
+        b = base.get(key)
+        if not b:
+            continue
+        d_ok = r["success"] - b["success"]
+        d_ms = (r["p50_ms"] / b["p50_ms"] - 1) if b["p50_ms"] else 0.0
+        mark = "❌" if d_ok < -tolerance else "✅"
+        if r["wrong"] > b.get("wrong", 0):
+            mark = "❌"
+        if mark == "❌":
+            failed.append(key)
+        print(f"{mark} {key:<24} 성공 {b['success']:.0%} → {r['success']:.0%}  p50 {b['p50_ms']:.1f} → {r['p50_ms']:.1f}ms ({d_ms:+.0%})")
+    return failed
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--per", type=int, default=20, help="원본 × 조건별 사진 수")
+    ap.add_argument("--frame", default="1280x720", help="카메라 해상도")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--regen", action="store_true", help="저장된 사진이 있어도 다시 생성")
+    ap.add_argument("--legacy", action="store_true", help="예전 인식 방식도 측정")
+    ap.add_argument("--save", help="결과를 JSON 으로 저장")
+    ap.add_argument("--baseline", help="저장해 둔 결과와 비교 (성공률 하락 / 오인식 증가 시 종료 코드 1)")
+    ap.add_argument("--tolerance", type=float, default=0.05, help="허용하는 성공률 하락 폭")
+    args = ap.parse_args()
+
+    frame = tuple(int(v) for v in args.frame.lower().split("x"))
+    manifest = load_corpus(args.per, frame, args.seed, args.regen)
+    print(f"카메라 {frame[0]}x{frame[1]} / 사진 {len(manifest)}장 / OpenCV {cv2.__version__}")
+
+    result = run(manifest, qr_decode.decode_qr)
+    print_table("qr_decode.decode_qr (Worker)", result)
+    if args.legacy:
+        print_table("예전 방식 (원본 컬러 + 새 검출기 1회)", run(manifest, legacy_decode))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"frame": args.frame, "seed": args.seed, "per": args.per, "opencv": cv2.__version__,
+                       "result": result}, f, ensure_ascii=False, indent=1)
+        print(f"\n결과 저장 → {args.save}")
+    if args.baseline:
+        failed = compare(result, args.baseline, args.tolerance)
+        if failed:
+            print(f"\n❌ 성공률 하락: {', '.join(failed)}")
+            sys.exit(1)
@@ -0,0 +1,165 @@
+# 파일명: bench/scan_queue.py
+# ==========================================
+# 📮 현장 Wi-Fi 가 불안정할 때 작업자 저장 - 바로 저장(record_step) vs 스캔 대기열(scan_queue.py)
+#   python bench/scan_queue.py
+#   python bench/scan_queue.py --workers 4 --lots 40 --drop 0.2 --outage 2 --period 5
+#   * 네트워크: 요청마다 왕복 지연 --latency, --drop 확률로 끊김(DB 반영 전/후 반반),
+#               --period 초마다 --outage 초 동안 완전히 끊김
+#   * 작업자 --workers 명이 각자 LOT --lots 개를 Half Cut → 전극 완료 순서로 스캔 (--gap 초 간격)
+#   1) 바로 저장: 저장이 될 때까지 작업자가 다시 누름 → 스캔 1건당 기다린 시간
+#   2) 대기열: 저장 버튼 → 서버 파일 기록 시간, 마지막 스캔 후 전송이 끝날 때까지 걸린 시간
+#   → 두 경우 모두 LOT 마다 로그 2건 / 최종 상태 '전극 완료' 인지 확인 (빠짐·중복 없음)
+#   ※ 재시도 간격은 벤치 시간에 맞게 줄여서 실행 (RETRY_MIN_SEC 0.2초, 최대 2초)
+# ==========================================
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scan_queue  # noqa: E402
+from stub_supabase import StubClient, stub_record_scans, stub_record_step  # noqa: E402
+from work_steps import STEP_LEVEL, record_step  # noqa: E402
+
+STEPS = ["Half Cut", "전극 완료"]
+
+
+def seed(workers, lots):
+    return {"work_orders": [{"id": i + 1, "lot_no": f"Q{w}-{i:04d}", "status": "Full Cut"}
+                            for w in range(workers) for i in range(lots)],
+            "production_logs": [], "defects": [], "scan_receipts": []}
+
+
+def flaky(args, seed_no):
+    rng = random.Random(seed_no)
+    lock = threading.Lock()
+    t0 = time.monotonic()
+
+    def drop(target, op):
+        if (time.monotonic() - t0) % args.period < args.outage:
+            return "before"
+        with lock:
+            if rng.random() < args.drop:
+                return rng.choice(("before", "after"))
+        return None
+    return drop
+
+
+def make_client(args, seed_no):
+    client = StubClient(seed(args.workers, args.lots), latency=args.latency, drop=flaky(args, seed_no))
+    client.register_rpc("record_step", stub_record_step)
+    client.register_rpc("record_scans", stub_record_scans)
+    return client
+
+
+def scans(w, lots):
+    for step in STEPS:
+        for i in range(lots):
+            yield f"Q{w}-{i:04d}", step
+
+
+def check(client):
+    # LOT 마다 로그 2건 + 최종 상태 '전극 완료' 여야 정상
+    logs = {}
+    for r in client.tables["production_logs"]:
+        logs[r['lot_no']] = logs.get(r['lot_no'], 0) + 1
+    lost = sum(1 for r in client.tables["work_orders"] if r['status'] != STEPS[-1] or logs.get(r['lot_no'], 0) < len(STEPS))
+    dup = sum(1 for n in logs.values() if n > len(STEPS))
+    return lost, dup
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+def run_direct(args):
+    client = make_client(args, 1)
+    waits = []
+    lock = threading.Lock()
+
+    def worker(w):
+        for lot, step in scans(w, args.lots):
+            t0 = time.perf_counter()
+            while True:
+                try:
+                    record_step(client, [lot], step, STEP_LEVEL[step], "-", f"W{w}")
+                    break
+                except Exception:
+                    time.sleep(0.2)   # 오류 화면 → 다시 누름
+            with lock:
+                waits.append(time.perf_counter() - t0)
+            time.sleep(args.gap)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(args.workers)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return client, waits, time.perf_counter() - t0, 0.0
+
+
+def run_queue(args):
+    client = make_client(args, 1)
+    path = os.path.join(tempfile.mkdtemp(), "scan_queue.sqlite3")
+    queue = scan_queue.ScanQueue(path, client).start()
+    waits = []
+    lock = threading.Lock()
+
+    def worker(w):
+        session = f"S{w}"
+        for lot, step in scans(w, args.lots):
+            t0 = time.perf_counter()
+            queue.add(session, [lot], step, STEP_LEVEL[step], "-", f"W{w}", source=f"{lot}/{step}")
+            with lock:
+                waits.append(time.perf_counter() - t0)
+            time.sleep(args.gap)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(args.workers)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    scanned = time.perf_counter() - t0
+    while queue.counts()["pending"]:
+        time.sleep(0.05)
+    drain = time.perf_counter() - t0 - scanned
+    counts = queue.counts()
+    if counts["rejected"] or counts["failed"]:
+        print(f"   ⚠️ 제외 {counts['rejected']} / 실패 {counts['failed']}")
+    return client, waits, scanned, drain
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=3)
+    ap.add_argument("--lots", type=int, default=30, help="작업자 1명당 LOT 수 (공정 2번씩 스캔)")
+    ap.add_argument("--gap", type=float, default=0.05, help="스캔 사이 간격(초)")
+    ap.add_argument("--latency", type=float, default=0.08, help="요청 1회 왕복 지연(초)")
+    ap.add_argument("--drop", type=float, default=0.1, help="요청마다 연결이 끊길 확률")
+    ap.add_argument("--outage", type=float, default=1.5, help="주기마다 완전히 끊기는 시간(초)")
+    ap.add_argument("--period", type=float, default=4.0, help="끊김 주기(초)")
+    args = ap.parse_args()
+
+    scan_queue.RETRY_MIN_SEC = 0.2
+    scan_queue.RETRY_MAX_SEC = 2.0
+    scan_queue.IDLE_SEC = 0.5
+
+    n = args.workers * args.lots * len(STEPS)
+    print(f"작업자 {args.workers}명 · 스캔 {n}건 | 왕복 {args.latency * 1000:.0f}ms · 끊김 {args.drop:.0%}"
+          f" · {args.period:g}초마다 {args.outage:g}초 먹통")
+    bad = 0
+    for label, run in (("[바로 저장] record_step", run_direct), ("[대기열] scan_queue", run_queue)):
+        client, waits, scanned, drain = run(args)
+        lost, dup = check(client)
+        bad += (lost + dup) if run is run_queue else 0
+        print(f"   {label:<24} 저장 대기 중앙값 {statistics.median(waits) * 1000:8.1f}ms · p99 {pct(waits, 0.99) * 1000:8.1f}ms"
+              f" · 최대 {max(waits) * 1000:8.1f}ms | 스캔 끝 {scanned:5.1f}초 + 전송 마무리 {drain:4.1f}초"
+              f" | 빠짐 {lost} / 중복 {dup} | 요청 {len(client.calls)}회")
+
+    if bad:
+        sys.exit("❌ 대기열 경로에서 빠짐/중복 발생")
+    print("\n✅ 대기열: 작업자는 네트워크를 기다리지 않고, 스캔은 빠짐·중복 없이 전부 저장")
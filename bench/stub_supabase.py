@@ -0,0 +1,353 @@
+# 파일명: bench/stub_supabase.py
+# ==========================================
+# 🧪 로컬 검증용 Supabase 대역(stand-in)
+#   * 앱이 쓰는 쿼리 빌더 문법(table/select/eq/in_/order/limit/insert/update/rpc ...)을
+#     메모리 안에서 흉내냄 - DB 없이 성능/동시성 확인용
+#   * latency 로 왕복 지연을 주입할 수 있음 (요청마다 time.sleep)
+#     slow={"production_logs": 2.0} 처럼 테이블/RPC 이름별로 추가 지연도 가능
+#   * sql/*.sql 의 RPC 함수는 register_rpc 로 같은 의미의 파이썬 함수를 등록
+#   * 계산 컬럼(generated column)은 add_generated 로 등록
+#   * drop=함수(대상, 동작) → "before"(요청이 DB 에 닿기 전 끊김) / "after"(DB 반영 후 응답만 끊김) / None
+#     로 연결 끊김을 흉내냄 (둘 다 앱에서는 예외로 보임)
+# ==========================================
+import copy
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class StubAPIError(Exception):
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class StubResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _like(value, pattern, case_insensitive):
+    import fnmatch
+    value = "" if value is None else str(value)
+    pattern = pattern.replace("%", "*")
+    if case_insensitive:
+        return fnmatch.fnmatchcase(value.lower(), pattern.lower())
+    return fnmatch.fnmatchcase(value, pattern)
+
+
+class StubQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table_name = table
+        self.op = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.limit_n = None
+        self.count_mode = None
+        self.on_conflict = None
+        self.filter_cols = []
+
+    # --- 동작 ---
+    def select(self, columns="*", count=None):
+        self.op = "select"; self.columns = columns; self.count_mode = count
+        return self
+
+    def insert(self, rows):
+        self.op = "insert"; self.payload = rows
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.op = "upsert"; self.payload = rows; self.on_conflict = on_conflict
+        return self
+
+    def update(self, values):
+        self.op = "update"; self.payload = values
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    # --- 필터 ---
+    def eq(self, col, v): self.filter_cols.append(col); self.filters.append(lambda r: r.get(col) == v); return self
+    def neq(self, col, v): self.filter_cols.append(col); self.filters.append(lambda r: r.get(col) != v); return self
+    def gt(self, col, v): self.filter_cols.append(col); self.filters.append(lambda r: r.get(col) is not None and str(r.get(col)) > str(v)); return self
+    def gte(self, col, v): self.filter_cols.append(col); self.filters.append(lambda r: r.get(col) is not None and str(r.get(col)) >= str(v)); return self
+    def lt(self, col, v): self.filter_cols.append(col); self.filters.append(lambda r: r.get(col) is not None and str(r.get(col)) < str(v)); return self
+    def lte(self, col, v): self.filter_cols.append(col); self.filters.append(lambda r: r.get(col) is not None and str(r.get(col)) <= str(v)); return self
+    def like(self, col, p): self.filter_cols.append(col); self.filters.append(lambda r: _like(r.get(col), p, False)); return self
+    def ilike(self, col, p): self.filter_cols.append(col); self.filters.append(lambda r: _like(r.get(col), p, True)); return self
+
+    def in_(self, col, values):
+        values = set(values)
+        self.filter_cols.append(col)
+        self.filters.append(lambda r: r.get(col) in values)
+        return self
+
+    def or_(self, expr):
+        # "status.ilike.*접합*,status.eq.출고" 형태만 지원
+        conds = []
+        for part in expr.split(","):
+            col, op, val = part.split(".", 2)
+            if op == "eq": conds.append(lambda r, c=col, v=val: str(r.get(c)) == v)
+            elif op == "ilike": conds.append(lambda r, c=col, v=val: _like(r.get(c), v, True))
+            elif op == "like": conds.append(lambda r, c=col, v=val: _like(r.get(c), v, False))
+            else: raise StubAPIError(f"unsupported or_ operator: {op}")
+        self.filters.append(lambda r: any(c(r) for c in conds))
+        return self
+
+    def order(self, col, desc=False):
+        self.orders.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    # --- 실행 ---
+    def _apply_insert(self, row):
+        # RPC 대역 함수 안에서 쓰는 insert (왕복/끊김 없이 바로 반영)
+        self.op, self.payload = "insert", row
+        return self._apply()
+
+    def _match(self, row):
+        return all(f(row) for f in self.filters)
+
+    def _project(self, row):
+        if self.columns.strip() == "*":
+            return dict(row)
+        cols = [c.strip() for c in self.columns.split(",")]
+        return {c: row.get(c) for c in cols}
+
+    def execute(self):
+        c = self.client
+        c._round_trip(self.table_name, self.op)
+        fault = c._fault(self.table_name, self.op)
+        if fault == "before":
+            raise StubAPIError("connection dropped before request")
+        res = self._apply()
+        if fault == "after":
+            raise StubAPIError("connection dropped before response")
+        return res
+
+    def _apply(self):
+        c = self.client
+        with c.lock:
+            rows = c.tables.setdefault(self.table_name, [])
+            if rows:
+                # 실제 PostgREST 처럼 없는 컬럼으로 거르면 오류
+                missing = [col for col in self.filter_cols if col not in rows[0]]
+                if missing:
+                    raise StubAPIError(f"column {self.table_name}.{missing[0]} does not exist", "42703")
+            if self.op == "select":
+                hit = [r for r in rows if self._match(r)]
+                for col, desc in reversed(self.orders):
+                    hit.sort(key=lambda r: (r.get(col) is None, str(r.get(col))), reverse=desc)
+                total = len(hit)
+                if self.limit_n is not None:
+                    hit = hit[:self.limit_n]
+                return StubResponse([self._project(r) for r in hit], total if self.count_mode else None)
+
+            if self.op in ("insert", "upsert"):
+                payload = self.payload if isinstance(self.payload, list) else [self.payload]
+                key = self.on_conflict or c.unique.get(self.table_name)
+                out = []
+                for new in payload:
+                    new = copy.deepcopy(new)
+                    existing = None
+                    if key is not None:
+                        existing = next((r for r in rows if r.get(key) == new.get(key)), None)
+                    if existing is not None and self.op == "insert":
+                        raise StubAPIError(f"duplicate key value violates unique constraint ({key}={new.get(key)})", "23505")
+                    if existing is not None:
+                        existing.update(new)
+                        existing['updated_at'] = _now_iso()
+                        c._generate(self.table_name, existing)
+                        out.append(dict(existing))
+                        continue
+                    c.seq += 1
+                    new.setdefault('id', c.seq)
+                    new.setdefault('created_at', _now_iso())
+                    new.setdefault('updated_at', new['created_at'])
+                    c._generate(self.table_name, new)
+                    rows.append(new)
+                    out.append(dict(new))
+                return StubResponse(out)
+
+            if self.op == "update":
+                out = []
+                for r in rows:
+                    if self._match(r):
+                        r.update(copy.deepcopy(self.payload))
+                        r['updated_at'] = _now_iso()
+                        c._generate(self.table_name, r)
+                        out.append(dict(r))
+                return StubResponse(out)
+
+            if self.op == "delete":
+                keep = [r for r in rows if not self._match(r)]
+                out = [dict(r) for r in rows if self._match(r)]
+                c.tables[self.table_name] = keep
+                return StubResponse(out)
+
+        raise StubAPIError(f"unsupported operation: {self.op}")
+
+
+class StubRpc:
+    def __init__(self, client, fn, params):
+        self.client = client
+        self.fn = fn
+        self.params = params
+
+    def execute(self):
+        c = self.client
+        handler = c.rpcs.get(self.fn)
+        if handler is None:
+            raise StubAPIError(f"Could not find the function public.{self.fn}", "PGRST202")
+        c._round_trip("rpc", self.fn)
+        fault = c._fault("rpc", self.fn)
+        if fault == "before":
+            raise StubAPIError("connection dropped before request")
+        # 실제 DB 함수는 한 트랜잭션 안에서 실행되므로 전체를 잠금 안에서 처리
+        with c.lock:
+            res = StubResponse(handler(c, **self.params))
+        if fault == "after":
+            raise StubAPIError("connection dropped before response")
+        return res
+
+
+class StubClient:
+    def __init__(self, tables=None, latency=0.0, unique=None, slow=None, drop=None):
+        self.tables = {k: [dict(r) for r in v] for k, v in (tables or {}).items()}
+        self.latency = latency
+        self.slow = dict(slow or {})   # 테이블 또는 RPC 이름 -> 추가 지연(초)
+        self.drop = drop               # (대상, 동작) -> "before" / "after" / None
+        self.unique = {"work_orders": "lot_no", "fabric_stock": "lot_no"}
+        self.unique.update(unique or {})
+        self.lock = threading.RLock()
+        self.rpcs = {}
+        self.generated = {}      # table -> {컬럼: 행으로 값 계산하는 함수}
+        self.seq = 0
+        self.calls = []          # [(table 또는 'rpc', 동작)]
+        self._calls_lock = threading.Lock()
+
+    def table(self, name):
+        return StubQuery(self, name)
+
+    def rpc(self, fn, params=None):
+        return StubRpc(self, fn, params or {})
+
+    def register_rpc(self, name, handler):
+        self.rpcs[name] = handler
+
+    def add_generated(self, table, column, fn):
+        # generated always as (...) stored 컬럼 흉내 - 기존 행도 바로 계산
+        self.generated.setdefault(table, {})[column] = fn
+        for r in self.tables.get(table, []):
+            r[column] = fn(r)
+
+    def _generate(self, table, row):
+        for col, fn in self.generated.get(table, {}).items():
+            row[col] = fn(row)
+
+    def _fault(self, target, op):
+        return self.drop(target, op) if self.drop else None
+
+    def _round_trip(self, target, op):
+        with self._calls_lock:
+            self.calls.append((target, op))
+        delay = self.latency + self.slow.get(op if target == "rpc" else target, 0.0)
+        if delay:
+            time.sleep(delay)
+
+
+# ==========================================
+# 🧵 sql/consume_fabric.sql 과 같은 의미의 대역 함수
+# ==========================================
+def stub_consume_fabric(client, items):
+    req = {}
+    for it in items:
+        req[it['lot_no']] = req.get(it['lot_no'], 0.0) + float(it['meters'])
+    out = []
+    for row in client.tables.get("fabric_stock", []):
+        if row['lot_no'] in req:
+            meters = req[row['lot_no']]
+            row['used_len'] = float(row.get('used_len') or 0) + meters
+            total = float(row.get('total_len') or 0)
+            out.append({"lot_no": row['lot_no'], "consumed": meters, "used_len": row['used_len'],
+                        "total_len": total, "remaining": total - row['used_len']})
+    return out
+
+
+# ==========================================
+# 👷 sql/record_step.sql 과 같은 의미의 대역 함수
+# ==========================================
+def stub_record_step(client, lots, step, new_status, level, data="-", worker=None, defect_type=None):
+    from work_steps import check_lot
+    by_lot = {r['lot_no']: r for r in client.tables.get("work_orders", [])}
+    out = []
+    for lot in dict.fromkeys(lots):
+        row = by_lot.get(lot)
+        prev = row['status'] if row else None
+        result = check_lot(prev, level)
+        if result == "ok":
+            if defect_type:
+                client.table("defects")._apply_insert({"lot_no": lot, "step": step, "defect_type": defect_type,
+                                                       "note": data, "status": "조치대기", "worker": worker})
+            else:
+                client.table("production_logs")._apply_insert({"lot_no": lot, "step": step, "data": data,
+                                                               "worker": worker, "result": "OK"})
+            row['status'] = new_status
+            row['updated_at'] = _now_iso()
+            client._generate("work_orders", row)
+        out.append({"lot_no": lot, "prev_status": prev, "status": row['status'] if row else None, "result": result})
+    return out
+
+
+# ==========================================
+# 📮 sql/record_scans.sql 과 같은 의미의 대역 함수 (처리한 키는 scan_receipts 에 남김)
+# ==========================================
+def stub_record_scans(client, items):
+    receipts = {r['key']: r['results'] for r in client.tables.setdefault("scan_receipts", [])}
+    out = []
+    for it in items:
+        res = receipts.get(it['key'])
+        if res is None:
+            res = stub_record_step(client, it['lots'], it['step'], it['new_status'], int(it['level']),
+                                   it.get('data') or "-", it.get('worker'), it.get('defect_type'))
+            client.tables["scan_receipts"].append({"key": it['key'], "results": res, "created_at": _now_iso()})
+            receipts[it['key']] = res
+        out.append({"key": it['key'], "results": res})
+    return out
+
+
+# ==========================================
+# 📊 sql/monitor_kpis.sql 과 같은 의미의 대역 함수
+# ==========================================
+def stub_monitor_kpis(client, since=None):
+    from monitor_engine import status_bucket
+    counts = {}
+    for row in client.tables.get("work_orders", []):
+        if since is not None and str(row.get('created_at')) < str(since):
+            continue
+        b = status_bucket(str(row.get('status')))
+        if b is not None:
+            counts[b] = counts.get(b, 0) + 1
+    return [{"bucket": b, "cnt": n} for b, n in counts.items()]
+
+
+# ==========================================
+# 🔎 sql/monitor_views.sql 의 work_orders.bucket 계산 컬럼
+# ==========================================
+def add_monitor_bucket(client):
+    from monitor_engine import status_bucket
+    client.add_generated("work_orders", "bucket", lambda r: status_bucket(str(r.get('status'))))
@@ -0,0 +1,130 @@
+# 파일명: bench/worker_save.py
+# ==========================================
+# 👷 작업자 공정 저장 - 예전 3단계(조회 → 로그 insert → 상태 update) vs record_step RPC 1번
+#   python bench/worker_save.py
+#   python bench/worker_save.py --latency 0.15 --drop 0.2
+#   1) 저장 1건 시간 / 요청 수 (모바일 왕복 지연)
+#   2) 연결 끊김: 요청마다 --drop 확률로 끊김 (DB 반영 전/후 반반) → 반쪽 저장(로그만 / 상태만) LOT 수
+#   3) 작업자 2명이 같은 LOT 들을 동시에 저장 → 로그 중복 LOT 수
+# ==========================================
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_supabase import StubClient, stub_record_step  # noqa: E402
+from work_steps import STEP_LEVEL, check_lot, next_status, record_step, _record_step_legacy  # noqa: E402
+
+STEP = "Half Cut"
+LEVEL = STEP_LEVEL[STEP]
+
+
+def seed(n):
+    return {"work_orders": [{"id": i + 1, "lot_no": f"SAVE{i:05d}", "status": "Full Cut"} for i in range(n)],
+            "production_logs": [], "defects": []}
+
+
+def old_save(client, lot):
+    # 예전 pages/Worker.py 저장 흐름 (조회는 캐시가 없다고 보고 매번)
+    rows = client.table("work_orders").select("status").eq("lot_no", lot).execute().data
+    if not rows or check_lot(rows[0]['status'], LEVEL) != "ok":
+        return
+    client.table("production_logs").insert({"lot_no": lot, "step": STEP, "data": "-", "worker": "bench", "result": "OK"}).execute()
+    client.table("work_orders").update({"status": next_status(STEP)}).eq("lot_no", lot).execute()
+
+
+def legacy_save(client, lot):
+    # RPC 미설치 DB 에서 쓰는 대체 경로
+    _record_step_legacy(client, [lot], STEP, next_status(STEP), LEVEL, "-", "bench", None)
+
+
+def rpc_save(client, lot):
+    record_step(client, [lot], STEP, LEVEL, "-", "bench")
+
+
+MODES = [("[예전] 조회+insert+update", old_save, False),
+         ("[대체] work_steps 대체 경로", legacy_save, False),
+         ("[신규] record_step RPC", rpc_save, True)]
+
+
+def make_client(n, use_rpc, latency=0.0, drop=None):
+    client = StubClient(seed(n), latency=latency, drop=drop)
+    if use_rpc:
+        client.register_rpc("record_step", stub_record_step)
+    return client
+
+
+def half_written(client):
+    # 로그는 있는데 상태가 그대로 / 상태는 바뀌었는데 로그가 없음
+    logged = {r['lot_no'] for r in client.tables["production_logs"]}
+    advanced = {r['lot_no'] for r in client.tables["work_orders"] if r['status'] == next_status(STEP)}
+    return len(logged - advanced), len(advanced - logged)
+
+
+def duplicated(client):
+    seen, dup = set(), set()
+    for r in client.tables["production_logs"]:
+        (dup if r['lot_no'] in seen else seen).add(r['lot_no'])
+    return len(dup)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.08, help="요청 1회 왕복 지연(초) - 현장 Wi-Fi/모바일")
+    ap.add_argument("--saves", type=int, default=20)
+    ap.add_argument("--drop", type=float, default=0.1, help="요청마다 연결이 끊길 확률")
+    ap.add_argument("--lots", type=int, default=500)
+    args = ap.parse_args()
+
+    print(f"1) 저장 1건 (왕복 지연 {args.latency * 1000:.0f}ms, {args.saves}건 평균)")
+    for label, save, use_rpc in MODES:
+        client = make_client(args.saves, use_rpc, args.latency)
+        t0 = time.perf_counter()
+        for i in range(args.saves):
+            save(client, f"SAVE{i:05d}")
+        ms = (time.perf_counter() - t0) * 1000 / args.saves
+        print(f"   {label:<28} {ms:7.1f}ms | 요청 {len(client.calls) / args.saves:.1f}회/건")
+
+    print(f"\n2) 연결 끊김 (요청마다 {args.drop:.0%}, LOT {args.lots}개)")
+    bad_total = 0
+    for label, save, use_rpc in MODES:
+        rng = random.Random(3)
+        drop = lambda target, op, rng=rng: (rng.choice(("before", "after")) if rng.random() < args.drop else None)
+        client = make_client(args.lots, use_rpc, drop=drop)
+        failed = 0
+        for i in range(args.lots):
+            try:
+                save(client, f"SAVE{i:05d}")
+            except Exception:
+                failed += 1
+        log_only, status_only = half_written(client)
+        print(f"   {label:<28} 오류 {failed:3d}건 | 반쪽 저장: 로그만 {log_only:3d} / 상태만 {status_only:3d}")
+        if use_rpc:
+            bad_total = log_only + status_only
+
+    print("\n3) 작업자 2명이 같은 LOT 동시 저장 (LOT 100개)")
+    dup_total = 0
+    for label, save, use_rpc in MODES:
+        client = make_client(100, use_rpc, latency=0.002)
+        start = threading.Barrier(2)
+
+        def worker(start=start, save=save, client=client):
+            start.wait()
+            for i in range(100):
+                save(client, f"SAVE{i:05d}")
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        dup = duplicated(client)
+        print(f"   {label:<28} 로그 중복 LOT {dup:3d}")
+        if use_rpc:
+            dup_total = dup
+
+    if bad_total or dup_total:
+        sys.exit("❌ RPC 경로에서 반쪽 저장/중복 발생")
+    print("\n✅ RPC 경로: 반쪽 저장 / 중복 기록 없음")
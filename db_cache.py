@@ -0,0 +1,129 @@
+# 파일명: db_cache.py
+# ==========================================
+# 🗄️ Supabase 조회 결과 공용 캐시 (서버 프로세스 1개 = 캐시 1개)
+#   * 관리자/작업자/모니터 화면, 여러 브라우저 세션이 같은 캐시를 공유
+#   * 테이블별 TTL + 최대 개수 초과 시 오래 안 쓴 항목부터 제거(LRU)
+#   * 앱에서 쓰기(발행/스캔 저장/불량/입고/삭제)를 하면 영향받는 항목만 무효화
+#     (조회 도중에 무효화되면 그 조회 결과는 쓰기 전 데이터일 수 있어서 캐시에 넣지 않음)
+#
+#   rows = cached_select("work_orders", "recent100", lambda: ...execute().data)
+#   rows = cached_select("production_logs", "by_lot", lambda: ..., lot=lot_no)
+#   invalidate("work_orders", lots=[lot_no])   # 해당 LOT 조회 + 목록 조회만 제거
+#   invalidate("fabric_stock")                 # 테이블 전체 제거
+#   invalidate("work_orders", lots=lots, deleted=True)   # 행 삭제 - 증분 조회(모니터)는 전체 다시 읽기
+#
+# ※ 돌려받은 데이터는 여러 세션이 같이 보므로 직접 수정하지 말 것
+# ==========================================
+import threading
+import time
+from collections import OrderedDict
+
+# 테이블별 보관 시간(초) - 다른 서버/SQL 에서 바뀐 데이터는 이 시간 안에 반영됨
+TABLE_TTL = {
+    "work_orders": 10,
+    "production_logs": 10,
+    "fabric_stock": 60,
+    "defects": 30,
+}
+DEFAULT_TTL = 10
+MAX_ENTRIES = 256
+
+
+class ReadCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (만료시각, tags, data)
+        self._inflight = {}            # 진행 중인 조회 -> [tags, 도중에 무효화됐는지]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_fetch(self, key, fetch, tags, ttl):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            tags = frozenset(tags)
+            token = object()
+            self._inflight[token] = [tags, False]
+
+        # DB 조회는 잠금 밖에서 (느린 조회가 다른 세션을 막지 않도록)
+        try:
+            data = fetch()
+        except Exception:
+            with self._lock:
+                self._inflight.pop(token, None)
+            raise
+
+        # 무효화 확인과 저장은 잠금 한 번 안에서 (그 사이에 무효화가 끼어들면 쓰기 전 데이터가 남음)
+        with self._lock:
+            if self._inflight.pop(token)[1]:
+                # 조회 도중 쓰기로 무효화됨 → 쓰기 전 데이터일 수 있으니 이번 결과만 돌려주고 저장 안 함
+                return data
+            self._entries[key] = (time.monotonic() + ttl, tags, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def invalidate_tags(self, tags):
+        tags = set(tags)
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e[1] & tags]:
+                del self._entries[key]
+            for rec in self._inflight.values():
+                if rec[0] & tags:
+                    rec[1] = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for rec in self._inflight.values():
+                rec[1] = True
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_cache = ReadCache()
+
+# 테이블별 쓰기 횟수 - 캐시 밖에서 데이터를 들고 있는 곳(모니터 증분 조회 등)이 변경 여부 확인용
+_versions = {}
+_delete_versions = {}   # 그중 행 삭제 횟수 (증분 조회로는 삭제를 알 수 없음)
+_versions_lock = threading.Lock()
+
+
+def cached_select(table, key, fetch, lot=None, ttl=None):
+    # lot 을 주면 해당 LOT 전용 조회, 없으면 목록(여러 행) 조회로 태그를 붙임
+    tags = {table, f"{table}:{lot}" if lot is not None else f"{table}:*"}
+    if ttl is None:
+        ttl = TABLE_TTL.get(table, DEFAULT_TTL)
+    return _cache.get_or_fetch((table, key, lot), fetch, tags, ttl)
+
+
+def invalidate(table, lots=None, deleted=False):
+    with _versions_lock:
+        _versions[table] = _versions.get(table, 0) + 1
+        if deleted:
+            _delete_versions[table] = _delete_versions.get(table, 0) + 1
+    if lots is None:
+        _cache.invalidate_tags({table})
+    else:
+        _cache.invalidate_tags({f"{table}:*"} | {f"{table}:{lot}" for lot in lots})
+
+
+def table_version(table):
+    return _versions.get(table, 0)
+
+
+def table_delete_version(table):
+    return _delete_versions.get(table, 0)
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,76 @@
+# 파일명: db_fetch.py
+# ==========================================
+# 🚚 서로 독립적인 DB 조회를 동시에 실행 (대기 시간 = 왕복 시간의 합 → 가장 느린 조회 1개)
+#   results, errors = fetch_all({
+#       "wo": lambda: supabase.table("work_orders").select("*").eq("lot_no", lot).execute().data,
+#       "logs": (lambda: supabase.table("production_logs")...execute().data, 3),   # (조회 함수, 제한 시간 초)
+#   })
+#   results["wo"], results["logs"]  /  실패·시간 초과한 조회는 errors[이름] = 예외
+#
+#   * 서버 프로세스 공용 스레드 풀 1개 (BT_FETCH_WORKERS, 0 이면 예전처럼 차례대로 실행)
+#   * 제한 시간을 넘긴 조회는 FetchTimeout 으로 돌려주고 더 기다리지 않음
+#     (이미 보낸 HTTP 요청은 취소할 수 없어서 그 스레드는 응답이 올 때까지 풀에 남음)
+#   * 조회 함수 안에서 st.* 를 부르거나 fetch_all 을 다시 부르지 말 것 (화면 밖 스레드 / 풀 고갈)
+# ==========================================
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+FETCH_WORKERS = int(os.environ.get("BT_FETCH_WORKERS", "8"))
+DEFAULT_TIMEOUT = float(os.environ.get("BT_FETCH_TIMEOUT_SEC", "10"))
+
+
+class FetchTimeout(Exception):
+    pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="db-fetch")
+        return _pool
+
+
+def fetch_all(jobs, timeout=None):
+    # jobs: {이름: 조회 함수} 또는 {이름: (조회 함수, 제한 시간 초)}
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    specs = {name: job if isinstance(job, tuple) else (job, timeout) for name, job in jobs.items()}
+    results, errors = {}, {}
+
+    if FETCH_WORKERS <= 0:
+        return _run_inline(specs)
+
+    pool = _get_pool()
+    start = time.monotonic()
+    try:
+        futures = {name: (pool.submit(fn), limit) for name, (fn, limit) in specs.items()}
+    except RuntimeError:
+        # 서버 종료 중(풀 정리됨) → 차례대로 실행
+        return _run_inline(specs)
+    for name, (fut, limit) in futures.items():
+        try:
+            results[name] = fut.result(timeout=max(0.0, start + limit - time.monotonic()))
+        except FuturesTimeout:
+            fut.cancel()
+            errors[name] = FetchTimeout(f"{name}: {limit:g}초 안에 응답 없음")
+        except Exception as e:
+            errors[name] = e
+    return results, errors
+
+
+def _run_inline(specs):
+    results, errors = {}, {}
+    for name, (fn, _) in specs.items():
+        try:
+            results[name] = fn()
+        except Exception as e:
+            errors[name] = e
+    return results, errors
@@ -0,0 +1,53 @@
+# 파일명: db_metrics.py
+# ==========================================
+# ⏱️ DB 호출 계측 (화면 1회 실행(rerun)당 호출 수 / 소요 시간)
+#   supabase = MeteredClient(get_supabase_client())
+#   ... 쿼리 실행 ...
+#   supabase.calls, supabase.ms  → 이번 실행에서 쓴 DB 왕복 횟수 / 시간(ms)
+#   (db_fetch 로 동시에 조회하면 ms 는 각 조회 시간의 합 → 실제 대기 시간보다 클 수 있음)
+# ==========================================
+import threading
+import time
+
+
+class MeteredClient:
+    def __init__(self, client):
+        self._client = client
+        self.calls = 0
+        self.ms = 0.0
+        self.lock = threading.Lock()   # db_fetch 스레드에서 동시에 기록
+
+    def table(self, name):
+        return _MeteredBuilder(self, self._client.table(name))
+
+    def rpc(self, fn, params=None):
+        return _MeteredBuilder(self, self._client.rpc(fn, params or {}))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class _MeteredBuilder:
+    # 쿼리 빌더를 감싸서 execute() 가 호출될 때만 횟수/시간을 기록
+    def __init__(self, meter, builder):
+        self._meter = meter
+        self._builder = builder
+
+    def execute(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return self._builder.execute(*args, **kwargs)
+        finally:
+            with self._meter.lock:
+                self._meter.calls += 1
+                self._meter.ms += (time.perf_counter() - t0) * 1000
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def chained(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return _MeteredBuilder(self._meter, result) if result is not None else result
+        return chained
@@ -0,0 +1,89 @@
+# 파일명: fonts.py
+# ==========================================
+# 🔤 라벨용 폰트 관리
+#   * 폰트 파일 위치 (앞에서부터 먼저 찾은 것 사용)
+#       1) 환경변수 BT_FONT_PATH
+#       2) 저장소에 포함된 assets/fonts/NanumGothic-Bold.ttf
+#       3) 예전 방식으로 받아둔 실행 폴더의 NanumGothic-Bold.ttf / 시스템 나눔 폰트
+#     → 인터넷(GitHub) 다운로드 없음 (망분리 현장 PC 대응)
+#   * 라벨에 쓰는 크기는 미리 로드 (preload)
+#   * 같은 글자열의 크기 측정/래스터 결과를 캐시 → 라벨 수천 장에서 재계산 안 함
+# ==========================================
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_FILE = "NanumGothic-Bold.ttf"
+BUNDLED_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "fonts", FONT_FILE)
+SYSTEM_FONTS = [
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/nanum/NanumGothicBold.ttf",
+    "C:/Windows/Fonts/NanumGothicBold.ttf",
+    "C:/Windows/Fonts/malgunbd.ttf",
+]
+
+# create_label_strip_image 에서 쓰는 글자 크기
+LABEL_FONT_SIZES = (24, 28)
+
+
+def font_candidates():
+    env_path = os.environ.get("BT_FONT_PATH")
+    return ([env_path] if env_path else []) + [BUNDLED_FONT, FONT_FILE] + SYSTEM_FONTS
+
+
+@lru_cache(maxsize=1)
+def resolve_font_path():
+    for path in font_candidates():
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def has_korean_font():
+    return resolve_font_path() is not None
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    path = resolve_font_path()
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    # 한글은 안 나오지만 라벨 출력 자체는 멈추지 않도록 기본 폰트로 대체
+    return ImageFont.load_default()
+
+
+def preload(sizes=LABEL_FONT_SIZES):
+    for size in sizes:
+        get_font(size)
+
+
+@lru_cache(maxsize=8192)
+def text_bbox(text, size):
+    # (left, top, right, bottom) - 기준점(좌상단) 대비 글자 영역
+    return get_font(size).getbbox(text)
+
+
+def text_width(text, size):
+    l, _, r, _ = text_bbox(text, size)
+    return r - l
+
+
+@lru_cache(maxsize=4096)
+def text_mask(text, size):
+    # 글자열을 한 번만 래스터화해서 알파 마스크로 보관 (고객사명/규격/전극은 반복이 많음)
+    l, t, r, b = text_bbox(text, size)
+    mask = Image.new("L", (max(1, r - l), max(1, b - t)), 0)
+    ImageDraw.Draw(mask).text((-l, -t), text, font=get_font(size), fill=255)
+    return mask, (l, t)
+
+
+def draw_text(img, xy, text, size, fill=(0, 0, 0)):
+    # ImageDraw.text((x, y), text, font=get_font(size)) 와 같은 위치에 그림
+    if not text:
+        return
+    mask, (l, t) = text_mask(text, size)
+    img.paste(fill, (xy[0] + l, xy[1] + t), mask)
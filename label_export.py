@@ -0,0 +1,117 @@
+# 파일명: label_export.py
+# ==========================================
+# 📦 라벨 파일 내보내기 (라벨 1장 = PDF 1페이지 / ZIP 안의 PNG 1개)
+#   * 라벨을 EXPORT_BATCH 장씩 그려서 바로 파일에 써 내려감
+#     → 라벨이 100장이든 5,000장이든 메모리 사용량은 거의 일정
+#   * 기존 create_label_strip_image 는 (472 x 라벨수) 폭의 한 장짜리 이미지를
+#     통째로 만들기 때문에 대량 출력에서는 이 모듈을 사용
+# ==========================================
+import io
+import zipfile
+import zlib
+
+from label_render import MAX_WORKERS, render_labels
+
+# 라벨 용지 크기 (mm) - 롤 프린터 40x20mm
+LABEL_MM = (40, 20)
+EXPORT_BATCH = 64
+
+
+def iter_label_images(items, rotate=False, workers=None):
+    # 라벨 이미지를 묶음 단위로 만들어 하나씩 넘겨줌 (전체를 메모리에 쌓지 않음)
+    workers = workers or MAX_WORKERS
+    batch = max(EXPORT_BATCH, 16 * workers)
+    for i in range(0, len(items), batch):
+        for tile in render_labels(items[i:i + batch], workers):
+            yield tile.rotate(90, expand=True) if rotate else tile
+
+
+def export_labels_zip(items, fp, rotate=False, workers=None):
+    with zipfile.ZipFile(fp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for n, (it, img) in enumerate(zip(items, iter_label_images(items, rotate, workers)), start=1):
+            buf = io.BytesIO()
+            img.convert("L").save(buf, format="PNG")  # 흑백 라벨이라 회색조로 저장 (용량 절반)
+            zf.writestr(f"{n:04d}_{it.get('lot', '')}.png", buf.getvalue())
+    return fp
+
+
+def export_labels_pdf(items, fp, rotate=False, workers=None):
+    w_mm, h_mm = (LABEL_MM[1], LABEL_MM[0]) if rotate else LABEL_MM
+    pdf = StreamingPdfWriter(fp)
+    for img in iter_label_images(items, rotate, workers):
+        pdf.add_image_page(img, w_mm, h_mm)
+    pdf.close()
+    return fp
+
+
+# ==========================================
+# 📄 최소 PDF 작성기 - 페이지마다 이미지 1개, 쓰는 즉시 파일로 내보냄
+#   (Pillow 의 save_all 은 모든 페이지 이미지를 메모리에 들고 있어야 해서 사용 안 함)
+# ==========================================
+MM_TO_PT = 72 / 25.4
+
+
+class StreamingPdfWriter:
+    CATALOG = 1
+    PAGES = 2
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.pos = 0
+        self.offsets = {}
+        self.next_id = 3
+        self.page_ids = []
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.pos += len(data)
+
+    def _obj(self, obj_id, body, stream=None):
+        self.offsets[obj_id] = self.pos
+        self._write(f"{obj_id} 0 obj\n".encode())
+        self._write(body)
+        if stream is not None:
+            self._write(b"\nstream\n")
+            self._write(stream)
+            self._write(b"\nendstream")
+        self._write(b"\nendobj\n")
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def add_image_page(self, img, w_mm, h_mm):
+        gray = img.convert("L")
+        data = zlib.compress(gray.tobytes(), 6)
+        w_pt, h_pt = w_mm * MM_TO_PT, h_mm * MM_TO_PT
+
+        img_id = self._new_id()
+        self._obj(img_id, (
+            f"<< /Type /XObject /Subtype /Image /Width {gray.width} /Height {gray.height} "
+            f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>"
+        ).encode(), data)
+
+        content = f"q {w_pt:.3f} 0 0 {h_pt:.3f} 0 0 cm /Im0 Do Q".encode()
+        content_id = self._new_id()
+        self._obj(content_id, f"<< /Length {len(content)} >>".encode(), content)
+
+        page_id = self._new_id()
+        self._obj(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {w_pt:.3f} {h_pt:.3f}] "
+            f"/Resources << /XObject << /Im0 {img_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode())
+        self.page_ids.append(page_id)
+
+    def close(self):
+        kids = " ".join(f"{p} 0 R" for p in self.page_ids)
+        self._obj(self.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+        self._obj(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode())
+
+        xref_pos = self.pos
+        size = self.next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            lines.append(f"{self.offsets[obj_id]:010d} 00000 n \n")
+        self._write("".join(lines).encode())
+        self._write(f"trailer\n<< /Size {size} /Root {self.CATALOG} 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n".encode())
@@ -0,0 +1,134 @@
+# 파일명: label_render.py
+# ==========================================
+# 🏷️ 라벨 이미지 렌더링 엔진
+#   * 라벨 1장(472x236) 단위로 그리고, 대량 출력은 프로세스 풀로 나눠서 처리
+#   * 결과는 입력 순서 그대로 다시 조립
+#   * QR 은 qr_assets 캐시를 거치므로 이미 만든 LOT 는 인코딩하지 않음
+# ==========================================
+import io
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw
+
+import fonts
+from qr_assets import get_qr_image, get_qr_png, has_qr_png, store_qr_png, lot_qr_data
+
+LABEL_W = 472
+LABEL_H = 236
+QR_SIZE = 190
+
+# 이 개수보다 적으면 프로세스 풀을 띄우는 비용이 더 크므로 그냥 순차 처리
+PARALLEL_MIN = 64
+MAX_WORKERS = int(os.environ.get("BT_RENDER_WORKERS", "0")) or (os.cpu_count() or 1)
+
+_pool = None
+_pool_workers = 0   # 지금 풀의 프로세스 수
+_pool_lock = threading.Lock()
+
+
+def draw_label(img, draw, x, it):
+    # (x, 0) 위치에 라벨 1장을 그림
+    draw.rectangle([x, 0, x + LABEL_W-1, LABEL_H-1], outline="#cccccc", width=2)
+
+    lot = it.get('lot', '')
+    cust = str(it.get('cust', ''))
+    w = str(it.get('w', '0'))
+    h = str(it.get('h', '0'))
+    e = str(it.get('elec', ''))
+
+    qr_img = get_qr_image(lot_qr_data(lot), size=QR_SIZE)
+    img.paste(qr_img, (x + 10, (LABEL_H - QR_SIZE) // 2))
+
+    tx = x + 210
+    fonts.draw_text(img, (tx, 25), lot, 28)
+    fonts.draw_text(img, (tx, 75), cust, 28 if len(cust)<5 else 24)
+    fonts.draw_text(img, (tx, 125), f"{w} x {h}", 28)
+    fonts.draw_text(img, (tx, 170), f"[{e}]", 28)
+
+
+def render_label(it):
+    img = Image.new('RGB', (LABEL_W, LABEL_H), 'white')
+    draw_label(img, ImageDraw.Draw(img), 0, it)
+    return img
+
+
+# ------------------------------------------
+# ⚙️ 프로세스 풀 (한 번 띄우고 계속 재사용)
+# ------------------------------------------
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Streamlit 서버는 스레드를 쓰므로 fork 대신 spawn 으로 깨끗한 프로세스를 띄움
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _chunks(seq, workers):
+    size = max(16, math.ceil(len(seq) / (workers * 4)))
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+
+def _render_chunk(items):
+    # 자식 프로세스: 라벨 raw 픽셀을 돌려줌 (PNG 압축/해제 비용 없이 전달)
+    fonts.preload()
+    return [render_label(it).tobytes() for it in items]
+
+
+def _qr_chunk(args):
+    datas, box_size, border, size = args
+    return [get_qr_png(d, box_size, border, size) for d in datas]
+
+
+def render_labels(items, workers=None):
+    # 라벨 이미지 목록 (입력 순서 유지)
+    workers = workers or MAX_WORKERS
+    if workers <= 1 or len(items) < PARALLEL_MIN:
+        fonts.preload()
+        return [render_label(it) for it in items]
+
+    pool = _get_pool(workers)
+    out = []
+    for raw_list in pool.map(_render_chunk, _chunks(list(items), workers)):
+        out.extend(Image.frombytes('RGB', (LABEL_W, LABEL_H), raw) for raw in raw_list)
+    return out
+
+
+def warm_qr_cache(datas, box_size=5, border=0, size=None, workers=None):
+    # 캐시에 없는 QR 만 골라 프로세스 풀에서 미리 생성 → 이후 get_qr_* 는 조회만 함
+    workers = workers or MAX_WORKERS
+    missing = [d for d in dict.fromkeys(datas) if not has_qr_png(d, box_size, border, size)]
+    if workers <= 1 or len(missing) < PARALLEL_MIN:
+        return
+    pool = _get_pool(workers)
+    jobs = [(c, box_size, border, size) for c in _chunks(missing, workers)]
+    for (chunk, *_), pngs in zip(jobs, pool.map(_qr_chunk, jobs)):
+        for d, png in zip(chunk, pngs):
+            store_qr_png(d, png, box_size, border, size)
+
+
+def create_label_strip_image(items, rotate=False, workers=None):
+    if not items:
+        return None
+    strip_w = LABEL_W * len(items)
+    full_img = Image.new('RGB', (strip_w, LABEL_H), 'white')
+    draw = ImageDraw.Draw(full_img)
+
+    for i, tile in enumerate(render_labels(items, workers)):
+        x = i * LABEL_W
+        full_img.paste(tile, (x, 0))
+        if i < len(items) - 1:
+            draw.line([(x + LABEL_W - 1, 0), (x + LABEL_W - 1, LABEL_H)], fill="#999", width=1)
+
+    if rotate:
+        full_img = full_img.rotate(90, expand=True)
+    buf = io.BytesIO()
+    full_img.save(buf, format="PNG")
+    return buf.getvalue()
@@ -0,0 +1,102 @@
+# 파일명: live_table.py
+# ==========================================
+# 📺 모니터 표 - 바뀐 행만 브라우저로 보내는 컴포넌트 (components/live_table/index.html)
+#   * 예전: 회차마다 표 HTML 전체를 st.markdown 으로 보냄 → 브라우저가 표를 통째로 다시 만듦
+#     (진행률 막대 애니메이션이 0% 부터 다시 시작, 저사양 TV 스틱에서 끊김)
+#   * 지금: 세션마다 브라우저에 보낸 행을 기억해 두고 LOT 기준으로 추가/변경/삭제된 행만 보냄
+#     → 데이터가 그대로면 페이지 번호만 보냄 (수십 바이트)
+#   * 브라우저가 변경분 순서를 놓치면(새로고침 등) resync 를 요청 → 다음 회차에 전체를 보냄
+#   * 보안 토글(고객사/SPEC)은 여기서 값을 지우고 보냄 (가린 값은 브라우저로 안 감)
+#
+#   live_table(board_df, version, page_index, per_page, is_cust_secure, is_spec_secure)
+# ==========================================
+import json
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_component = components.declare_component(
+    "live_table", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "live_table"))
+
+# 행 값 순서 (index.html 의 F 와 같아야 함)
+ROW_FIELDS = ("time", "lot", "cust", "prod", "size", "pct", "txt", "badge", "bar", "spec")
+
+
+def board_rows(df, is_cust_secure, is_spec_secure):
+    # (LOT 순서, {LOT: [값...]}) - 가린 칸은 None
+    order, rows = [], {}
+    if df is None or df.empty:
+        return order, rows
+    time_col = df['short_time'] if 'short_time' in df else ["-"] * len(df)
+    for t, lot, cust, prod, size, pct, txt, badge, bar, spec in zip(
+            time_col, df['lot_no'], df['customer'], df['product'], df['dimension'],
+            df['pct'], df['txt'], df['badge'], df['bar'], df['spec']):
+        lot = str(lot)
+        order.append(lot)
+        rows[lot] = [str(t), lot,
+                     None if is_cust_secure else str(cust), None if is_cust_secure else str(prod),
+                     str(size), int(pct), str(txt), str(badge), str(bar),
+                     None if is_spec_secure else str(spec)]
+    return order, rows
+
+
+def make_patch(sent, order, rows, full):
+    # sent: 이 세션 브라우저에 보낸 상태 {"seq", "order", "rows"} (여기서 갱신)
+    base = sent["seq"]
+    if full:
+        upsert, remove = rows, []
+        new_order = order
+        base = -1
+    else:
+        old_rows = sent["rows"]
+        upsert = {lot: v for lot, v in rows.items() if old_rows.get(lot) != v}
+        remove = [lot for lot in old_rows if lot not in rows]
+        new_order = order if order != sent["order"] else None
+        if not upsert and not remove and new_order is None:
+            return {"seq": sent["seq"], "base": sent["seq"]}
+    sent["seq"] += 1
+    sent["order"] = order
+    sent["rows"] = rows
+    patch = {"seq": sent["seq"], "base": base}
+    if upsert:
+        patch["upsert"] = upsert
+    if remove:
+        patch["remove"] = remove
+    if new_order is not None:
+        patch["order"] = new_order
+    return patch
+
+
+def live_table(df, version, page_index, per_page, is_cust_secure, is_spec_secure, key="live_table"):
+    # version: 데이터가 바뀌면 달라지는 값 (스냅샷 버전) / 반환: 이번 회차에 보낸 데이터 크기(바이트, 진단용)
+    sent = st.session_state.setdefault(f"_{key}_sent", {"seq": 0, "order": [], "rows": {}, "src": None, "resync": None, "full": True})
+
+    # 브라우저가 보낸 전체 다시 받기 요청 (같은 요청은 한 번만 처리)
+    value = st.session_state.get(key) or {}
+    if value.get("resync") is not None and value.get("resync") != sent["resync"]:
+        sent["resync"] = value["resync"]
+        sent["full"] = True
+
+    # 같은 데이터/토글이면 행 비교도 건너뜀
+    src = (version, is_cust_secure, is_spec_secure)
+    if sent["full"] or src != sent["src"]:
+        order, rows = board_rows(df, is_cust_secure, is_spec_secure)
+        patch = make_patch(sent, order, rows, sent["full"])
+        sent["src"] = src
+        sent["full"] = False
+    else:
+        patch = {"seq": sent["seq"], "base": sent["seq"]}
+
+    patch["page"] = int(page_index)
+    patch["per_page"] = int(per_page)
+    _component(patch=patch, key=key, default=None)
+    return len(json.dumps(patch, ensure_ascii=False).encode("utf-8"))
+
+
+def reset_live_table(key="live_table"):
+    # 표를 안 그린 회차(데이터 없음 등) → 브라우저 쪽 표가 사라지므로 다음에 전체를 보냄
+    sent = st.session_state.get(f"_{key}_sent")
+    if sent is not None:
+        sent["full"] = True
+        sent["src"] = None
@@ -0,0 +1,138 @@
+# 파일명: monitor_engine.py
+# ==========================================
+# 📊 모니터 상태 계산 (집계 박스 7개 + 행별 진행률/뱃지)
+#   * LOT 별 마지막 공정: work_orders.last_step (sql/work_order_progress.sql) 을 우선 사용,
+#     없으면 로그를 시간순 정렬 후 LOT 당 마지막 1건 (groupby 한 번)
+#     ※ 예전 화면은 최신순 로그에서 iloc[-1] 을 써서 '가장 오래된' 공정을 보여주던 문제 수정
+#   * 상태 문자열 → 분류/진행률/뱃지 는 서로 다른 값만 한 번씩 판정해서 표로 만들고
+#     전체 행에는 번호(factorize)로 찾아 붙임 (행 수가 늘어도 판정 횟수는 그대로)
+#
+#   board = build_board(df_orders, df_logs)   # pct / txt / badge / bar / bucket 컬럼 추가
+#   kpis = kpi_counts(board)                  # {"ready": 3, "full": 5, ...}
+# ==========================================
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+KPI_BUCKETS = ("ready", "full", "half", "elec", "lam_wait", "lam_ing", "done")
+
+WAIT = (5, "작업 대기", "badge-white", "bg-w")
+FULL = (20, "✂️ 원단 풀커팅", "badge-blue", "bg-b")
+HALF = (40, "🔪 정밀 하프커팅", "badge-purple", "bg-p")
+ELEC = (60, "⚡ 전극 부착", "badge-blue", "bg-b")
+LAM_WAIT = (70, "⏳ 접합 대기", "badge-yellow", "bg-y")
+LAM_ING = (85, "🔥 접합 진행중", "badge-orange", "bg-o")
+DONE = (100, "✅ 생산 완료", "badge-green", "bg-g")
+DONE_SHORT = (100, "✅ 생산 완료 (단품)", "badge-green", "bg-g")
+DEFECT = (100, "⛔ 불량 발생", "badge-red", "bg-r")
+
+
+@lru_cache(maxsize=1024)
+def status_bucket(status):
+    # 상단 집계 박스 분류 (불량은 어느 박스에도 안 셈)
+    s = str(status)
+    if "불량" in s:
+        return None
+    if "완료" in s or "출고" in s:
+        return "done"
+    if "접합대기" in s:
+        return "lam_wait"
+    if "접합" in s:
+        return "lam_ing"
+    if "전극" in s:
+        return "elec"
+    if "Half" in s or "하프" in s:
+        return "half"
+    if "Full" in s or "풀" in s or "원단" in s or "Cut" in s:
+        return "full"
+    if "대기" in s:
+        return "ready"
+    return None
+
+
+@lru_cache(maxsize=4096)
+def row_state(last_step, status, is_short):
+    # (진행률, 표시 문구, 뱃지 class, 막대 class)
+    state = WAIT
+    if last_step:
+        step = str(last_step)
+        # (A) 커팅
+        if "Full" in step or "풀" in step or "원단" in step:
+            state = (30,) + FULL[1:] if is_short else FULL
+        elif "Half" in step or "하프" in step:
+            state = (60,) + HALF[1:] if is_short else HALF
+        # (B) 전극
+        elif "전극" in step:
+            state = DONE_SHORT if is_short else ELEC
+        # (C) 접합
+        elif "접합" in step:
+            if "완료" in step:
+                state = DONE
+            elif "대기" in step:
+                state = LAM_WAIT
+            else:
+                state = LAM_ING
+
+    # DB 상태값 최우선 오버라이드 (완료/대기/진행중 구분)
+    s = str(status)
+    if "접합대기" in s:
+        state = LAM_WAIT
+    elif "접합" in s and "대기" not in s:
+        state = LAM_ING
+    elif "불량" in s:
+        state = DEFECT
+    elif "완료" in s or "출고" in s:
+        state = DONE
+    return state
+
+
+def last_steps(df_logs):
+    # LOT 별 가장 최근 공정명 (Series: lot_no -> step)
+    if df_logs is None or df_logs.empty:
+        return pd.Series(dtype=object)
+    logs = df_logs[['lot_no', 'step', 'created_at']].sort_values('created_at', kind='stable')
+    return logs.groupby('lot_no', sort=False)['step'].last()
+
+
+def _lookup(keys, fn):
+    # 서로 다른 값(조합)만 fn 으로 판정 → 번호로 전체 행에 펼침
+    codes, uniques = pd.factorize(keys)
+    table = [fn(*u) if isinstance(u, tuple) else fn(u) for u in uniques]
+    return codes, table
+
+
+def build_board(df_orders, df_logs):
+    if df_orders is None or df_orders.empty:
+        return pd.DataFrame()
+    board = df_orders.copy()
+    status = board['status'].astype(str)
+    spec = board['spec'].astype(str) if 'spec' in board else pd.Series("", index=board.index)
+
+    step = board['last_step'] if 'last_step' in board else pd.Series(None, index=board.index, dtype=object)
+    if step.isna().any() and df_logs is not None and not df_logs.empty:
+        step = step.fillna(board['lot_no'].map(last_steps(df_logs)))
+    step = step.fillna("").astype(str)
+    is_short = (status.str.contains("단품", regex=False)
+                | spec.str.contains("생략", regex=False)
+                | spec.str.contains("No Lam", regex=False))
+
+    codes, table = _lookup(pd.MultiIndex.from_arrays([step, status, is_short]),
+                           lambda st_, s, short: row_state(st_, s, bool(short)))
+    states = np.array(table, dtype=object)
+    board['pct'] = states[codes, 0].astype(int)
+    board['txt'] = states[codes, 1]
+    board['badge'] = states[codes, 2]
+    board['bar'] = states[codes, 3]
+
+    b_codes, b_table = _lookup(status, status_bucket)
+    board['bucket'] = np.array(b_table, dtype=object)[b_codes]
+    return board
+
+
+def kpi_counts(board):
+    counts = dict.fromkeys(KPI_BUCKETS, 0)
+    if board is not None and not board.empty:
+        for k, v in board['bucket'].value_counts().items():
+            counts[k] = int(v)
+    return counts
@@ -0,0 +1,475 @@
+# 파일명: monitor_sync.py
+# ==========================================
+# 🔄 모니터 화면 증분 조회 (변경분만 받아서 로컬 데이터에 합치기)
+#   * 마지막으로 본 변경 시각(watermark) 이후에 추가/수정된 행만 조회
+#     → 현장에 변화가 없으면 빈 응답만 오가고 DB 부하/전송량이 거의 0
+#   * 변화가 없을수록 조회 간격을 늘림 (5초 → 최대 30초), 변화가 생기면 다시 5초
+#   * 같은 서버에서 저장(스캔/발행)하면 db_cache 무효화 신호를 보고 즉시 증분 조회
+#   * 증분으로는 삭제를 알 수 없음
+#     - 같은 서버에서 삭제(발행 이력 삭제)하면 삭제 신호를 보고 즉시 전체 다시 읽기
+#     - 다른 서버/SQL 에서 삭제한 행은 FULL_RESYNC_SEC 마다 전체 다시 읽을 때 정리
+#   * updated_at 컬럼이 아직 없으면(sql/monitor_delta.sql 미적용) 예전처럼 매번 전체 조회
+#
+#   sync = DeltaSync(supabase, "work_orders", limit=100, watermark="updated_at", key="lot_no")
+#   df, changed = sync.poll()
+#
+# 🛰️ MonitorFeed : 서버 프로세스 1개당 백그라운드 조회 스레드 1개
+#   * 모니터 화면이 몇 대든 DB 조회는 이 스레드 하나만 함 → 화면 50대 = 화면 1대 부하
+#   * 화면(세션)은 메모리의 스냅샷(버전 번호 포함)만 읽음
+#   * 조회 간격(BT_MONITOR_FETCH_SEC)은 화면 전환 간격과 따로 설정
+#   * 아무 화면도 안 읽은 지 IDLE_STOP_SEC 가 지나면 조회를 쉬고, 다시 읽으면 재개
+#   * 상단 집계 박스는 DB 함수 monitor_kpis (sql/monitor_kpis.sql) 로 전체 기준 개수만 받음
+#     → 함수가 아직 없으면 화면에 받은 최근 작업으로 계산 (예전 방식)
+#   * work_orders 에 last_step 컬럼(sql/work_order_progress.sql)이 있으면 production_logs 는 조회 안 함
+#   * 보기 조건(MonitorView)마다 조회기 1개 - 조건은 DB 쿼리에 넣어서 그 화면에 필요한 행만 받음
+# ==========================================
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from db_cache import table_delete_version, table_version
+from db_fetch import fetch_all
+from monitor_engine import KPI_BUCKETS, build_board, kpi_counts, status_bucket
+
+BASE_INTERVAL = float(os.environ.get("BT_MONITOR_FETCH_SEC", "5"))  # 변화가 있을 때 조회 간격(초)
+MAX_INTERVAL = max(30, BASE_INTERVAL)  # 한산할 때 최대 조회 간격(초)
+FULL_RESYNC_SEC = 300    # 전체 다시 읽기 주기(초) - 삭제된 행 정리
+OVERLAP_SEC = 5          # 늦게 커밋된 행을 놓치지 않도록 watermark 를 조금 겹쳐서 조회
+DELTA_LIMIT = 500        # 한 번에 이보다 많이 바뀌었으면 전체 다시 읽기
+
+# 컬럼/함수가 없을 때 PostgREST/Postgres 오류 코드
+MISSING_COLUMN_CODES = ("42703", "PGRST204")
+RPC_MISSING_CODES = ("PGRST202", "42883")
+
+# 집계 박스 기준 기간(일) - 0 이면 전체 작업 지시
+KPI_DAYS = int(os.environ.get("BT_MONITOR_KPI_DAYS", "0"))
+
+# work_orders.bucket 컬럼(sql/monitor_views.sql)이 없어서 화면 서버에서 걸러야 할 때 더 받아오는 배수
+FALLBACK_FETCH_FACTOR = 5
+
+
+BUCKET_NAMES = {"ready": "작업대기", "full": "풀커팅", "half": "하프커팅", "elec": "전극공정",
+                "lam_wait": "접합대기", "lam_ing": "접합중", "done": "생산완료"}
+
+
+# ==========================================
+# 🔎 화면별 보기 조건
+#   /Monitor?view=lam                               → secrets.toml [monitor_views.lam] 에 정한 보기
+#   /Monitor?bucket=lam_wait,lam_ing&customer=A건설&days=3&rows=10
+#   * bucket   : 집계 분류 (ready/full/half/elec/lam_wait/lam_ing/done), 쉼표로 여러 개
+#   * customer / product : 정확히 같은 값만
+#   * days     : 최근 N일 안에 생성된 작업만 (집계 박스도 같은 기간)
+#   * rows     : 한 페이지 최대 행 수 (화면 크기에 맞춤, 조회 조건에는 안 들어감)
+# ==========================================
+class MonitorView:
+    def __init__(self, name="", bucket=(), customer="", product="", days=0, rows=0):
+        if isinstance(bucket, str):
+            bucket = bucket.split(",")
+        self.name = str(name or "")
+        self.buckets = tuple(sorted({b.strip() for b in bucket if b.strip() in KPI_BUCKETS}))
+        self.customer = str(customer or "").strip()
+        self.product = str(product or "").strip()
+        self.days = max(0, int(days or 0))
+        self.rows = max(0, int(rows or 0))
+
+    @classmethod
+    def from_params(cls, params, presets=None):
+        # params: st.query_params (값은 문자열) / presets: {보기 이름: {bucket: [...], customer: ...}}
+        presets = presets or {}
+        name = params.get("view", "")
+        conf = dict(presets.get(name, {})) if name else {}
+        for k in ("bucket", "customer", "product", "days", "rows"):
+            if params.get(k):
+                conf[k] = params.get(k)
+        try:
+            return cls(name=name, **conf)
+        except (TypeError, ValueError):
+            return cls(name=name)
+
+    def key(self):
+        # 조회기(MonitorFeed) 구분용 - 같은 조건이면 화면이 몇 대든 조회기 1개
+        return (("bucket", self.buckets), ("customer", self.customer), ("product", self.product), ("days", self.days))
+
+    def is_filtered(self):
+        return bool(self.buckets or self.customer or self.product or self.days)
+
+    def label(self):
+        if self.name:
+            return self.name
+        parts = [BUCKET_NAMES[b] for b in self.buckets] + [p for p in (self.customer, self.product) if p]
+        if self.days:
+            parts.append(f"{self.days}일")
+        return " · ".join(parts)
+
+    def since(self):
+        if not self.days:
+            return None
+        return (datetime.now(timezone.utc) - timedelta(days=self.days)).isoformat()
+
+    def apply(self, query, bucket=True):
+        # 조건을 Supabase 쿼리에 추가
+        #   bucket=False : 증분 조회 / bucket 컬럼 없음 → 분류는 keep() 으로 화면 서버에서 거름
+        #   (증분 조회에 bucket 조건을 넣으면 분류가 바뀌어 보기에서 빠지는 행을 못 받음)
+        if self.customer:
+            query = query.eq("customer", self.customer)
+        if self.product:
+            query = query.eq("product", self.product)
+        if self.days:
+            query = query.gte("created_at", self.since())
+        if bucket and self.buckets:
+            query = query.in_("bucket", list(self.buckets))
+        return query
+
+    def keep(self, row):
+        if self.buckets and status_bucket(str(row.get('status'))) not in self.buckets:
+            return False
+        if self.customer and row.get('customer') != self.customer:
+            return False
+        if self.product and row.get('product') != self.product:
+            return False
+        if self.days and str(row.get('created_at') or "") < self.since():
+            return False
+        return True
+
+
+class DeltaSync:
+    def __init__(self, supabase, table, limit, watermark="updated_at", key="lot_no", order="created_at", view=None):
+        self.supabase = supabase
+        self.table = table
+        self.limit = limit
+        self.watermark_col = watermark
+        self.key = key
+        self.order_col = order
+        self.view = view if view is not None and view.is_filtered() else None
+        self.bucket_ok = True    # work_orders.bucket 컬럼으로 DB 에서 거를 수 있는지 (첫 조회 때 판단)
+        self.truncated = False   # 조건에 맞는 행이 limit 보다 많은지 (빠진 행 자리를 채워야 하는지)
+
+        self.rows = {}           # key -> 행(dict) / key 는 컬럼 이름 또는 컬럼 이름 튜플
+        self.watermark = None    # 지금까지 본 가장 늦은 변경 시각 (ISO 문자열)
+        self.delta_ok = True
+        self.interval = BASE_INTERVAL
+        self.next_poll = 0.0
+        self.last_full = 0.0
+        self.seen_version = table_version(table)
+        self.seen_delete_version = table_delete_version(table)
+        self._df = pd.DataFrame()
+        self._lock = threading.Lock()
+
+        # 진단용
+        self.polls = 0
+        self.full_loads = 0
+        self.rows_fetched = 0
+
+    # ------------------------------------------
+    def poll(self, force=False):
+        # 제한 시간을 넘겨 버려진 이전 조회가 아직 돌고 있으면 끝날 때까지 기다림 (상태 동시 수정 방지)
+        with self._lock:
+            return self._poll(force)
+
+    def _poll(self, force):
+        now = time.monotonic()
+        version = table_version(self.table)
+        if not force and now < self.next_poll and version == self.seen_version:
+            return self._df, False
+        self.seen_version = version
+        self.polls += 1
+        deleted = table_delete_version(self.table)
+        full = deleted != self.seen_delete_version
+        self.seen_delete_version = deleted
+
+        if full or self.watermark is None or not self.delta_ok or now - self.last_full >= FULL_RESYNC_SEC:
+            changed = self._full_load(now)
+        else:
+            changed = self._delta_load(now)
+
+        # 한산하면 간격을 두 배씩 늘리고, 변화가 있으면 기본 간격으로 복귀
+        self.interval = BASE_INTERVAL if changed else min(self.interval * 2, MAX_INTERVAL)
+        self.next_poll = now + self.interval
+        return self._df, changed
+
+    def frame(self):
+        return self._df
+
+    # ------------------------------------------
+    def _full_load(self, now):
+        data = self._select_latest()
+        self.full_loads += 1
+        self.truncated = len(data) >= self.limit
+        self.last_full = now
+
+        new_rows = {self._key(r): r for r in data}
+        changed = new_rows != self.rows
+        self.rows = new_rows
+        self.watermark = self._max_watermark(data + self._view_watermark(), None)
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _delta_load(self, now):
+        since = (pd.Timestamp(self.watermark) - pd.Timedelta(seconds=OVERLAP_SEC)).isoformat()
+        try:
+            query = self.supabase.table(self.table).select("*").gte(self.watermark_col, since)
+            if self.view:
+                query = self.view.apply(query, bucket=False)
+            data = (query.order(self.watermark_col).limit(DELTA_LIMIT).execute().data) or []
+        except Exception as e:
+            if str(getattr(e, "code", "")) in MISSING_COLUMN_CODES:
+                self.delta_ok = False
+                return self._full_load(now)
+            raise
+        self.rows_fetched += len(data)
+        if len(data) >= DELTA_LIMIT:
+            return self._full_load(now)
+
+        changed = removed = False
+        for r in data:
+            k = self._key(r)
+            if self.view and not self.view.keep(r):
+                # 상태가 바뀌어 보기 조건에서 빠진 행
+                if self.rows.pop(k, None) is not None:
+                    changed = removed = True
+            elif self.rows.get(k) != r:
+                self.rows[k] = r
+                changed = True
+        if self.view and self.view.days:
+            # 기간이 지난 행 정리
+            stale = [k for k, r in self.rows.items() if not self.view.keep(r)]
+            for k in stale:
+                del self.rows[k]
+            removed = removed or bool(stale)
+            changed = changed or bool(stale)
+        if removed and self.truncated:
+            # limit 밖에 조건에 맞는 행이 더 있으면 빠진 자리를 채울 행은 증분으로 알 수 없음 → 전체 다시 읽기
+            return self._full_load(now)
+        self.watermark = self._max_watermark(data, self.watermark)
+
+        if changed:
+            # 최신 limit 개만 유지 (오래된 행이 수정돼서 들어온 경우 여기서 빠짐)
+            keep = sorted(self.rows.values(), key=lambda r: str(r.get(self.order_col) or ""), reverse=True)
+            self.truncated = self.truncated or len(keep) > self.limit
+            keep = keep[:self.limit]
+            self.rows = {self._key(r): r for r in keep}
+            self._rebuild()
+        return changed
+
+    def _select_latest(self):
+        # 최신순 limit 개 (보기 조건은 DB 에서 거름)
+        query = self.supabase.table(self.table).select("*")
+        if not self.view:
+            data = (query.order(self.order_col, desc=True).limit(self.limit).execute().data) or []
+            self.rows_fetched += len(data)
+            return data
+        if self.bucket_ok:
+            try:
+                data = (self.view.apply(query, bucket=True)
+                        .order(self.order_col, desc=True).limit(self.limit).execute().data) or []
+                self.rows_fetched += len(data)
+                return data
+            except Exception as e:
+                if str(getattr(e, "code", "")) not in MISSING_COLUMN_CODES or not self.view.buckets:
+                    raise
+                self.bucket_ok = False
+                query = self.supabase.table(self.table).select("*")
+        # bucket 컬럼이 없으면 나머지 조건만 DB 에서 거르고 분류는 여기서 거름
+        data = (self.view.apply(query, bucket=False)
+                .order(self.order_col, desc=True).limit(self.limit * FALLBACK_FETCH_FACTOR).execute().data) or []
+        self.rows_fetched += len(data)
+        return [r for r in data if self.view.keep(r)][:self.limit]
+
+    def _view_watermark(self):
+        # 보기 안의 행만으로 watermark 를 잡으면, 보기 밖에서 그 뒤에 바뀐 행이 매 증분 조회마다 다시 넘어옴
+        # → 증분 조회와 같은 조건(분류 제외)에서 가장 늦은 변경 시각 1건
+        if not self.view or not self.delta_ok:
+            return []
+        try:
+            return (self.view.apply(self.supabase.table(self.table).select(self.watermark_col), bucket=False)
+                    .order(self.watermark_col, desc=True).limit(1).execute().data) or []
+        except Exception as e:
+            if str(getattr(e, "code", "")) in MISSING_COLUMN_CODES:
+                self.delta_ok = False
+                return []
+            raise
+
+    def _key(self, r):
+        if isinstance(self.key, tuple):
+            return tuple(r.get(c) for c in self.key)
+        return r.get(self.key)
+
+    def _max_watermark(self, data, current):
+        stamps = [pd.Timestamp(r[self.watermark_col]) for r in data if r.get(self.watermark_col)]
+        if current is not None:
+            stamps.append(pd.Timestamp(current))
+        return max(stamps).isoformat() if stamps else current
+
+    def _rebuild(self):
+        rows = sorted(self.rows.values(), key=lambda r: str(r.get(self.order_col) or ""), reverse=True)
+        self._df = pd.DataFrame(rows)
+
+    def stats(self):
+        return {"table": self.table, "polls": self.polls, "full_loads": self.full_loads,
+                "rows_fetched": self.rows_fetched, "interval": self.interval, "delta": self.delta_ok,
+                "view": self.view.key() if self.view else None, "bucket_filter": self.bucket_ok}
+
+
+# ==========================================
+# 🛰️ 공용 스냅샷 조회기
+# ==========================================
+IDLE_STOP_SEC = 120
+TICK_SEC = min(1.0, BASE_INTERVAL)   # 스레드가 깨어나는 주기 (실제 조회는 DeltaSync 간격/쓰기 신호에 따름)
+
+
+class MonitorSnapshot:
+    # 여러 세션이 같이 보는 읽기 전용 데이터 - 직접 수정하지 말 것
+    def __init__(self, version, orders, logs, fetched_at, error=None, board=None, kpis=None):
+        self.version = version
+        self.orders = orders
+        self.logs = logs
+        # monitor_engine 계산 결과 (버전이 바뀔 때 1번만 계산해서 모든 화면이 같이 씀)
+        self.board = board if board is not None else pd.DataFrame()
+        self.kpis = kpis if kpis is not None else kpi_counts(None)
+        self.fetched_at = fetched_at   # time.time()
+        self.error = error
+
+
+class MonitorFeed:
+    def __init__(self, supabase, view=None, order_limit=100, log_limit=200):
+        self.view = view if view is not None else MonitorView()
+        self.order_sync = DeltaSync(supabase, "work_orders", limit=order_limit, watermark="updated_at", view=self.view)
+        # 로그는 추가만 하므로 (LOT, 공정, 시각) 으로 구분
+        self.log_sync = DeltaSync(supabase, "production_logs", limit=log_limit, watermark="created_at",
+                                  key=("lot_no", "step", "created_at"))
+        self.supabase = supabase
+        self.kpi_rpc_ok = True
+        self.use_projection = False   # work_orders.last_step 사용 여부 (첫 조회 때 판단)
+        self._kpi_mark = None   # 마지막 집계 조회 때의 (전체 다시 읽기 횟수)
+        self._snapshot = MonitorSnapshot(0, pd.DataFrame(), pd.DataFrame(), 0.0)
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        # 수동 새로고침 요청 번호 / 처리한 번호 - 요청 뒤에 시작한 조회가 끝나야 refresh() 가 돌아감
+        self._refresh_cond = threading.Condition()
+        self._refresh_req = 0
+        self._refresh_done = 0
+        self._idle_resume = False
+        self._last_read = time.monotonic()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"monitor-feed {self.view.label()}".strip(), daemon=True)
+                self._thread.start()
+        return self
+
+    def snapshot(self, wait=10):
+        # 첫 조회가 끝나기 전이면 잠깐 기다림 (서버 시작 직후 첫 화면)
+        self._last_read = time.monotonic()
+        self._wake.set()
+        if not self._ready.is_set():
+            self._ready.wait(wait)
+        return self._snapshot
+
+    def refresh(self, wait=10):
+        # 간격과 상관없이 바로 조회하고, 끝날 때까지 기다림 (수동 새로고침)
+        with self._refresh_cond:
+            self._refresh_req += 1
+            want = self._refresh_req
+        self._wake.set()
+        with self._refresh_cond:
+            self._refresh_cond.wait_for(lambda: self._refresh_done >= want, wait)
+
+    def _run(self):
+        while True:
+            if time.monotonic() - self._last_read > IDLE_STOP_SEC:
+                # 보는 화면이 없으면 조회 중단 → snapshot() 호출 시 재개
+                self._wake.wait()
+                self._idle_resume = True
+            self._wake.clear()
+            self._fetch()
+            self._wake.wait(TICK_SEC)
+
+    def _fetch(self):
+        with self._refresh_cond:
+            req = self._refresh_req
+        force = req > self._refresh_done or self._idle_resume
+        self._idle_resume = False
+        try:
+            self._fetch_once(force)
+        finally:
+            with self._refresh_cond:
+                self._refresh_done = max(self._refresh_done, req)
+                self._refresh_cond.notify_all()
+
+    def _fetch_once(self, force):
+        snap = self._snapshot
+        first = snap.version == 0
+        # 작업 지시 / 로그 / 집계는 서로 독립 → 동시에 조회 (왕복 시간의 합 대신 가장 느린 1개)
+        jobs = {"orders": lambda: self.order_sync.poll(force)}
+        if not self.use_projection:
+            # 첫 조회 전에는 last_step 컬럼이 있는지 모르므로 로그도 같이 받음
+            jobs["logs"] = lambda: self.log_sync.poll(force)
+        if (force or first) and self.kpi_rpc_ok:
+            # 수동 새로고침/첫 화면은 기다리는 화면이 있으므로 집계도 미리 같이 받음
+            jobs["kpis"] = lambda: self._fetch_kpis(True)
+        results, errors = fetch_all(jobs)
+        failed = [errors[k] for k in ("orders", "logs") if k in errors]
+        if failed:
+            # 조회 실패 시 직전 데이터를 그대로 보여주고 다음 주기에 재시도
+            self._snapshot = MonitorSnapshot(snap.version, snap.orders, snap.logs, snap.fetched_at, str(failed[0]), snap.board, snap.kpis)
+            self._ready.set()
+            return
+        orders, c1 = results["orders"]
+        if 'last_step' in orders.columns:
+            self.use_projection = True
+        if self.use_projection:
+            logs, c2 = pd.DataFrame(), False
+        else:
+            logs, c2 = results["logs"]
+        kpis = results.get("kpis")
+
+        if c1 or c2 or first:
+            if not orders.empty:
+                orders = orders.copy()
+                orders['short_time'] = pd.to_datetime(orders['created_at']).dt.strftime('%m-%d %H:%M')
+            board = build_board(orders, logs)
+            kpis = kpis or self._fetch_kpis(c1 or first) or kpi_counts(board)
+            self._snapshot = MonitorSnapshot(snap.version + 1, orders, logs, time.time(), None, board, kpis)
+            self._ready.set()
+            return
+        if kpis is None and self._kpi_mark != self.order_sync.full_loads and self.kpi_rpc_ok:
+            # 전체 다시 읽기 주기마다 집계도 다시 (범위 밖 작업 삭제 등 반영)
+            kpis = self._fetch_kpis(True)
+        if kpis and kpis != snap.kpis:
+            self._snapshot = MonitorSnapshot(snap.version + 1, snap.orders, snap.logs, time.time(), None, snap.board, kpis)
+        elif snap.error:
+            self._snapshot = MonitorSnapshot(snap.version, snap.orders, snap.logs, snap.fetched_at, None, snap.board, snap.kpis)
+        self._ready.set()
+
+    def _fetch_kpis(self, orders_changed):
+        # DB 집계 결과 {분류: 개수} / 함수가 없거나 실패하면 None (→ 화면 데이터로 계산)
+        if not self.kpi_rpc_ok:
+            return None
+        if not orders_changed and self._kpi_mark == self.order_sync.full_loads:
+            return self._snapshot.kpis
+        # 보기에 기간(days)이 있으면 집계도 같은 기간 (공정/고객사 조건과 상관없이 전체 현황)
+        since = self.view.since()
+        if since is None and KPI_DAYS > 0:
+            since = (datetime.now(timezone.utc) - timedelta(days=KPI_DAYS)).isoformat()
+        try:
+            rows = self.supabase.rpc("monitor_kpis", {"since": since}).execute().data or []
+        except Exception as e:
+            if str(getattr(e, "code", "")) in RPC_MISSING_CODES:
+                self.kpi_rpc_ok = False
+            return None
+        self._kpi_mark = self.order_sync.full_loads
+        kpis = kpi_counts(None)
+        for r in rows:
+            if r.get('bucket') in kpis:
+                kpis[r['bucket']] = int(r.get('cnt') or 0)
+        return kpis
+
+    def stats(self):
+        return {"version": self._snapshot.version, "view": self.view.label(), "projection": self.use_projection, "orders": self.order_sync.stats(), "logs": self.log_sync.stats()}
@@ -1,16 +1,22 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-import qrcode
 import io
 import base64
 import math
 import time
 import re
 import os
-import requests 
 from datetime import datetime, timedelta
-from PIL import Image, ImageDraw, ImageFont
+from db_cache import cached_select, invalidate, cache_stats
+from db_fetch import fetch_all
+from db_metrics import MeteredClient
+import fonts
+from label_render import create_label_strip_image
+from print_docs import generate_print_html, get_label_content_html, get_work_order_html, get_access_qr_content_html, QR_MODES
+from label_export import export_labels_pdf, export_labels_zip
+from printer_cmds import build_zpl, build_escpos, send_raw, RAW_PORT, ZPL_KOREAN_FONT
+from publish import build_work_order_rows, group_fabric_deductions, apply_fabric_deductions, insert_work_orders
 
 # ==========================================
 # ⚙️ 페이지 설정 (반드시 맨 위)
@@ -31,11 +37,13 @@ if 'logged_in' not in st.session_state or not st.session_state.logged_in:
 # ------------------------------------------
 try:
     from connection import get_supabase_client
-    supabase = get_supabase_client()
+    supabase = MeteredClient(get_supabase_client())  # 이번 실행의 DB 호출 수/시간 계측
 except Exception as e:
     st.error(f"🚨 서버 연결 실패: {e}")
     st.stop()
 
+RERUN_T0 = time.perf_counter()
+
 # ==============================================================================
 # 🛠️ [기능 정의 구역] 
 # ==============================================================================
@@ -53,197 +61,13 @@ def check_process_sequence(lot_no, current_step):
         return False, "오류 발생"
     return True, "OK"
 
-def image_to_base64(img):
-    buffered = io.BytesIO()
-    img.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode()
-
 def fetch_fabric_stock():
     try:
-        response = supabase.table("fabric_stock").select("*").execute()
-        return {row['lot_no']: row for row in response.data}
+        rows = cached_select("fabric_stock", "all", lambda: supabase.table("fabric_stock").select("*").execute().data)
+        return {row['lot_no']: row for row in rows}
     except Exception: 
         return {}
 
-@st.cache_resource
-def load_korean_font(size):
-    font_filename = "NanumGothic-Bold.ttf"
-    if not os.path.exists(font_filename):
-        try:
-            r = requests.get("https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Bold.ttf")
-            with open(font_filename, 'wb') as f: 
-                f.write(r.content)
-        except Exception: 
-            return ImageFont.load_default()
-    return ImageFont.truetype(font_filename, size)
-
-def create_label_strip_image(items, rotate=False):
-    LABEL_W = 472; LABEL_H = 236
-    if not items: 
-        return None
-    strip_w = LABEL_W * len(items)
-    strip_h = LABEL_H
-    full_img = Image.new('RGB', (strip_w, strip_h), 'white')
-    draw = ImageDraw.Draw(full_img)
-    font_lg = load_korean_font(28)
-    font_md = load_korean_font(24)
-
-    for i, it in enumerate(items):
-        x = i * LABEL_W
-        draw.rectangle([x, 0, x + LABEL_W-1, LABEL_H-1], outline="#cccccc", width=2)
-        
-        lot = it.get('lot', '')
-        cust = str(it.get('cust', ''))
-        w = str(it.get('w', '0'))
-        h = str(it.get('h', '0'))
-        e = str(it.get('elec', ''))
-        
-        qr = qrcode.QRCode(box_size=5, border=0)
-        qr.add_data(lot.replace("-", ""))
-        qr.make(fit=True)
-        qr_img = qr.make_image(fill_color="black", back_color="white").resize((190, 190))
-        full_img.paste(qr_img, (x + 10, (LABEL_H - 190) // 2))
-        
-        tx = x + 210
-        draw.text((tx, 25), lot, font=font_lg, fill="black")
-        draw.text((tx, 75), cust, font=font_lg if len(cust)<5 else font_md, fill="black")
-        draw.text((tx, 125), f"{w} x {h}", font=font_lg, fill="black")
-        draw.text((tx, 170), f"[{e}]", font=font_lg, fill="black")
-        
-        if i < len(items) - 1: 
-            draw.line([(x + LABEL_W - 1, 0), (x + LABEL_W - 1, LABEL_H)], fill="#999", width=1)
-
-    if rotate: 
-        full_img = full_img.rotate(90, expand=True)
-    buf = io.BytesIO()
-    full_img.save(buf, format="PNG")
-    return buf.getvalue()
-
-def generate_print_html(content_html):
-    return f"""<!DOCTYPE html><html><head><meta charset="UTF-8"><title>Print</title>
-    <script>setTimeout(function() {{ window.print(); }}, 500);</script></head>
-    <body style="margin:0; padding:0;">{content_html}</body></html>"""
-
-def get_label_content_html(items, mode="roll", rotate=False, margin_top=0):
-    tr_css = "transform: rotate(90deg);" if rotate else ""
-    wrap_css = f"width: 38mm; height: 19mm; page-break-after: always; display: flex; align-items: center; justify-content: center; overflow: hidden; border: 1px solid #ddd; margin-top: {margin_top}mm;" if mode == "roll" else "width: 42mm; height: 22mm; display: inline-flex; align-items: center; justify-content: center; margin: 2px; border: 1px dashed #ccc; float: left;"
-    
-    html = f"""<!DOCTYPE html><html><head><style>
-    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;900&display=swap');
-    @media print {{ @page {{ size: 40mm 20mm; margin: 0; }} body {{ margin: 0; }} }}
-    .lb {{ {wrap_css} font-family: 'Roboto', sans-serif; background: white; box-sizing: border-box; }}
-    .tb {{ font-weight: 900; font-size: 11pt; color: black; line-height: 1.2; }}
-    </style></head><body><div style="display:flex; flex-wrap:wrap;">"""
-    
-    for it in items:
-        lot = it.get('lot', '')
-        qr = qrcode.QRCode(box_size=5, border=0)
-        qr.add_data(lot.replace("-", ""))
-        qr.make(fit=True)
-        img = image_to_base64(qr.make_image(fill_color="black", back_color="white"))
-        
-        html += f"""
-        <div class="lb">
-            <div style="width:38mm; height:19mm; display:flex; align-items:center; {tr_css}">
-                <div style="width:38%; text-align:center;"><img src="data:image/png;base64,{img}" style="width:95%;"></div>
-                <div style="width:62%; padding-left:1.5mm;">
-                    <div class="tb">{lot}</div>
-                    <div class="tb">{it.get('cust', '')}</div>
-                    <div class="tb">{it.get('w', '0')} x {it.get('h', '0')}</div>
-                    <div class="tb">[{it.get('elec', '')}]</div>
-                </div>
-            </div>
-        </div>
-        """
-    html += "</div></body></html>"
-    return html
-
-def get_work_order_html(items):
-    html = """<html><head><style>
-    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700;900&display=swap');
-    @media print { @page { size: A4; margin: 5mm; } body { margin: 0; } .pb { page-break-after: always; } }
-    body { font-family: 'Noto Sans KR', sans-serif; color: #000; }
-    .card { width: 49%; height: 62.5mm; border: 2px solid #000; box-sizing: border-box; margin-bottom: 1mm; display: flex; flex-direction: column; overflow: hidden; }
-    .chead { background-color: #e0e0e0; padding: 2px 8px; border-bottom: 1px solid #000; display: flex; justify-content: space-between; align-items: center; height: 24px; }
-    .dim { height: 40px; border-top: 2px solid #000; display: flex; align-items: center; justify-content: center; background-color: #fff; }
-    .stbl { width: 100%; border-collapse: collapse; } .stbl td { padding: 1px 0; font-size: 11px; vertical-align: middle; }
-    .lbl { font-weight: 900; width: 45px; color: #333; } .val { font-weight: 700; color: #000; }
-    </style></head><body><div style="display:flex; flex-wrap:wrap; justify-content:space-between;">"""
-    
-    chunk = 8
-    print_date = datetime.now().strftime('%Y-%m-%d %H:%M')
-    
-    for i in range(0, len(items), chunk):
-        sub = items[i:i + chunk]
-        
-        html += f"""
-        <div style="width:100%; position:relative; margin-bottom:3mm; text-align:center;">
-            <span style="font-size:20pt; font-weight:900; text-decoration:underline;">작업 지시서 (Work Order)</span>
-            <span style="position:absolute; right:5px; bottom:0; font-size:10pt; color:#555; font-weight:bold;">발행일시: {print_date}</span>
-        </div>
-        """
-        html += '<div style="display:flex; flex-wrap:wrap; justify-content:space-between; width:100%;">'
-        
-        for it in sub:
-            lot = it.get('lot', '')
-            qr = qrcode.QRCode(box_size=5, border=0)
-            qr.add_data(lot.replace("-", ""))
-            qr.make(fit=True)
-            img = image_to_base64(qr.make_image(fill_color="black", back_color="white"))
-            
-            lam_txt = f"<span style='color:#000;'>{it.get('spec_lam','-')}</span>"
-            if "생략" in str(it.get('spec_lam','')): 
-                lam_txt = "<span style='text-decoration:line-through; color:red; font-weight:bold;'>접합생략</span> <span style='color:#000; font-weight:bold;'>(필름마감)</span>"
-            
-            w = str(it.get('w', '0'))
-            h = str(it.get('h', '0'))
-            e = str(it.get('elec', ''))
-            wc = "font-weight:900; text-decoration:underline;" if "가로" in e or "W" in e.upper() else "font-weight:500; color:#555;"
-            hc = "font-weight:900; text-decoration:underline;" if "세로" in e or "H" in e.upper() else "font-weight:500; color:#555;"
-            
-            html += f"""
-            <div class="card">
-                <div class="chead">
-                    <div><span style="font-size:13px; font-weight:900;">{lot}</span> <span style="font-size:12px; font-weight:900; color:#333;">[{it.get('prod', '')}]</span></div>
-                    <div style="font-size:10px; font-weight:700;">{it.get('cust', '')} | {datetime.now().strftime('%m-%d')}</div>
-                </div>
-                <div style="display:flex; flex:1; overflow:hidden;">
-                    <div style="width:80px; display:flex; align-items:center; justify-content:center; border-right:1px solid #000;"><img src="data:image/png;base64,{img}" style="width:100%;"></div>
-                    <div style="flex:1; padding:2px 6px;">
-                        <table class="stbl">
-                            <tr><td class="lbl">🧵 원단</td><td class="val">{it.get('fabric','-')}</td></tr>
-                            <tr><td colspan="2"><hr style="margin:2px 0; border-top:1px dashed #ccc;"></td></tr>
-                            <tr><td class="lbl">✂️ 커팅</td><td class="val">{it.get('spec_cut','-')}</td></tr>
-                            <tr><td class="lbl">🔥 접합</td><td class="val">{lam_txt}</td></tr>
-                            <tr><td class="lbl" style="color:red;">⚠️ 특이</td><td class="val" style="color:red;">{it.get('note','-')}</td></tr>
-                        </table>
-                    </div>
-                </div>
-                <div class="dim">
-                    <span style="font-size:28px; {wc}">{w}</span><span style="font-size:20px; font-weight:bold; margin:0 5px;">X</span><span style="font-size:28px; {hc}">{h}</span><span style="font-size:18px; font-weight:900; margin-left:15px;">[{e}]</span>
-                </div>
-            </div>
-            """
-        html += '</div>'
-        html += '<div style="width:100%; text-align:center; font-size:11px; color:#444; margin-top:3mm; font-weight:bold; letter-spacing:1px;">※ 본 문서는 (주)베스트룸의 소중한 자산이므로 무단 복제 및 외부 유출을 엄격히 금합니다.</div>'
-        html += '<div class="pb"></div>'
-    return html + "</body></html>"
-
-def get_access_qr_content_html(url):
-    qr = qrcode.QRCode(box_size=10, border=1)
-    qr.add_data(url)
-    qr.make(fit=True)
-    img = image_to_base64(qr.make_image(fill_color="black", back_color="white"))
-    html = f"""
-    <div style="text-align:center; padding-top:50mm;">
-        <div style="border:5px solid black; padding:30px; display:inline-block; border-radius:20px;">
-            <div style="font-size:30pt; font-weight:900;">🏭 시스템 접속 QR</div><br>
-            <img src="data:image/png;base64,{img}" style="width:350px;">
-        </div>
-    </div>
-    """
-    return html
-
 # 10. 견적서 HTML
 def get_quotation_html(cust_data, items_df, totals):
     logo = ""
@@ -379,7 +203,6 @@ def get_quotation_html(cust_data, items_df, totals):
 APP_URL = "https://bt-app-pwgumeleefkwpf3xsu5bob.streamlit.app/"
 if 'order_list' not in st.session_state: st.session_state.order_list = []
 if 'generated_qrs' not in st.session_state: st.session_state.generated_qrs = []
-if 'fabric_db' not in st.session_state: st.session_state.fabric_db = {}
 
 # [견적서 초기 데이터]
 if 'quote_items' not in st.session_state: 
@@ -391,17 +214,13 @@ if 'quote_items' not in st.session_state:
 
 st.sidebar.title("👨‍💼 지시서 설정")
 if st.sidebar.button("🔄 재고 정보 새로고침", use_container_width=True): 
-    st.session_state.fabric_db = fetch_fabric_stock()
+    invalidate("fabric_stock")
     st.toast("✅ 재고 최신화 완료!")
-
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
-    "📝 작업 입력", "📄 지시서 인쇄", "🏷️ 라벨 인쇄", "🔄 QR 재발행", 
-    "🧵 원단 재고", "📊 발행 이력", "🔍 제품 추적", "🚨 불량 현황", 
-    "📱 접속 QR", "📑 견적서 작성"
-])
+st.sidebar.selectbox("🔳 인쇄 문서 QR 방식", QR_MODES, key="qr_mode",
+                     format_func=lambda m: {"png": "PNG 이미지 (기본)", "svg": "SVG 벡터 (인쇄 선명, 문서 크기 큼)"}[m])
 
 # Tab 1: 작업 입력
-with tab1:
+def panel_order_input():
     st.markdown("### 📝 신규 작업 지시 등록")
     
     with st.expander("📖 관리자/작업자 시스템 사용 설명서 (클릭해서 열기)"):
@@ -420,8 +239,7 @@ with tab1:
         *(※ 불량이 났을 때는 상단 `🚨 불량 발생 신고` 스위치를 켜고 저장하세요!)*
         """)
 
-    if not st.session_state.fabric_db: 
-        st.session_state.fabric_db = fetch_fabric_stock()
+    fabric_db = fetch_fabric_stock()
     
     with st.form("order_form"):
         c1, c2 = st.columns([1, 1])
@@ -433,8 +251,8 @@ with tab1:
         # [원단 선택 및 잔량 표시 로직 보강]
         c_mat1, c_mat2 = st.columns(2)
         stock_options = ["➕ 직접 입력"] 
-        if st.session_state.fabric_db:
-            for lot, info in st.session_state.fabric_db.items(): 
+        if fabric_db:
+            for lot, info in fabric_db.items(): 
                 try:
                     tot = float(info.get('total_len', 0) or 0)
                     usd = float(info.get('used_len', 0) or 0)
@@ -452,7 +270,7 @@ with tab1:
             fabric_lot = c_mat1.text_input("원단 LOT 번호 입력", placeholder="Roll-2312a-KR")
         else:
             fabric_lot = selected_stock.split(" | ")[0]
-            sel_info = st.session_state.fabric_db.get(fabric_lot, {})
+            sel_info = fabric_db.get(fabric_lot, {})
             
             # [재고 부족 경고창 띄우기]
             try:
@@ -503,76 +321,44 @@ with tab1:
         
         if st.button("🚀 최종 발행 및 저장"):
             date_str = datetime.now().strftime("%y%m%d")
-            prod_map = {"스마트글라스": "G", "접합필름": "F", "PDLC원단": "P", "일반유리": "N"}
-            new_qrs = []
-            cnt = 0
-            
-            for item in st.session_state.order_list:
-                lot = item.get('lot_no', '')
-                if lot and "직접 입력" not in lot and lot != "미등록 원단":
-                    try:
-                        h_m = float(item.get('h', 0)) / 1000.0 
-                        qty = float(item.get('수량', 1))
-                        consumed = h_m * qty 
-
-                        res = supabase.table("fabric_stock").select("used_len, total_len").eq("lot_no", lot).execute()
-                        if res.data:
-                            raw_used = res.data[0].get('used_len')
-                            raw_tot = res.data[0].get('total_len')
-                            
-                            try:
-                                curr_used = float(raw_used) if raw_used is not None else 0.0
-                                tot_len = float(raw_tot) if raw_tot is not None else 0.0
-                            except (TypeError, ValueError):
-                                curr_used = 0.0
-                                tot_len = 0.0
-                                
-                            new_used = curr_used + consumed
-                            rem_stock = tot_len - new_used # 방어막 계산
-
-                            up_res = supabase.table("fabric_stock").update({"used_len": new_used}).eq("lot_no", lot).execute()
-                            if up_res.data:
-                                # [사후 알림/경고창 띄우기]
-                                if rem_stock < 0:
-                                    st.error(f"🚨 [{lot}] 원단 재고 초과! (부족분: {abs(rem_stock):.2f}m)")
-                                elif rem_stock <= 10:
-                                    st.warning(f"⚠️ [{lot}] 원단 잔량 부족 주의 (남은 량: {rem_stock:.2f}m)")
-                                else:
-                                    st.toast(f"🧵 [{lot}] 원단 {consumed:.3f}m 차감 성공! (잔량: {rem_stock:.2f}m)")
-                    except Exception as e:
-                        st.error(f"🚨 {lot} 재고 차감 중 오류 발생: {e}")
 
-            for item in st.session_state.order_list:
-                prod_char = prod_map.get(item['제품'], "X")
-                for _ in range(item['수량']):
-                    final_lot_id = f"{item['lot_short']}{date_str}{prod_char}{cnt:02d}"
-                    cnt = (cnt + 1) % 100
-                    try:
-                        supabase.table("work_orders").insert({
-                            "lot_no": final_lot_id, "customer": item['고객사'], "product": item['제품'], 
-                            "dimension": f"{item['규격']} [{item['전극']}]", "spec": item['spec'], 
-                            "status": "작업대기" if item['is_lam'] else "작업대기(단품)", "note": item['비고'], "fabric_lot_no": item['lot_no']
-                        }).execute()
-                        
-                        new_qrs.append({
-                            "lot": final_lot_id, "w": item['w'], "h": item['h'], "elec": item['전극'], 
-                            "prod": item['제품'], "cust": item['고객사'], 
-                            "fabric": item['lot_no'], "spec_cut": item['spec_cut'], "spec_lam": item['spec_lam'], "note": item['비고']
-                        })
-                    except Exception as e:
-                        st.error(f"작업 지시서 생성 중 오류: {e}")
-                        
-            st.session_state.generated_qrs = new_qrs
+            # 1) 원단 차감 (원단별로 묶어서 처리)
+            usage = group_fabric_deductions(st.session_state.order_list)
+            for r in apply_fabric_deductions(supabase, usage):
+                lot = r['lot']
+                if r['error']:
+                    st.error(f"🚨 {lot} 재고 차감 중 오류 발생: {r['error']}")
+                elif r['remaining'] < 0:
+                    st.error(f"🚨 [{lot}] 원단 재고 초과! (부족분: {abs(r['remaining']):.2f}m)")
+                elif r['remaining'] <= 10:
+                    st.warning(f"⚠️ [{lot}] 원단 잔량 부족 주의 (남은 량: {r['remaining']:.2f}m)")
+                else:
+                    st.toast(f"🧵 [{lot}] 원단 {r['consumed']:.3f}m 차감 성공! (잔량: {r['remaining']:.2f}m)")
+
+            # 2) LOT 행 일괄 생성 후 bulk insert
+            rows, qrs = build_work_order_rows(st.session_state.order_list, date_str)
+            inserted, failures = insert_work_orders(supabase, rows)
+            ok_lots = set(inserted)
+            for lot, err in failures:
+                st.error(f"작업 지시서 생성 중 오류 ({lot}): {err}")
+
+            st.session_state.generated_qrs = [q for q in qrs if q['lot'] in ok_lots]
+            st.session_state.label_file = None
+            st.session_state.printer_file = None
             st.session_state.order_list = []
-            st.session_state.fabric_db = fetch_fabric_stock() 
-            st.success("✅ 발행 및 재고 자동 차감이 완료되었습니다!")
-            time.sleep(2)
-            st.rerun()
+            invalidate("fabric_stock", lots=list(usage))
+            invalidate("work_orders", lots=inserted)
+            if failures:
+                st.warning(f"⚠️ {len(inserted)}건 발행 / {len(failures)}건 실패 - 실패 항목을 확인해주세요.")
+            else:
+                st.success(f"✅ 발행({len(inserted)}건) 및 재고 자동 차감이 완료되었습니다!")
+                time.sleep(2)
+                st.rerun()
 
 # Tab 2: 지시서
-with tab2:
+def panel_work_order():
     if st.session_state.generated_qrs:
-        html = get_work_order_html(st.session_state.generated_qrs)
+        html = get_work_order_html(st.session_state.generated_qrs, qr_mode=st.session_state.qr_mode)
         st.components.v1.html(html, height=1000, scrolling=True)
         if st.button("🖨️ 인쇄하기"): 
             components.html(generate_print_html(html), height=0)
@@ -580,20 +366,78 @@ with tab2:
         st.info("발행된 작업이 없습니다.")
 
 # Tab 3: 라벨
-with tab3:
+def panel_label():
     if st.session_state.generated_qrs:
-        html = get_label_content_html(st.session_state.generated_qrs)
+        html = get_label_content_html(st.session_state.generated_qrs, qr_mode=st.session_state.qr_mode)
         st.components.v1.html(html, height=600, scrolling=True)
         if st.button("🖨️ 라벨 인쇄"): 
             components.html(generate_print_html(html), height=0)
-        img_data = create_label_strip_image(st.session_state.generated_qrs)
-        if img_data: 
-            st.download_button("💾 이미지 다운로드", img_data, file_name="labels.png")
+        if not fonts.has_korean_font():
+            st.warning("⚠️ 한글 폰트를 찾지 못했습니다. 이미지 라벨의 한글이 깨질 수 있습니다. (BT_FONT_PATH 설정 필요)")
+
+        # 라벨 파일은 버튼을 눌렀을 때만 생성 (PDF/ZIP 은 라벨 단위로 나눠 써서 메모리 일정)
+        c1, c2 = st.columns([2, 1])
+        fmt = c1.selectbox("💾 라벨 파일 형식", ["PDF (라벨 1장 = 1페이지)", "ZIP (라벨별 PNG)", "PNG (한 줄 이미지)"], key="label_fmt")
+        if c2.button("📦 라벨 파일 만들기", use_container_width=True):
+            items = st.session_state.generated_qrs
+            buf = io.BytesIO()
+            if fmt.startswith("PDF"):
+                export_labels_pdf(items, buf)
+                st.session_state.label_file = (buf.getvalue(), "labels.pdf", "application/pdf")
+            elif fmt.startswith("ZIP"):
+                export_labels_zip(items, buf)
+                st.session_state.label_file = (buf.getvalue(), "labels.zip", "application/zip")
+            else:
+                st.session_state.label_file = (create_label_strip_image(items), "labels.png", "image/png")
+        if st.session_state.get('label_file'):
+            data, name, mime = st.session_state.label_file
+            st.download_button(f"💾 {name} 다운로드 ({len(data) / 1024:,.0f}KB)", data, file_name=name, mime=mime)
+
+        # 감열 프린터 직접 출력 (프린터 내장 QR 명령 사용 - HTML/이미지 전송 없음)
+        with st.expander("🖨️ 라벨 프린터 직접 출력 (ZPL / ESC-POS)"):
+            p1, p2, p3 = st.columns(3)
+            lang = p1.selectbox("명령어 종류", ["ZPL (Zebra)", "ESC/POS"], key="printer_lang")
+            dpi = p2.selectbox("해상도(dpi)", [203, 300], key="printer_dpi")
+            zpl_font = p3.text_input("ZPL 한글 폰트", value=ZPL_KOREAN_FONT, key="printer_font", disabled=not lang.startswith("ZPL"))
+
+            # 명령어는 만들기/전송 버튼을 눌렀을 때만 생성 (펼쳐 둔 채 다른 입력을 바꿔도 다시 만들지 않음)
+            items = st.session_state.generated_qrs
+            spec = (tuple(it.get('lot') for it in items), lang, dpi, zpl_font)
+
+            def build_printer_file():
+                if lang.startswith("ZPL"):
+                    st.session_state.printer_file = (spec, build_zpl(items, dpi=dpi, korean_font=zpl_font or None), "labels.zpl")
+                else:
+                    st.session_state.printer_file = (spec, build_escpos(items, dpi=dpi), "labels.bin")
+                return st.session_state.printer_file
+
+            if st.button("📦 명령어 파일 만들기", use_container_width=True):
+                build_printer_file()
+            built = st.session_state.get('printer_file')
+            if built and built[0] == spec:
+                _, payload, fname = built
+                st.caption(f"라벨 {len(items)}장 → 명령어 {len(payload) / 1024:,.1f}KB")
+                st.download_button(f"💾 {fname} 다운로드", payload, file_name=fname, mime="application/octet-stream")
+
+            h1, h2, h3 = st.columns([2, 1, 1])
+            host = h1.text_input("프린터 IP", placeholder="예: 192.168.0.50", key="printer_host")
+            port = h2.number_input("포트", value=RAW_PORT, step=1, key="printer_port")
+            if h3.button("📡 프린터로 전송", use_container_width=True):
+                if not host:
+                    st.warning("프린터 IP를 입력해주세요.")
+                else:
+                    try:
+                        built = st.session_state.get('printer_file')
+                        _, payload, _ = built if built and built[0] == spec else build_printer_file()
+                        sent = send_raw(host, payload, port=port)
+                        st.success(f"✅ 전송 완료 ({sent:,} bytes)")
+                    except Exception as e:
+                        st.error(f"🚨 프린터 전송 실패: {e}")
     else: 
         st.info("발행된 작업이 없습니다.")
 
 # Tab 4: 재발행
-with tab4:
+def panel_reprint():
     with st.form("reprint"):
         s_d = st.date_input("날짜")
         if st.form_submit_button("조회"):
@@ -616,11 +460,11 @@ with tab4:
                         "w": w, "h": h, "elec": elec, "fabric": r.get('fabric_lot_no','-'), 
                         "spec_cut": r.get('spec',''), "spec_lam": r.get('spec',''), "note": r.get('note','')
                     })
-                html = get_work_order_html(rep_items)
+                html = get_work_order_html(rep_items, qr_mode=st.session_state.qr_mode)
                 components.html(generate_print_html(html), height=0)
 
 # Tab 5: 재고
-with tab5:
+def panel_fabric():
     with st.form("fabric_in"):
         st.markdown("##### 📥 원단 입고 등록")
         c1, c2, c3 = st.columns(3)
@@ -650,7 +494,7 @@ with tab5:
                         data["short_code"] = n_short
                         supabase.table("fabric_stock").insert(data).execute()
                         st.success(f"✅ {n_lot} 입고 완료!")
-                        st.session_state.fabric_db = fetch_fabric_stock()
+                        invalidate("fabric_stock", lots=[n_lot])
                         time.sleep(1)
                         st.rerun()
                     except Exception:
@@ -658,7 +502,7 @@ with tab5:
                         try:
                             supabase.table("fabric_stock").insert(data).execute()
                             st.success(f"✅ {n_lot} 입고 완료! (단축코드 제외)")
-                            st.session_state.fabric_db = fetch_fabric_stock()
+                            invalidate("fabric_stock", lots=[n_lot])
                             time.sleep(1)
                             st.rerun()
                         except Exception as e: 
@@ -667,68 +511,91 @@ with tab5:
                     try:
                         supabase.table("fabric_stock").insert(data).execute()
                         st.success(f"✅ {n_lot} 입고 완료!")
-                        st.session_state.fabric_db = fetch_fabric_stock()
+                        invalidate("fabric_stock", lots=[n_lot])
                         time.sleep(1)
                         st.rerun()
                     except Exception as e: 
                         st.error(f"🚨 저장 실패: {e}")
 
     try:
-        res = supabase.table("fabric_stock").select("*").execute()
-        if res.data: 
-            st.data_editor(pd.DataFrame(res.data), hide_index=True, use_container_width=True)
+        rows = list(fetch_fabric_stock().values())
+        if rows: 
+            st.data_editor(pd.DataFrame(rows), hide_index=True, use_container_width=True)
         else: 
             st.info("등록된 원단 재고가 없습니다.")
     except Exception: 
         pass
 
 # Tab 6: 이력
-with tab6:
-    res = supabase.table("work_orders").select("*").order("created_at", desc=True).limit(200).execute()
-    df = pd.DataFrame(res.data)
+PROGRESS_COLS = ['last_step', 'step_level', 'last_step_at', 'last_worker', 'has_defect']
+
+def panel_history():
+    rows = cached_select("work_orders", "recent200", lambda: supabase.table("work_orders").select("*").order("created_at", desc=True).limit(200).execute().data)
+    df = pd.DataFrame(rows)
     if not df.empty:
+        # 현재 공정 요약 컬럼(sql/work_order_progress.sql)이 있으면 앞쪽에 표시
+        front = [c for c in ['lot_no', 'status'] + PROGRESS_COLS if c in df.columns]
+        df = df[front + [c for c in df.columns if c not in front]]
         sel_rows = st.data_editor(df.assign(선택=False), column_config={"선택": st.column_config.CheckboxColumn()})
         sel = sel_rows[sel_rows["선택"]]
         if not sel.empty:
             sel_row = sel.iloc[0]
             st.markdown(f"#### 📜 [{sel_row['lot_no']}] 작업자 상세 입력 로그")
-            logs = supabase.table("production_logs").select("*").eq("lot_no", sel_row['lot_no']).order("created_at").execute()
-            if logs.data: 
-                st.dataframe(pd.DataFrame(logs.data)[['step', 'data', 'worker', 'created_at']], use_container_width=True)
+            sel_lot = sel_row['lot_no']
+            logs = cached_select("production_logs", "by_lot", lambda: supabase.table("production_logs").select("*").eq("lot_no", sel_lot).order("created_at").execute().data, lot=sel_lot)
+            if logs: 
+                st.dataframe(pd.DataFrame(logs)[['step', 'data', 'worker', 'created_at']], use_container_width=True)
             else: 
                 st.warning("작업 이력이 없습니다.")
             
             if st.button("🗑️ 삭제 실행", type="primary"):
                 supabase.table("work_orders").delete().in_("lot_no", sel['lot_no'].tolist()).execute()
+                invalidate("work_orders", lots=sel['lot_no'].tolist(), deleted=True)
                 st.rerun()
 
 # Tab 7, 8, 9
-with tab7:
+def panel_tracking():
     with st.form("track_form"):
         track_lot = st.text_input("추적할 LOT 번호 입력")
         if st.form_submit_button("검색"):
-            r = supabase.table("production_logs").select("*").eq("lot_no", track_lot).order("created_at").execute()
-            if r.data: 
-                st.dataframe(r.data)
+            # 현재 공정 요약(work_orders 한 행)과 로그 이력은 서로 독립 → 동시에 조회
+            res, errs = fetch_all({
+                "wo": lambda: cached_select("work_orders", "by_lot", lambda: supabase.table("work_orders").select("*").eq("lot_no", track_lot).execute().data, lot=track_lot),
+                "logs": lambda: cached_select("production_logs", "by_lot", lambda: supabase.table("production_logs").select("*").eq("lot_no", track_lot).order("created_at").execute().data, lot=track_lot),
+            })
+            for name, e in errs.items():
+                st.warning(f"⚠️ 조회 실패 ({name}): {e}")
+            wo = res.get("wo")
+            if wo and wo[0].get('last_step'):
+                w = wo[0]
+                c1, c2, c3, c4 = st.columns(4)
+                c1.metric("현재 공정", w['last_step'])
+                c2.metric("공정 단계", w.get('step_level', 0))
+                c3.metric("작업자", w.get('last_worker') or "-")
+                c4.metric("불량", "⛔ 있음" if w.get('has_defect') else "없음")
+                st.caption(f"마지막 작업 시각: {w.get('last_step_at')} / 상태: {w.get('status')}")
+            rows = res.get("logs")
+            if rows: 
+                st.dataframe(rows)
             else: 
                 st.error("이력이 없습니다.")
 
-with tab8:
+def panel_defects():
     st.markdown("### 🚨 불량 등록 현황")
-    r = supabase.table("defects").select("*").order("created_at", desc=True).execute()
-    if r.data: 
-        st.dataframe(r.data)
+    rows = cached_select("defects", "all", lambda: supabase.table("defects").select("*").order("created_at", desc=True).execute().data)
+    if rows: 
+        st.dataframe(rows)
     else: 
         st.info("불량 내역이 없습니다.")
 
-with tab9:
-    html = get_access_qr_content_html(APP_URL)
+def panel_access_qr():
+    html = get_access_qr_content_html(APP_URL, qr_mode=st.session_state.qr_mode)
     st.components.v1.html(html, height=500)
     if st.button("🖨️ 접속 QR 인쇄"): 
         components.html(generate_print_html(html), height=0)
 
 # Tab 10: 견적서
-with tab10:
+def panel_quotation():
     st.markdown("### 📑 견적서 작성 (자동 계산 + 소계)")
     c1, c2, c3 = st.columns(3)
     
@@ -828,3 +695,24 @@ with tab10:
                 html = get_quotation_html(cust_data, edited, totals)
                 components.html(generate_print_html(html), height=0)
                 st.components.v1.html(html, height=1000, scrolling=True)
+
+# ==========================================
+# 🗂️ 패널 선택 - 선택된 패널만 조회/렌더링 (st.tabs 는 10개 탭을 매번 모두 실행함)
+#    패널 데이터는 db_cache 공용 캐시에서 읽고, 앱의 쓰기 동작에서 무효화됨
+# ==========================================
+PANELS = {
+    "📝 작업 입력": panel_order_input, "📄 지시서 인쇄": panel_work_order,
+    "🏷️ 라벨 인쇄": panel_label, "🔄 QR 재발행": panel_reprint,
+    "🧵 원단 재고": panel_fabric, "📊 발행 이력": panel_history,
+    "🔍 제품 추적": panel_tracking, "🚨 불량 현황": panel_defects,
+    "📱 접속 QR": panel_access_qr, "📑 견적서 작성": panel_quotation,
+}
+
+active_panel = st.radio("메뉴", list(PANELS.keys()), horizontal=True, key="admin_panel", label_visibility="collapsed")
+st.divider()
+PANELS[active_panel]()
+
+# 이번 실행(rerun) 비용 표시
+rerun_ms = (time.perf_counter() - RERUN_T0) * 1000
+cs = cache_stats()
+st.sidebar.caption(f"⏱️ 이번 실행: DB {supabase.calls}회 / {supabase.ms:.0f}ms (전체 {rerun_ms:.0f}ms) · 캐시 {cs['entries']}건 (적중 {cs['hits']} / 조회 {cs['misses']})")
@@ -1,9 +1,11 @@
 import streamlit as st
-import pandas as pd
 import time
 import math
 import os
+import threading
 from datetime import datetime, timedelta
+from monitor_sync import MonitorFeed, MonitorView
+from live_table import live_table, reset_live_table
 
 # ==========================================
 # 🚀 1. Supabase 연결 (connection.py 사용)
@@ -103,185 +105,67 @@ st.markdown("""
 
 if 'page_index' not in st.session_state: st.session_state.page_index = 0
 
-def load_data():
-    try:
-        res_orders = supabase.table("work_orders").select("*").order("created_at", desc=True).limit(100).execute()
-        df = pd.DataFrame(res_orders.data)
-        res_logs = supabase.table("production_logs").select("*").order("created_at", desc=True).limit(200).execute()
-        df_log = pd.DataFrame(res_logs.data)
-        
-        if not df.empty: 
-            df['short_time'] = pd.to_datetime(df['created_at']).dt.strftime('%m-%d %H:%M')
-        return df, df_log
-    except Exception as e:
-        return pd.DataFrame(), pd.DataFrame()
-
-df, df_log = load_data()
-ITEMS_PER_PAGE = 8
-
-# 집계 카운터 초기화
-cnt_ready = 0
-cnt_full = 0
-cnt_half = 0
-cnt_elec = 0
-cnt_lam_wait = 0
-cnt_lam_ing = 0
-cnt_done = 0
+# 화면 전환 간격(초) - DB 조회 간격은 monitor_sync.BASE_INTERVAL (BT_MONITOR_FETCH_SEC) 로 따로 설정
+PAGE_FLIP_SEC = int(os.environ.get("BT_MONITOR_FLIP_SEC", "5"))
 
-if not df.empty:
-    # ------------------------------------------------
-    # 📊 상단 박스 집계 로직
-    # ------------------------------------------------
-    for _, row in df.iterrows():
-        s = str(row['status'])
-        
-        if "불량" in s:
-            pass 
-        elif "완료" in s or "출고" in s:
-            cnt_done += 1
-        elif "접합대기" in s:
-            cnt_lam_wait += 1
-        elif "접합" in s: # 접합 진행중 (완료X, 대기X)
-            cnt_lam_ing += 1
-        elif "전극" in s:
-            cnt_elec += 1
-        elif "Half" in s or "하프" in s:
-            cnt_half += 1
-        elif "Full" in s or "풀" in s or "원단" in s or "Cut" in s:
-            cnt_full += 1
-        elif "대기" in s:
-            cnt_ready += 1
+# ------------------------------------------------
+# 🔎 화면별 보기 (예: /Monitor?view=lam 또는 /Monitor?bucket=lam_wait,lam_ing&customer=A건설&days=3)
+#   미리 정한 보기는 .streamlit/secrets.toml 에 등록
+#   [monitor_views.lam]
+#   bucket = ["lam_wait", "lam_ing"]
+# ------------------------------------------------
+try:
+    VIEW_PRESETS = st.secrets.get("monitor_views", {})
+except Exception:
+    VIEW_PRESETS = {}
+VIEW = MonitorView.from_params(st.query_params, VIEW_PRESETS)
 
-    total_pages = math.ceil(len(df) / ITEMS_PER_PAGE)
-    if total_pages < 1: total_pages = 1
-    
-    if st.session_state.page_index >= total_pages: st.session_state.page_index = 0
-    start = st.session_state.page_index * ITEMS_PER_PAGE
-    df_view = df.iloc[start : start + ITEMS_PER_PAGE]
-else:
-    df_view=pd.DataFrame(); total_pages=1
+@st.cache_resource(max_entries=16)
+def get_monitor_feed(view_key):
+    # 보기 조건마다 서버 프로세스 전체에서 1개 - 같은 보기를 띄운 화면은 모두 같은 스냅샷을 읽음
+    return MonitorFeed(supabase, MonitorView(**dict(view_key))).start()
 
-# ==========================================
-# 🖼️ 레이아웃 구성
-# ==========================================
-c1, c2, c3 = st.columns([2, 6, 2])
-with c1:
-    logo_path = None
-    if os.path.exists("pages/company_logo.png"): logo_path = "pages/company_logo.png"
-    elif os.path.exists("company_logo.png"): logo_path = "company_logo.png"
-    
-    if logo_path: st.image(logo_path, width=300)
-    else: st.markdown("### 🏭 BESTROOM", unsafe_allow_html=True)
+def load_data():
+    feed = get_monitor_feed(VIEW.key()).start()  # 스레드가 죽었으면 다시 띄움
+    if st.session_state.get("manual_refresh"):  # 수동 새로고침 버튼은 대기 간격 무시
+        feed.refresh()
+    snap = feed.snapshot()
+    if snap.error:
+        st.caption(f"⚠️ 데이터 갱신 실패 (이전 데이터 표시 중): {snap.error}")
+    # (버전, 조회 시각) - 서버가 조회기를 새로 만들어 버전이 0부터 다시 시작해도 겹치지 않게
+    return snap.board, snap.kpis, (snap.version, snap.fetched_at)
 
-with c2:
-    now_time = get_korea_time().strftime("%H:%M:%S")
-    st.markdown(f"<h1 style='font-size:36px;'>MONITOR <span style='color:#ffd700;'>{now_time}</span></h1>", unsafe_allow_html=True)
+ITEMS_PER_PAGE = 8  # 한 페이지 최대 행 수 (보기의 rows 로 화면마다 바꿀 수 있음)
 
-with c3:
-    # [수정] 자동전환 / 고객사 / SPEC 토글을 한 줄에 배치
-    c3_1, c3_2, c3_3 = st.columns(3)
-    with c3_1: is_auto_play = st.toggle("▶️ 자동전환", value=True)
-    with c3_2: is_cust_secure = st.toggle("🔒 고객사", value=True)
-    with c3_3: is_spec_secure = st.toggle("🔒 SPEC", value=True)
-
-st.markdown(f'<div class="page-indicator">PAGE {st.session_state.page_index + 1} / {total_pages}</div>', unsafe_allow_html=True)
+def page_size(n_rows, max_rows):
+    # 페이지 수는 최소로, 행은 페이지마다 고르게 (예: 9건 → 8+1 대신 5+4)
+    if n_rows <= max_rows:
+        return max(1, n_rows)
+    pages = math.ceil(n_rows / max_rows)
+    return math.ceil(n_rows / pages)
+DEBUG_TIMING = os.environ.get("BT_MONITOR_DEBUG") == "1"  # 회차별 CPU/스레드 수 표시
+# 표를 바뀐 행만 보내는 컴포넌트(live_table.py)로 그림 / "0" 이면 예전처럼 페이지 HTML 전체를 st.markdown 으로 보냄
+LIVE_TABLE = os.environ.get("BT_MONITOR_LIVE_TABLE", "1") != "0"
 
 # ------------------------------------------------
-# 📊 상단 집계 박스 (7개 구분)
+# 🧾 페이지별 표 HTML - 데이터 버전 + 보안 토글 조합마다 1번만 만들고 재사용
+#   (같은 버전이면 페이지 넘김은 만들어 둔 HTML 을 꺼내기만 함, 모든 화면이 공유)
 # ------------------------------------------------
-st.markdown(f"""
-<div class="metric-container">
-    <div class="metric-box"><div class="metric-title">⏳ 작업대기</div><div class="metric-num tx-white">{cnt_ready}</div></div>
-    <div class="metric-box"><div class="metric-title">✂️ 풀커팅</div><div class="metric-num tx-blue">{cnt_full}</div></div>
-    <div class="metric-box"><div class="metric-title">🔪 하프커팅</div><div class="metric-num tx-purple">{cnt_half}</div></div>
-    <div class="metric-box"><div class="metric-title">⚡ 전극공정</div><div class="metric-num tx-blue">{cnt_elec}</div></div>
-    <div class="metric-box"><div class="metric-title">⏳ 접합대기</div><div class="metric-num tx-yellow">{cnt_lam_wait}</div></div>
-    <div class="metric-box"><div class="metric-title">🔥 접합중</div><div class="metric-num tx-orange">{cnt_lam_ing}</div></div>
-    <div class="metric-box"><div class="metric-title">📦 생산완료</div><div class="metric-num tx-green">{cnt_done}</div></div>
-</div>""", unsafe_allow_html=True)
-
-# 메인 테이블
-if not df_view.empty:
+def render_table_html(df_view, is_cust_secure, is_spec_secure):
     html = '<table class="smart-table"><thead><tr><th width="15%">TIME / LOT</th><th width="15%">CUSTOMER / PRODUCT</th><th width="19%">SIZE</th><th width="18%">STATUS (Process %)</th><th width="33%">SPECIFICATION</th></tr></thead><tbody>'
-    
+
     for _, row in df_view.iterrows():
         lot = row['lot_no']; cust = row['customer']; prod = row['product']
         size = row['dimension']; spec = row['spec']; time_str = row.get('short_time','-')
-        status_txt_db = str(row['status'])
-        
+    
         if is_cust_secure: cust_display = '<div class="secret-box">🔒 대외비</div>'
         else: cust_display = f'<div class="cell-cust">{cust}</div><div class="cell-prod">{prod}</div>'
 
         if is_spec_secure: spec_display = '<div class="secret-box">🔒 CONFIDENTIAL</div>'
         else: spec_display = f'<div class="spec-box">{spec}</div>'
-        
-        # -----------------------------------------------------------
-        # 🔥 상태 및 퍼센트 계산 로직 (단품 vs 일반)
-        # -----------------------------------------------------------
-        step_pct = 5; badge = "badge-white"; txt = "작업 대기"; bar = "bg-w"
-        
-        # 단품 여부 확인
-        is_short_product = "단품" in status_txt_db or "생략" in str(spec) or "No Lam" in str(spec)
-
-        # 로그 기반 상세 상태 추적 (DB 상태값이 없을 경우 대비)
-        if not df_log.empty:
-            my_logs = df_log[df_log['lot_no'] == lot]
-            if not my_logs.empty:
-                last_step = str(my_logs.iloc[-1]['step'])
-                
-                # (A) 커팅
-                if "Full" in last_step or "풀" in last_step or "원단" in last_step:
-                    step_pct = 20 if not is_short_product else 30
-                    txt = "✂️ 원단 풀커팅"
-                    badge = "badge-blue"; bar = "bg-b"
-                elif "Half" in last_step or "하프" in last_step:
-                    step_pct = 40 if not is_short_product else 60
-                    txt = "🔪 정밀 하프커팅"
-                    badge = "badge-purple"; bar = "bg-p"
-                
-                # (B) 전극
-                elif "전극" in last_step:
-                    if is_short_product:
-                        step_pct = 100
-                        txt = "✅ 생산 완료 (단품)"
-                        badge = "badge-green"; bar = "bg-g"
-                    else:
-                        step_pct = 60
-                        txt = "⚡ 전극 부착"
-                        badge = "badge-blue"; bar = "bg-b"
-                
-                # (C) 접합
-                elif "접합" in last_step:
-                    if "완료" in last_step:
-                        step_pct = 100
-                        txt = "✅ 생산 완료"
-                        badge = "badge-green"; bar = "bg-g"
-                    elif "대기" in last_step:
-                        step_pct = 70
-                        txt = "⏳ 접합 대기"
-                        badge = "badge-yellow"; bar = "bg-y"
-                    else:
-                        step_pct = 85
-                        txt = "🔥 접합 진행중"
-                        badge = "badge-orange"; bar = "bg-o"
-        
-        # DB 상태값 최우선 오버라이드 (완료/대기/진행중 구분)
-        if "접합대기" in status_txt_db:
-            step_pct = 70
-            txt = "⏳ 접합 대기"
-            badge = "badge-yellow"; bar = "bg-y"
-        elif "접합" in status_txt_db and "대기" not in status_txt_db: # 그냥 '접합' 상태라면 진행중
-             step_pct = 85
-             txt = "🔥 접합 진행중"
-             badge = "badge-orange"; bar = "bg-o"
-        elif "불량" in status_txt_db: 
-            step_pct = 100
-            txt = "⛔ 불량 발생"
-            badge = "badge-red"; bar = "bg-r"
-        elif "완료" in status_txt_db or "출고" in status_txt_db:
-            step_pct = 100
-            txt = "✅ 생산 완료"
-            badge = "badge-green"; bar = "bg-g"
+    
+        # 상태/진행률은 monitor_engine 에서 미리 계산됨
+        step_pct = row['pct']; txt = row['txt']; badge = row['badge']; bar = row['bar']
 
         status_html = f"""
         <div style="display:flex; flex-direction:column; justify-content:center;">
@@ -300,25 +184,104 @@ if not df_view.empty:
             <td class="smart-cell">{status_html}</td>
             <td class="smart-cell">{spec_display}</td>
         </tr>"""
-    st.markdown(html + "</tbody></table>", unsafe_allow_html=True)
-else:
-    st.info("현재 표시할 작업 지시가 없습니다.")
+    return html + "</tbody></table>"
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_pages(view_key, version, per_page, is_cust_secure, is_spec_secure, _df):
+    # _df 는 해시하지 않음 (보기 + version 이 같으면 같은 데이터)
+    if _df.empty:
+        return ()
+    return tuple(render_table_html(_df.iloc[i : i + per_page], is_cust_secure, is_spec_secure)
+                 for i in range(0, len(_df), per_page))
+
+# ==========================================
+# 🖼️ 레이아웃 구성 (전체 실행 때만 그림 - 로고/토글/타이머 바)
+# ==========================================
+c1, c2, c3 = st.columns([2, 6, 2])
+with c1:
+    logo_path = None
+    if os.path.exists("pages/company_logo.png"): logo_path = "pages/company_logo.png"
+    elif os.path.exists("company_logo.png"): logo_path = "company_logo.png"
+    
+    if logo_path: st.image(logo_path, width=300)
+    else: st.markdown("### 🏭 BESTROOM", unsafe_allow_html=True)
+
+with c3:
+    # [수정] 자동전환 / 고객사 / SPEC 토글을 한 줄에 배치
+    c3_1, c3_2, c3_3 = st.columns(3)
+    with c3_1: is_auto_play = st.toggle("▶️ 자동전환", value=True)
+    with c3_2: is_cust_secure = st.toggle("🔒 고객사", value=True)
+    with c3_3: is_spec_secure = st.toggle("🔒 SPEC", value=True)
+
+# 자동전환 중에는 아래 두 조각(fragment)만 PAGE_FLIP_SEC 마다 다시 그림
+#   → 예전처럼 서버 스레드가 sleep 으로 붙잡혀 있지 않고, CSS/로고/토글은 다시 그리지 않음
+RUN_EVERY = PAGE_FLIP_SEC if is_auto_play else None
+
+@st.fragment(run_every=RUN_EVERY)
+def clock():
+    now_time = get_korea_time().strftime("%H:%M:%S")
+    view_label = f" <span style='color:#4fc3f7;'>· {VIEW.label()}</span>" if VIEW.is_filtered() else ""
+    st.markdown(f"<h1 style='font-size:36px;'>MONITOR{view_label} <span style='color:#ffd700;'>{now_time}</span></h1>", unsafe_allow_html=True)
+
+@st.fragment(run_every=RUN_EVERY)
+def board():
+    t_cpu = time.thread_time()
+    # df: 작업 지시 + 진행률/뱃지 계산 결과 (monitor_engine.build_board), kpi: 상단 박스 집계
+    df, kpi, version = load_data()
 
-# [수정] 자동전환 기능이 켜져있을 때만 타이머바 표시 및 페이지 넘김
+    per_page = page_size(len(df), VIEW.rows or ITEMS_PER_PAGE)
+    total_pages = max(1, math.ceil(len(df) / per_page))
+    if st.session_state.page_index >= total_pages: st.session_state.page_index = 0
+
+    st.markdown(f'<div class="page-indicator">PAGE {st.session_state.page_index + 1} / {total_pages}</div>', unsafe_allow_html=True)
+
+    # ------------------------------------------------
+    # 📊 상단 집계 박스 (7개 구분)
+    # ------------------------------------------------
+    st.markdown(f"""
+<div class="metric-container">
+    <div class="metric-box"><div class="metric-title">⏳ 작업대기</div><div class="metric-num tx-white">{kpi['ready']}</div></div>
+    <div class="metric-box"><div class="metric-title">✂️ 풀커팅</div><div class="metric-num tx-blue">{kpi['full']}</div></div>
+    <div class="metric-box"><div class="metric-title">🔪 하프커팅</div><div class="metric-num tx-purple">{kpi['half']}</div></div>
+    <div class="metric-box"><div class="metric-title">⚡ 전극공정</div><div class="metric-num tx-blue">{kpi['elec']}</div></div>
+    <div class="metric-box"><div class="metric-title">⏳ 접합대기</div><div class="metric-num tx-yellow">{kpi['lam_wait']}</div></div>
+    <div class="metric-box"><div class="metric-title">🔥 접합중</div><div class="metric-num tx-orange">{kpi['lam_ing']}</div></div>
+    <div class="metric-box"><div class="metric-title">📦 생산완료</div><div class="metric-num tx-green">{kpi['done']}</div></div>
+</div>""", unsafe_allow_html=True)
+
+    # 메인 테이블
+    sent_bytes = 0
+    if df.empty:
+        reset_live_table()
+        st.info("현재 표시할 작업 지시가 없습니다.")
+    elif LIVE_TABLE:
+        # 바뀐 행 + 페이지 번호만 보냄 (페이지 전환은 브라우저가 보이기/숨기기만)
+        sent_bytes = live_table(df, (VIEW.key(), version), st.session_state.page_index, per_page, is_cust_secure, is_spec_secure)
+    else:
+        pages = build_pages(VIEW.key(), version, per_page, is_cust_secure, is_spec_secure, df)
+        sent_bytes = len(pages[st.session_state.page_index].encode("utf-8"))
+        st.markdown(pages[st.session_state.page_index], unsafe_allow_html=True)
+
+    if is_auto_play:
+        # 다음 회차에 보여줄 페이지 (데이터는 공용 스냅샷을 그대로 재사용)
+        st.session_state.page_index = (st.session_state.page_index + 1) % total_pages
+    else:
+        st.info(f"⏸️ 화면 전환이 일시 정지되었습니다. (현재 페이지: {st.session_state.page_index + 1}/{total_pages})")
+
+    if DEBUG_TIMING:
+        st.caption(f"⏱️ 이번 회차 CPU {(time.thread_time() - t_cpu) * 1000:.1f}ms / 서버 스레드 {threading.active_count()}개 / 표 전송 {sent_bytes:,}B")
+
+with c2:
+    clock()
+board()
+
+# [수정] 자동전환 기능이 켜져있을 때만 타이머바 표시
 if is_auto_play:
-    st.markdown("""
+    st.markdown(f"""
     <div class="timer-bar-container">
-        <div class="timer-bar-fill"></div>
+        <div class="timer-bar-fill" style="animation-duration:{PAGE_FLIP_SEC}s;"></div>
     </div>
     """, unsafe_allow_html=True)
-
-    time.sleep(5)
-    st.session_state.page_index = (st.session_state.page_index + 1) % total_pages
-    try: st.rerun()
-    except AttributeError: st.experimental_rerun()
 else:
-    # 정지 상태일 때 표시할 UI
-    st.info(f"⏸️ 화면 전환이 일시 정지되었습니다. (현재 페이지: {st.session_state.page_index + 1}/{total_pages})")
-    if st.button("🔄 데이터 수동 새로고침"):
-        try: st.rerun()
-        except AttributeError: st.experimental_rerun()
+    if st.button("🔄 데이터 수동 새로고침", key="manual_refresh"):
+        st.rerun()
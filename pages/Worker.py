@@ -1,9 +1,13 @@
 # 파일명: pages/Worker.py
 import streamlit as st
 import time
-import cv2              # 👈 [필수] 카메라 영상 처리용
-import numpy as np      # 👈 [필수] 이미지 데이터 변환용
+import uuid
 from datetime import datetime
+from db_cache import cached_select, invalidate
+from db_fetch import fetch_all
+import scan_queue   # 📮 스캔 저장 대기열 (서버 파일에 바로 저장 → 전송은 뒤에서)
+from work_steps import STEP_LEVEL, DEFECT_LEVEL, RESULT_TEXT, step_level, check_lot, record_step   # 👷 공정 순서 / 저장 (RPC 1번)
+from qr_decode import decode_qr, decode_qr_multi, decode_stats   # 📷 QR 인식 (축소 이미지 먼저 → 실패 시 단계별 보정)
 
 # ==========================================
 # 🛑 [문지기] 로그인 안 했으면 메인으로 강제 이동
@@ -24,6 +28,30 @@ except Exception as e:
     st.error(f"❌ DB 연결 실패: {e}")
     st.stop()
 
+# ==========================================
+# 📮 스캔 저장 대기열 (scan_queue.py)
+#   * 저장 버튼은 서버 파일에 기록만 하고 바로 끝 → 현장 Wi-Fi 가 끊겨도 다음 제품 스캔 가능
+#   * 전송/재시도는 서버의 전송 스레드가 처리, 결과는 화면 아래 '내 스캔' 에 표시
+#   * BT_SCAN_QUEUE=0 이면 예전처럼 저장 버튼에서 바로 record_step
+# ==========================================
+STATUS_TIMEOUT = 3       # 저장 전 상태 확인 제한 시간(초) - 넘기면 확인 없이 대기열에 저장 (전송 때 서버가 다시 확인)
+QUEUE_PANEL_SEC = 3      # '내 스캔' 갱신 간격(초)
+
+
+@st.cache_resource
+def get_scan_queue():
+    # 서버 프로세스당 1개 (전송 스레드 1개)
+    return scan_queue.ScanQueue(scan_queue.QUEUE_PATH, get_supabase_client()).start()
+
+
+queue = None
+if scan_queue.ENABLED:
+    try:
+        queue = get_scan_queue()
+    except Exception as e:
+        st.warning(f"⚠️ 저장 대기열을 열지 못해 바로 저장합니다: {e}")
+scan_session = st.session_state.setdefault("_scan_session", uuid.uuid4().hex)
+
 # ==========================================
 # ⚙️ 화면 설정 및 스타일
 # ==========================================
@@ -77,16 +105,7 @@ current_worker = st.selectbox("👤 작업자 선택", worker_list)
 
 st.divider()
 
-# 2. 공정 단계 정의 (순서 체크용)
-STEP_LEVEL = {
-    "Full Cut": 10, 
-    "Half Cut": 20, 
-    "전극 완료": 30, 
-    "접합: 1. 준비 완료": 41, 
-    "접합: 2. 가열 시작": 42, 
-    "접합: 3. 공정 완료 (End)": 43,
-    "📦 출고 완료": 50 
-}
+# 2. 공정 단계 정의 (순서 체크용) → work_steps.STEP_LEVEL
 
 # 3. 불량 신고 모드 스위치
 is_defect_mode = st.toggle("🚨 불량 발생 신고", value=False)
@@ -97,7 +116,7 @@ if is_defect_mode:
     defect_type = st.selectbox("불량 유형", ["이물질", "기포/들뜸", "치수 불량", "스크래치", "전극 불량", "원단 불량", "기타"])
     defect_note = st.text_input("상세 내용", placeholder="예: 우측 상단 3cm 찢어짐")
     save_data = f"[{defect_type}] {defect_note}"
-    current_level = 999 
+    current_level = DEFECT_LEVEL
 else:
     # 정상 작업 모드
     step = st.radio("현재 진행 공정", list(STEP_LEVEL.keys()))
@@ -136,77 +155,179 @@ else:
         if note: save_data = note
 
 st.markdown("### 👇 QR 스캔 (카메라)")
-st.caption("※ 카메라 권한을 허용해주세요.")
+# 일괄 스캔: 사진 1장에 찍힌 제품 전부를 한 번에 등록 (정상 작업 모드만)
+is_batch = st.toggle("📚 일괄 스캔 (여러 제품을 한 장에)", value=False, disabled=is_defect_mode) and not is_defect_mode
+if is_batch:
+    st.caption("※ 라벨 QR 이 모두 보이도록 펼쳐서 찍어주세요.")
+else:
+    st.caption("※ 카메라 권한을 허용해주세요.")
 
 # ==========================================
 # 📷 카메라 로직
 # ==========================================
 img_file = st.camera_input("QR 스캔", label_visibility="collapsed")
 
-if img_file is not None:
+
+def lookup_status(lots):
+    # 반환: ({LOT: 상태}, 전송 대기 중인 LOT, 오류)
+    #   * 전송 대기 중인 스캔이 있으면 그 스캔이 반영된 뒤의 상태로 봄 (같은 공정 두 번 저장 방지)
+    #   * 대기열 모드에서 네트워크가 안 되면 ({}, set(), 오류) → 확인 없이 저장 가능
+    lots = list(lots)
+    job = lambda: cached_select("work_orders", ("status_in", tuple(sorted(lots))), lambda: supabase.table("work_orders").select("lot_no, status").in_("lot_no", lots).execute().data)
+    if queue is None:
+        rows = job()
+    else:
+        results, errors = fetch_all({"rows": job}, timeout=STATUS_TIMEOUT)
+        if errors:
+            return {}, set(), errors["rows"]
+        rows = results["rows"]
+    status_of = {r['lot_no']: r['status'] for r in rows}
+    queued = set()
+    if queue is not None:
+        pending = queue.pending_status()
+        queued = {lot for lot in lots if lot in pending}
+        status_of.update({lot: pending[lot] for lot in queued})
+    return status_of, queued, None
+
+
+def save_scan(lots, data_text, source, defect=None):
+    # 대기열 모드: 서버 파일에 넣고 바로 None 반환 / 아니면 record_step RPC 1번 → 결과 목록
+    if queue is not None:
+        queue.add(scan_session, lots, step, current_level, data_text, current_worker, defect_type=defect, source=source)
+        return None
+    saved = record_step(supabase, lots, step, current_level, data_text, current_worker, defect_type=defect)
+    invalidate("defects" if defect else "production_logs", lots=lots)
+    invalidate("work_orders", lots=lots)
+    return saved
+
+
+def batch_scan(img_file):
     try:
-        # 1. 이미지 파일 바이트로 읽기
-        bytes_data = img_file.getvalue()
-        
-        # 2. OpenCV 형식으로 디코딩
-        cv2_img = cv2.imdecode(np.frombuffer(bytes_data, np.uint8), cv2.IMREAD_COLOR)
-        
-        # 3. 흑백 변환
-        gray_img = cv2.cvtColor(cv2_img, cv2.COLOR_BGR2GRAY)
-        
-        # 4. QR 코드 디코딩
-        detector = cv2.QRCodeDetector()
-        data, bbox, _ = detector.detectAndDecode(gray_img)
+        # 1. 사진 속 QR 전부 인식 (같은 사진은 다시 인식하지 않음)
+        scan = st.session_state.get("_qr_batch")
+        if scan is None or scan[0] != img_file.file_id:
+            scan = (img_file.file_id, decode_qr_multi(img_file.getvalue()))
+            st.session_state["_qr_batch"] = scan
+        res = scan[1]
+        lots = sorted(res.texts)
+
+        st.caption(f"⏱️ 인식 {res.ms:.0f}ms · QR {len(lots)}개" + (f" (위치만 찾고 못 읽은 QR {res.missed}개)" if res.missed else ""))
+        if not lots:
+            st.warning("❌ QR 코드를 찾지 못했습니다. 다시 찍어주세요.")
+            return
+
+        # 2. 상태 확인 (전체 LOT 1번 조회)
+        status_of, queued, err = lookup_status(lots)
+        if err is not None:
+            st.warning("📡 네트워크가 불안정해 상태를 확인하지 못했습니다. 저장하면 전송할 때 서버에서 확인합니다.")
+
+        summary, accepted = [], []
+        for lot in lots:
+            prev_status = status_of.get(lot)
+            if err is not None:
+                accepted.append(lot)
+                summary.append({"LOT": lot, "현재 상태": "-", "결과": "❓ 전송 때 확인"})
+                continue
+            result = check_lot(prev_status, current_level)
+            if result == "ok":
+                accepted.append(lot)
+            summary.append({"LOT": lot, "현재 상태": (prev_status or "-") + (" ⏳" if lot in queued else ""), "결과": RESULT_TEXT[result]})
+
+        st.success(f"🔍 {len(lots)}개 인식 · 등록 {len(accepted)}건 / 제외 {len(lots) - len(accepted)}건")
+        st.dataframe(summary, hide_index=True, use_container_width=True)
+        if queued:
+            st.caption("⏳ = 전송 대기 중인 스캔이 반영된 뒤의 상태")
+        if res.missed:
+            st.warning(f"📷 QR {res.missed}개는 읽지 못했습니다. 목록에 없는 제품만 다시 찍어주세요.")
+
+        # 3. 저장 (대기열에 넣고 바로 끝 / 대기열 없으면 RPC 1번 - 확인 + 로그 + 상태 변경을 한 트랜잭션으로)
+        if accepted and st.button(f"💾 {len(accepted)}건 일괄 저장", type="primary", use_container_width=True):
+            saved = save_scan(accepted, save_data, img_file.file_id)
+            if saved is None:
+                st.toast(f"📥 {len(accepted)}건 저장 ({step}) · 전송 대기")
+                st.rerun()
+
+            done = [r for r in saved if r['result'] == "ok"]
+            late = [r for r in saved if r['result'] != "ok"]   # 확인 후 저장 사이에 다른 작업자가 먼저 바꾼 LOT
+            if late:
+                st.warning("⚠️ 저장 직전에 상태가 바뀐 LOT 은 제외했습니다: " + ", ".join(f"{r['lot_no']} ({RESULT_TEXT[r['result']]})" for r in late))
+            if done:
+                st.balloons()
+                st.success(f"✅ {len(done)}건 저장 완료! ({step})")
+            time.sleep(1.5)
+            st.rerun()
+
+    except Exception as e:
+        st.error("📡 처리 중 오류가 발생했습니다.")
+        st.code(f"에러 상세: {e}")
+
+
+if img_file is not None and is_batch:
+    batch_scan(img_file)
+
+elif img_file is not None:
+    try:
+        # 1. QR 인식 (같은 사진은 다시 인식하지 않음 - 저장 버튼 누를 때 재실행돼도 그대로 사용)
+        scan = st.session_state.get("_qr_scan")
+        if scan is None or scan[0] != img_file.file_id:
+            scan = (img_file.file_id, decode_qr(img_file.getvalue()))
+            st.session_state["_qr_scan"] = scan
+        res = scan[1]
+        data = res.text
+
+        qs = decode_stats()
+        st.caption(f"⏱️ 인식 {res.ms:.0f}ms ({' → '.join(res.attempts) or '-'}) · 최근 {qs['count']}건 중앙값 {qs['median_ms']:.0f}ms / 첫 시도 성공 {qs['first_try_rate']:.0%}")
 
         if data:
             st.success(f"🔍 QR 인식 성공: **{data}**")
             
             # --- DB 조회 및 저장 로직 ---
-            # DB 조회 (QR 데이터로 검색)
-            response = supabase.table("work_orders").select("status").eq("lot_no", data).execute()
-            
-            if not response.data:
+            # DB 조회 (QR 데이터로 검색, 전송 대기 중인 스캔 반영)
+            status_of, queued, err = lookup_status([data])
+            prev_status = status_of.get(data)
+
+            if err is not None:
+                st.warning("📡 네트워크가 불안정해 상태를 확인하지 못했습니다. 저장하면 전송할 때 서버에서 확인합니다.")
+            elif prev_status is None:
                 st.error("❌ 등록되지 않은 LOT 번호입니다.")
             else:
-                prev_status = response.data[0]['status']
-                
                 # 불량/보류 체크
                 if "불량" in prev_status or "보류" in prev_status:
-                    st.error(f"⛔ 경고: 이미 불량 처리된 제품입니다! ({prev_status})")
+                    st.error(f"⛔ 경고: 이미 불량 처리된 제품입니다! ({prev_status})" + (" ⏳ 전송 대기 중" if data in queued else ""))
                     st.stop()
 
                 # 순서 체크 (정상 모드일 때만)
                 if not is_defect_mode:
-                    prev_level = 0
-                    for key, val in STEP_LEVEL.items():
-                        if key in prev_status: prev_level = val; break
-                    
-                    if prev_level >= current_level:
-                        st.warning(f"⚠️ 이미 완료된 공정입니다. (현재 상태: {prev_status})")
+                    if step_level(prev_status) >= current_level:
+                        if data in queued:
+                            st.info(f"⏳ 저장됨 - 전송 대기 중입니다. (전송 후 상태: {prev_status})")
+                        else:
+                            st.warning(f"⚠️ 이미 완료된 공정입니다. (현재 상태: {prev_status})")
                         st.stop()
-                
+
+            if err is not None or prev_status is not None:
                 # 저장 버튼
                 btn_label = "🚨 불량 등록 실행" if is_defect_mode else "💾 작업 완료 저장"
                 btn_type = "secondary" if is_defect_mode else "primary"
 
                 if st.button(btn_label, type=btn_type, use_container_width=True):
+                    # 대기열에 넣고 바로 끝 / 대기열 없으면 RPC 1번 - 상태 확인 + 로그(불량 등록) + 상태 변경을 한 트랜잭션으로
+                    if is_defect_mode:
+                        saved = save_scan([data], defect_note, img_file.file_id, defect=defect_type)
+                    else:
+                        saved = save_scan([data], save_data, img_file.file_id)
+                    if saved is None:
+                        st.toast(f"📥 {'불량 등록' if is_defect_mode else '작업'} 저장 ({defect_type if is_defect_mode else step}) · 전송 대기")
+                        st.rerun()
+
+                    r = saved[0] if saved else {"result": "missing", "status": None}
+                    if r['result'] != "ok":
+                        # 확인 후 저장 사이에 다른 작업자가 먼저 바꾼 경우
+                        st.error(f"{RESULT_TEXT[r['result']]} - 저장하지 않았습니다. (현재 상태: {r.get('status') or '-'})")
+                        st.stop()
                     if is_defect_mode:
-                        supabase.table("defects").insert({
-                            "lot_no": data, "step": step, "defect_type": defect_type, 
-                            "note": defect_note, "status": "조치대기", "worker": current_worker
-                        }).execute()
-                        supabase.table("work_orders").update({"status": f"⛔ 불량({defect_type})"}).eq("lot_no", data).execute()
                         st.success(f"🚨 불량 등록 완료! ({defect_type})")
                     else:
-                        supabase.table("production_logs").insert({
-                            "lot_no": data, "step": step, "data": save_data, 
-                            "worker": current_worker, "result": "OK"
-                        }).execute()
-                        
-                        # 출고 완료 시 DB 상태도 '출고'로 변경
-                        update_status = "출고" if "출고" in step else step
-                        supabase.table("work_orders").update({"status": update_status}).eq("lot_no", data).execute()
-                        
                         st.balloons()
                         st.success(f"✅ 작업 저장 완료! ({step})")
                     
@@ -220,5 +341,50 @@ if img_file is not None:
         st.error("📡 처리 중 오류가 발생했습니다.")
         st.code(f"에러 상세: {e}")
 
+# ==========================================
+# 📮 내 스캔 (전송 대기 / 저장됨 / 제외) - 이 부분만 주기적으로 갱신
+# ==========================================
+SCAN_STATE_TEXT = {"pending": "⏳ 전송 대기", "synced": "✅ 저장됨", "rejected": "⚠️ 제외", "failed": "❌ 전송 실패"}
+
+
+@st.fragment(run_every=QUEUE_PANEL_SEC)
+def queue_panel():
+    try:
+        c = queue.counts(scan_session)
+        s = queue.status()
+        items = queue.session_items(scan_session)
+    except Exception as e:
+        st.caption(f"📮 대기열 상태를 읽지 못했습니다: {e}")
+        return
+    if not items:
+        return
+
+    st.divider()
+    if s['last_error'] and c['pending']:
+        st.warning(f"📡 서버 연결 안 됨 - {s['retry_in']:.0f}초 후 다시 전송합니다. (스캔 {c['pending']}건은 서버에 안전하게 보관 중)")
+    st.caption(f"📮 내 스캔: ⏳ 전송 대기 {c['pending']} · ✅ 저장됨 {c['synced']} · ⚠️ 제외 {c['rejected'] + c['failed']}")
+
+    rows = []
+    for it in items:
+        state = SCAN_STATE_TEXT[it['state']]
+        if it['state'] == "pending" and it['attempts']:
+            state += f" (서버 거부 {it['attempts']})"
+        skipped = [r for r in (it['results'] or []) if r.get('result') != "ok"]
+        note = ", ".join(f"{r['lot_no']} {RESULT_TEXT.get(r['result'], r['result'])}" for r in skipped)
+        if it['state'] == "failed":
+            note = it['error'] or ""
+        lots = it['lots']
+        rows.append({"시각": datetime.fromtimestamp(it['created_at']).strftime("%H:%M:%S"),
+                     "공정": it['step'],
+                     "LOT": lots[0] + (f" 외 {len(lots) - 1}" if len(lots) > 1 else ""),
+                     "상태": state,
+                     "제외 사유": note})
+    with st.expander("최근 스캔", expanded=bool(c['pending'] or c['rejected'] or c['failed'])):
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+if queue is not None:
+    queue_panel()
+
 # 화면 하단 여백 확보
 st.markdown("<div style='height: 100px;'></div>", unsafe_allow_html=True)
@@ -0,0 +1,146 @@
+# 파일명: print_docs.py
+# ==========================================
+# 🖨️ 인쇄용 HTML 문서 (작업 지시서 / 라벨 / 접속 QR)
+#   * qr_mode="png" : QR 을 base64 PNG(data URI) 로 넣음
+#   * qr_mode="svg" : QR 을 인라인 SVG(벡터) 로 넣음 - 인쇄 시 확대해도 선명
+#     ※ HTML 원본은 PNG 보다 큼 (400장 지시서 933KB → 1,202KB) - 웹소켓 압축이 켜져 있을 때만 전송량이 작음
+#       → 기본값은 PNG, SVG 는 인쇄 선명도가 필요할 때만 선택
+#   비교는 bench/bench_qr_payload.py 참고
+# ==========================================
+from datetime import datetime
+
+from label_render import warm_qr_cache
+from qr_assets import get_qr_base64, get_qr_svg, lot_qr_data
+
+QR_MODES = ("png", "svg")
+DEFAULT_QR_MODE = "png"
+
+
+def qr_html(data, style, qr_mode=DEFAULT_QR_MODE, box_size=5, border=0):
+    if qr_mode == "svg":
+        return get_qr_svg(data, border).replace("<svg ", f'<svg style="{style} height:auto; display:block; margin:auto;" ', 1)
+    return f'<img src="data:image/png;base64,{get_qr_base64(data, box_size, border)}" style="{style}">'
+
+
+def generate_print_html(content_html):
+    return f"""<!DOCTYPE html><html><head><meta charset="UTF-8"><title>Print</title>
+    <script>setTimeout(function() {{ window.print(); }}, 500);</script></head>
+    <body style="margin:0; padding:0;">{content_html}</body></html>"""
+
+
+def get_label_content_html(items, mode="roll", rotate=False, margin_top=0, qr_mode=DEFAULT_QR_MODE):
+    tr_css = "transform: rotate(90deg);" if rotate else ""
+    wrap_css = f"width: 38mm; height: 19mm; page-break-after: always; display: flex; align-items: center; justify-content: center; overflow: hidden; border: 1px solid #ddd; margin-top: {margin_top}mm;" if mode == "roll" else "width: 42mm; height: 22mm; display: inline-flex; align-items: center; justify-content: center; margin: 2px; border: 1px dashed #ccc; float: left;"
+    
+    html = f"""<!DOCTYPE html><html><head><style>
+    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;900&display=swap');
+    @media print {{ @page {{ size: 40mm 20mm; margin: 0; }} body {{ margin: 0; }} }}
+    .lb {{ {wrap_css} font-family: 'Roboto', sans-serif; background: white; box-sizing: border-box; }}
+    .tb {{ font-weight: 900; font-size: 11pt; color: black; line-height: 1.2; }}
+    </style></head><body><div style="display:flex; flex-wrap:wrap;">"""
+    
+    if qr_mode == "png":
+        warm_qr_cache([lot_qr_data(it.get('lot', '')) for it in items])  # 대량 발행 시 QR 병렬 생성
+    for it in items:
+        lot = it.get('lot', '')
+        img = qr_html(lot_qr_data(lot), "width:95%;", qr_mode)
+        
+        html += f"""
+        <div class="lb">
+            <div style="width:38mm; height:19mm; display:flex; align-items:center; {tr_css}">
+                <div style="width:38%; text-align:center;">{img}</div>
+                <div style="width:62%; padding-left:1.5mm;">
+                    <div class="tb">{lot}</div>
+                    <div class="tb">{it.get('cust', '')}</div>
+                    <div class="tb">{it.get('w', '0')} x {it.get('h', '0')}</div>
+                    <div class="tb">[{it.get('elec', '')}]</div>
+                </div>
+            </div>
+        </div>
+        """
+    html += "</div></body></html>"
+    return html
+
+
+def get_work_order_html(items, qr_mode=DEFAULT_QR_MODE):
+    html = """<html><head><style>
+    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700;900&display=swap');
+    @media print { @page { size: A4; margin: 5mm; } body { margin: 0; } .pb { page-break-after: always; } }
+    body { font-family: 'Noto Sans KR', sans-serif; color: #000; }
+    .card { width: 49%; height: 62.5mm; border: 2px solid #000; box-sizing: border-box; margin-bottom: 1mm; display: flex; flex-direction: column; overflow: hidden; }
+    .chead { background-color: #e0e0e0; padding: 2px 8px; border-bottom: 1px solid #000; display: flex; justify-content: space-between; align-items: center; height: 24px; }
+    .dim { height: 40px; border-top: 2px solid #000; display: flex; align-items: center; justify-content: center; background-color: #fff; }
+    .stbl { width: 100%; border-collapse: collapse; } .stbl td { padding: 1px 0; font-size: 11px; vertical-align: middle; }
+    .lbl { font-weight: 900; width: 45px; color: #333; } .val { font-weight: 700; color: #000; }
+    </style></head><body><div style="display:flex; flex-wrap:wrap; justify-content:space-between;">"""
+    
+    chunk = 8
+    if qr_mode == "png":
+        warm_qr_cache([lot_qr_data(it.get('lot', '')) for it in items])  # 대량 발행 시 QR 병렬 생성
+    print_date = datetime.now().strftime('%Y-%m-%d %H:%M')
+    
+    for i in range(0, len(items), chunk):
+        sub = items[i:i + chunk]
+        
+        html += f"""
+        <div style="width:100%; position:relative; margin-bottom:3mm; text-align:center;">
+            <span style="font-size:20pt; font-weight:900; text-decoration:underline;">작업 지시서 (Work Order)</span>
+            <span style="position:absolute; right:5px; bottom:0; font-size:10pt; color:#555; font-weight:bold;">발행일시: {print_date}</span>
+        </div>
+        """
+        html += '<div style="display:flex; flex-wrap:wrap; justify-content:space-between; width:100%;">'
+        
+        for it in sub:
+            lot = it.get('lot', '')
+            img = qr_html(lot_qr_data(lot), "width:100%;", qr_mode)
+            
+            lam_txt = f"<span style='color:#000;'>{it.get('spec_lam','-')}</span>"
+            if "생략" in str(it.get('spec_lam','')): 
+                lam_txt = "<span style='text-decoration:line-through; color:red; font-weight:bold;'>접합생략</span> <span style='color:#000; font-weight:bold;'>(필름마감)</span>"
+            
+            w = str(it.get('w', '0'))
+            h = str(it.get('h', '0'))
+            e = str(it.get('elec', ''))
+            wc = "font-weight:900; text-decoration:underline;" if "가로" in e or "W" in e.upper() else "font-weight:500; color:#555;"
+            hc = "font-weight:900; text-decoration:underline;" if "세로" in e or "H" in e.upper() else "font-weight:500; color:#555;"
+            
+            html += f"""
+            <div class="card">
+                <div class="chead">
+                    <div><span style="font-size:13px; font-weight:900;">{lot}</span> <span style="font-size:12px; font-weight:900; color:#333;">[{it.get('prod', '')}]</span></div>
+                    <div style="font-size:10px; font-weight:700;">{it.get('cust', '')} | {datetime.now().strftime('%m-%d')}</div>
+                </div>
+                <div style="display:flex; flex:1; overflow:hidden;">
+                    <div style="width:80px; display:flex; align-items:center; justify-content:center; border-right:1px solid #000;">{img}</div>
+                    <div style="flex:1; padding:2px 6px;">
+                        <table class="stbl">
+                            <tr><td class="lbl">🧵 원단</td><td class="val">{it.get('fabric','-')}</td></tr>
+                            <tr><td colspan="2"><hr style="margin:2px 0; border-top:1px dashed #ccc;"></td></tr>
+                            <tr><td class="lbl">✂️ 커팅</td><td class="val">{it.get('spec_cut','-')}</td></tr>
+                            <tr><td class="lbl">🔥 접합</td><td class="val">{lam_txt}</td></tr>
+                            <tr><td class="lbl" style="color:red;">⚠️ 특이</td><td class="val" style="color:red;">{it.get('note','-')}</td></tr>
+                        </table>
+                    </div>
+                </div>
+                <div class="dim">
+                    <span style="font-size:28px; {wc}">{w}</span><span style="font-size:20px; font-weight:bold; margin:0 5px;">X</span><span style="font-size:28px; {hc}">{h}</span><span style="font-size:18px; font-weight:900; margin-left:15px;">[{e}]</span>
+                </div>
+            </div>
+            """
+        html += '</div>'
+        html += '<div style="width:100%; text-align:center; font-size:11px; color:#444; margin-top:3mm; font-weight:bold; letter-spacing:1px;">※ 본 문서는 (주)베스트룸의 소중한 자산이므로 무단 복제 및 외부 유출을 엄격히 금합니다.</div>'
+        html += '<div class="pb"></div>'
+    return html + "</body></html>"
+
+
+def get_access_qr_content_html(url, qr_mode=DEFAULT_QR_MODE):
+    img = qr_html(url, "width:350px;", qr_mode, box_size=10, border=1)
+    html = f"""
+    <div style="text-align:center; padding-top:50mm;">
+        <div style="border:5px solid black; padding:30px; display:inline-block; border-radius:20px;">
+            <div style="font-size:30pt; font-weight:900;">🏭 시스템 접속 QR</div><br>
+            {img}
+        </div>
+    </div>
+    """
+    return html
@@ -0,0 +1,142 @@
+# 파일명: printer_cmds.py
+# ==========================================
+# 🖨️ 감열 라벨 프린터용 명령어 출력 (40x20mm 라벨)
+#   * ZPL     : 지브라 계열 - 라벨 양식을 한 번 저장(^DF)하고 라벨마다 값만 전송(^XF)
+#   * ESC/POS : 영수증/라벨 겸용 프린터 - 페이지 모드로 QR + 글자 위치 지정
+#   * QR 은 프린터 내장 명령으로 그림 (이미지 전송 없음)
+#   → 라벨 500장이 수십 KB 수준 (HTML+PNG 방식은 수 MB)
+#   배치는 get_label_content_html 과 같게: 왼쪽 38% QR / 오른쪽 LOT·고객사·규격·[전극]
+# ==========================================
+import socket
+
+from qr_assets import lot_qr_data, qr_modules
+
+LABEL_MM = (40, 20)
+DEFAULT_DPI = 203
+RAW_PORT = 9100
+
+# 프린터에 저장된 한글 TTF 이름 (없으면 None → 내장 폰트 ^A0, 한글은 안 나옴)
+ZPL_KOREAN_FONT = "E:NANUMGOTHIC.TTF"
+ZPL_FORMAT_NAME = "R:BTLABEL.ZPL"
+
+
+def _dots(mm, dpi):
+    return int(round(mm * dpi / 25.4))
+
+
+def _layout(dpi):
+    # get_label_content_html: 38x19mm 영역, QR 칸 38% (이미지 95%), 글자 칸 62% + 왼쪽 여백 1.5mm
+    w, h = _dots(LABEL_MM[0], dpi), _dots(LABEL_MM[1], dpi)
+    inner_x, inner_y = _dots(1, dpi), _dots(0.5, dpi)
+    qr_box = _dots(38 * 0.38 * 0.95, dpi)
+    text_x = inner_x + _dots(38 * 0.38 + 1.5, dpi)
+    line_h = _dots(19 / 4.4, dpi)
+    return {"w": w, "h": h, "x0": inner_x, "y0": inner_y, "qr_box": qr_box,
+            "text_x": text_x, "line_h": line_h, "font_h": int(line_h * 0.8)}
+
+
+def _qr_modules(datas):
+    # 이번 묶음에서 가장 큰 QR 의 모듈 수 (배율 계산용)
+    return max([21] + [qr_modules(d) for d in set(datas)])
+
+
+def _label_fields(it):
+    return [
+        str(it.get('lot', '')),
+        str(it.get('cust', '')),
+        f"{it.get('w', '0')} x {it.get('h', '0')}",
+        f"[{it.get('elec', '')}]",
+    ]
+
+
+# ==========================================
+# 🦓 ZPL
+# ==========================================
+def _zpl_text(text):
+    return str(text).replace("^", " ").replace("~", " ")
+
+
+def build_zpl(items, dpi=DEFAULT_DPI, korean_font=ZPL_KOREAN_FONT):
+    if not items:
+        return b""
+    lay = _layout(dpi)
+    datas = [lot_qr_data(it.get('lot', '')) for it in items]
+    modules = _qr_modules(datas)
+    mag = max(1, min(10, lay['qr_box'] // modules))
+    qr_y = lay['y0'] + (lay['h'] - lay['y0'] * 2 - mag * modules) // 2
+    font = f"^A@N,{lay['font_h']},{lay['font_h']},{korean_font}" if korean_font else f"^A0N,{lay['font_h']},{lay['font_h']}"
+
+    # 1) 라벨 양식 저장 (한 번만 전송)
+    out = ["^XA", "^DF" + ZPL_FORMAT_NAME + "^FS", "^CI28",
+           f"^PW{lay['w']}", f"^LL{lay['h']}", "^LH0,0",
+           f"^FO{lay['x0']},{qr_y}^BQN,2,{mag}^FN1^FS"]
+    for i in range(4):
+        y = lay['y0'] + lay['line_h'] * i + (lay['line_h'] - lay['font_h']) // 2
+        out.append(f"^FO{lay['text_x']},{y}{font}^FN{i + 2}^FS")
+    out.append("^XZ")
+
+    # 2) 라벨마다 값만 채워서 출력
+    for it, data in zip(items, datas):
+        fields = _label_fields(it)
+        line = f"^XA^XF{ZPL_FORMAT_NAME}^FS^CI28^FN1^FDMA,{_zpl_text(data)}^FS"
+        line += "".join(f"^FN{i + 2}^FD{_zpl_text(v)}^FS" for i, v in enumerate(fields))
+        out.append(line + "^XZ")
+    return ("\n".join(out) + "\n").encode("utf-8")
+
+
+# ==========================================
+# 🧾 ESC/POS (페이지 모드)
+# ==========================================
+ESC, GS, FS = b"\x1b", b"\x1d", b"\x1c"
+
+
+def _u16(n):
+    return bytes([n & 0xFF, (n >> 8) & 0xFF])
+
+
+def _escpos_qr(data, module):
+    payload = data.encode("ascii", errors="replace")
+    store = 3 + len(payload)
+    return (GS + b"(k" + _u16(4) + b"\x31\x41\x32\x00"        # 모델 2
+            + GS + b"(k" + _u16(3) + b"\x31\x43" + bytes([module])  # 모듈 크기
+            + GS + b"(k" + _u16(3) + b"\x31\x45\x31"          # 오류정정 M
+            + GS + b"(k" + _u16(store) + b"\x31\x50\x30" + payload
+            + GS + b"(k" + _u16(3) + b"\x31\x51\x30")         # 출력
+
+
+def build_escpos(items, dpi=DEFAULT_DPI, encoding="cp949", feed_label=True):
+    if not items:
+        return b""
+    lay = _layout(dpi)
+    datas = [lot_qr_data(it.get('lot', '')) for it in items]
+    modules = _qr_modules(datas)
+    module = max(1, min(16, lay['qr_box'] // modules))
+    qr_h = module * modules
+    qr_y = lay['y0'] + (lay['h'] - lay['y0'] * 2 - qr_h) // 2
+
+    out = bytearray(ESC + b"@")
+    for it, data in zip(items, datas):
+        out += ESC + b"L"                                                # 페이지 모드
+        out += ESC + b"W" + _u16(0) + _u16(0) + _u16(lay['w']) + _u16(lay['h'])
+        out += ESC + b"T\x00"
+        # 페이지 모드에서 QR/글자는 현재 세로 위치를 '아래쪽 기준선'으로 그려짐
+        out += ESC + b"$" + _u16(lay['x0']) + GS + b"$" + _u16(qr_y + qr_h)
+        out += _escpos_qr(data, module)
+        for i, text in enumerate(_label_fields(it)):
+            y = lay['y0'] + lay['line_h'] * (i + 1) - (lay['line_h'] - lay['font_h']) // 2
+            out += ESC + b"$" + _u16(lay['text_x']) + GS + b"$" + _u16(y)
+            out += ESC + b"E\x01"                                         # 굵게
+            out += FS + b"&" + text.encode(encoding, errors="replace") + FS + b"."
+        out += b"\x0c"                                                    # 페이지 출력
+        if feed_label:
+            out += GS + b"\x0c"                                           # 다음 라벨 시작 위치로
+    return bytes(out)
+
+
+# ==========================================
+# 📡 네트워크 프린터로 직접 전송 (RAW 9100 포트)
+# ==========================================
+def send_raw(host, payload, port=RAW_PORT, timeout=5):
+    with socket.create_connection((host, int(port)), timeout=timeout) as sock:
+        sock.sendall(payload)
+    return len(payload)
@@ -0,0 +1,134 @@
+# 파일명: publish.py
+# ==========================================
+# 🚀 작업 지시 일괄 발행 (관리자 "최종 발행 및 저장")
+#   1) LOT 행을 한 번에 미리 계산
+#   2) 원단 차감은 consume_fabric RPC 1회로 원자적으로 처리
+#   3) work_orders 는 묶음(chunk) 단위 bulk insert
+# ==========================================
+
+PROD_MAP = {"스마트글라스": "G", "접합필름": "F", "PDLC원단": "P", "일반유리": "N"}
+
+# 한 번의 insert 요청에 담을 최대 행 수 (요청 본문이 너무 커지지 않도록)
+INSERT_CHUNK = 200
+
+
+def is_registered_fabric(lot):
+    return bool(lot) and "직접 입력" not in lot and lot != "미등록 원단"
+
+
+def build_work_order_rows(order_list, date_str):
+    # DB에 넣을 행(rows)과 지시서/라벨 출력용 항목(qrs)을 같은 순서로 생성
+    rows, qrs = [], []
+    cnt = 0
+    for item in order_list:
+        prod_char = PROD_MAP.get(item['제품'], "X")
+        for _ in range(int(item['수량'])):
+            final_lot_id = f"{item['lot_short']}{date_str}{prod_char}{cnt:02d}"
+            cnt = (cnt + 1) % 100
+            rows.append({
+                "lot_no": final_lot_id, "customer": item['고객사'], "product": item['제품'],
+                "dimension": f"{item['규격']} [{item['전극']}]", "spec": item['spec'],
+                "status": "작업대기" if item['is_lam'] else "작업대기(단품)", "note": item['비고'], "fabric_lot_no": item['lot_no']
+            })
+            qrs.append({
+                "lot": final_lot_id, "w": item['w'], "h": item['h'], "elec": item['전극'],
+                "prod": item['제품'], "cust": item['고객사'],
+                "fabric": item['lot_no'], "spec_cut": item['spec_cut'], "spec_lam": item['spec_lam'], "note": item['비고']
+            })
+    return rows, qrs
+
+
+def group_fabric_deductions(order_list):
+    # { 원단 LOT: 차감할 길이(m) } - 같은 원단을 쓰는 작업은 합산
+    usage = {}
+    for item in order_list:
+        lot = item.get('lot_no', '')
+        if not is_registered_fabric(lot):
+            continue
+        try:
+            h_m = float(item.get('h', 0)) / 1000.0
+            qty = float(item.get('수량', 1))
+        except (TypeError, ValueError):
+            continue
+        usage[lot] = usage.get(lot, 0.0) + h_m * qty
+    return usage
+
+
+def _to_float(v):
+    try:
+        return float(v) if v is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# RPC 함수가 아직 DB에 설치되지 않았을 때 PostgREST/Postgres 가 돌려주는 코드
+RPC_MISSING_CODES = ("PGRST202", "42883")
+
+
+def consume_fabric(supabase, usage):
+    # sql/consume_fabric.sql 의 RPC 1회 호출로 원단별 사용량을 원자적으로 차감
+    items = [{"lot_no": lot, "meters": m} for lot, m in usage.items()]
+    res = supabase.rpc("consume_fabric", {"items": items}).execute()
+    return [{
+        "lot": row['lot_no'], "consumed": _to_float(row.get('consumed')),
+        "remaining": _to_float(row.get('remaining')), "error": None
+    } for row in (res.data or [])]
+
+
+def apply_fabric_deductions(supabase, usage):
+    # 반환: [{"lot", "consumed", "remaining", "error"}] (원단별 결과)
+    if not usage:
+        return []
+    try:
+        return consume_fabric(supabase, usage)
+    except Exception as e:
+        # RPC 미설치일 때만 기존 방식으로 대체 (그 외 오류에서 재시도하면 이중 차감 위험)
+        if getattr(e, 'code', None) not in RPC_MISSING_CODES:
+            return [{"lot": lot, "consumed": m, "remaining": None, "error": str(e)} for lot, m in usage.items()]
+    return _apply_fabric_deductions_rmw(supabase, usage)
+
+
+def _apply_fabric_deductions_rmw(supabase, usage):
+    # [구버전 DB용] 원단 전체를 in_ 으로 1회 조회한 뒤, 원단별로 1회씩 갱신
+    # ※ 읽고-계산하고-쓰는 방식이라 동시 발행 시 차감분이 유실될 수 있음
+    results = []
+    try:
+        res = supabase.table("fabric_stock").select("lot_no, used_len, total_len").in_("lot_no", list(usage)).execute()
+        stock = {row['lot_no']: row for row in res.data}
+    except Exception as e:
+        return [{"lot": lot, "consumed": m, "remaining": None, "error": str(e)} for lot, m in usage.items()]
+
+    for lot, consumed in usage.items():
+        row = stock.get(lot)
+        if row is None:  # 재고 테이블에 없는 원단(직접 입력 등)은 차감하지 않음
+            continue
+
+        new_used = _to_float(row.get('used_len')) + consumed
+        remaining = _to_float(row.get('total_len')) - new_used
+        try:
+            up_res = supabase.table("fabric_stock").update({"used_len": new_used}).eq("lot_no", lot).execute()
+            error = None if up_res.data else "갱신된 행 없음"
+        except Exception as e:
+            error = str(e)
+        results.append({"lot": lot, "consumed": consumed, "remaining": remaining, "error": error})
+    return results
+
+
+def insert_work_orders(supabase, rows, chunk_size=INSERT_CHUNK):
+    # 묶음 단위 bulk insert. 묶음이 실패하면 해당 묶음만 행 단위로 재시도해서
+    # 실패한 LOT만 골라낸다 (나머지 발행은 계속 진행).
+    # 반환: (성공 LOT 목록, [(실패 LOT, 에러 메시지)])
+    inserted, failures = [], []
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        try:
+            supabase.table("work_orders").insert(chunk).execute()
+            inserted.extend(r['lot_no'] for r in chunk)
+        except Exception:
+            for row in chunk:
+                try:
+                    supabase.table("work_orders").insert(row).execute()
+                    inserted.append(row['lot_no'])
+                except Exception as e:
+                    failures.append((row['lot_no'], str(e)))
+    return inserted, failures
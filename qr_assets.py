@@ -0,0 +1,171 @@
+# 파일명: qr_assets.py
+# ==========================================
+# 🔳 QR 이미지 캐시 (LOT 문자열 + 크기 기준)
+#   * 1차: 메모리 LRU (서버 프로세스 공용)
+#   * 2차: 디스크 저장소 (QR_CACHE_DIR) - 서버 재시작 후에도 재사용
+#   → 400장 라벨 재생성 / 옛 LOT 재발행 시 QR 인코딩+PNG 압축 없이 조회만 함
+#   * HTML 문서용 SVG(벡터) QR 도 같은 방식으로 캐시 (인쇄 시 선명 - 크기는 base64 PNG 보다 큼)
+#   * 프린터 명령어용 QR 크기(모듈 수)는 버전만 계산해서 캐시 (QR 그림은 안 만듦)
+# ==========================================
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import qrcode
+from PIL import Image
+
+QR_CACHE_DIR = os.environ.get("BT_QR_CACHE_DIR", ".qr_cache")
+MEMORY_ITEMS = 4096
+
+_mem = OrderedDict()  # key -> PNG bytes
+_svg_mem = OrderedDict()  # key -> SVG 문자열
+_modules_mem = OrderedDict()  # QR 문자열 -> 한 변 모듈 수
+_lock = threading.Lock()
+
+
+def _cache_key(data, box_size, border, size):
+    raw = f"{box_size}|{border}|{size or 0}|{data}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _encode_png(data, box_size, border, size):
+    qr = qrcode.QRCode(box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white").get_image()
+    if size:
+        img = img.resize((size, size))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _remember(key, png):
+    with _lock:
+        _mem[key] = png
+        _mem.move_to_end(key)
+        while len(_mem) > MEMORY_ITEMS:
+            _mem.popitem(last=False)
+
+
+def _disk_path(key):
+    return os.path.join(QR_CACHE_DIR, key[:2], f"{key}.png")
+
+
+def get_qr_png(data, box_size=5, border=0, size=None):
+    key = _cache_key(data, box_size, border, size)
+    with _lock:
+        png = _mem.get(key)
+        if png is not None:
+            _mem.move_to_end(key)
+            return png
+
+    path = _disk_path(key)
+    try:
+        with open(path, "rb") as f:
+            png = f.read()
+    except OSError:
+        png = None
+
+    if png is None:
+        png = _encode_png(data, box_size, border, size)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(png)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # 디스크 저장 실패해도 메모리 캐시로는 동작
+
+    _remember(key, png)
+    return png
+
+
+def has_qr_png(data, box_size=5, border=0, size=None):
+    # 메모리 캐시에 있는지만 확인 (병렬 생성 대상 선별용)
+    with _lock:
+        return _cache_key(data, box_size, border, size) in _mem
+
+
+def store_qr_png(data, png, box_size=5, border=0, size=None):
+    # 다른 프로세스(병렬 렌더링)에서 만든 PNG 를 메모리 캐시에 등록
+    _remember(_cache_key(data, box_size, border, size), png)
+
+
+def get_qr_image(data, box_size=5, border=0, size=None):
+    img = Image.open(io.BytesIO(get_qr_png(data, box_size, border, size)))
+    img.load()
+    return img
+
+
+def get_qr_base64(data, box_size=5, border=0, size=None):
+    return base64.b64encode(get_qr_png(data, box_size, border, size)).decode()
+
+
+def qr_modules(data, border=0):
+    # QR 한 변의 모듈 수 - best_fit 으로 버전만 구함 (make() 의 행렬 생성/마스크 선택 생략)
+    with _lock:
+        n = _modules_mem.get(data)
+        if n is not None:
+            _modules_mem.move_to_end(data)
+            return n + border * 2
+    qr = qrcode.QRCode(border=0)
+    qr.add_data(data)
+    n = qr.best_fit() * 4 + 17
+    with _lock:
+        _modules_mem[data] = n
+        while len(_modules_mem) > MEMORY_ITEMS:
+            _modules_mem.popitem(last=False)
+    return n + border * 2
+
+
+def lot_qr_data(lot):
+    # 지시서/라벨 QR 에는 LOT 번호에서 '-' 를 뺀 값을 넣음
+    return str(lot).replace("-", "")
+
+
+def _encode_svg(data, border):
+    # 검은 모듈을 가로 줄 단위 선(stroke)으로 묶어 path 하나로 표현
+    # (HTML 안에 바로 넣는 용도라 xmlns/배경 사각형은 생략)
+    qr = qrcode.QRCode(border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    n = len(matrix)
+    d = []
+    for y, row in enumerate(matrix):
+        x, pen = 0, None
+        while x < n:
+            if row[x]:
+                start = x
+                while x < n and row[x]:
+                    x += 1
+                if pen is None:
+                    d.append(f"M{start} {y}.5h{x - start}")
+                else:
+                    d.append(f"m{start - pen} 0h{x - start}")
+                pen = x
+            else:
+                x += 1
+    return (f'<svg viewBox="0 0 {n} {n}" shape-rendering="crispEdges">'
+            f'<path stroke="#000" d="{"".join(d)}"/></svg>')
+
+
+def get_qr_svg(data, border=0):
+    key = _cache_key(data, "svg", border, None)
+    with _lock:
+        svg = _svg_mem.get(key)
+        if svg is not None:
+            _svg_mem.move_to_end(key)
+            return svg
+    svg = _encode_svg(data, border)
+    with _lock:
+        _svg_mem[key] = svg
+        while len(_svg_mem) > MEMORY_ITEMS:
+            _svg_mem.popitem(last=False)
+    return svg
+
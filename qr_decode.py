@@ -0,0 +1,307 @@
+# 파일명: qr_decode.py
+# ==========================================
+# 📷 작업자 카메라 QR 인식 엔진 (pages/Worker.py)
+#   * QR 검출기는 스레드(세션 실행 스레드)마다 1개 만들어 재사용 - 예전처럼 스캔마다 새로 만들지 않음
+#   * 큰 사진은 JPEG 를 축소 디코딩(IMREAD_REDUCED_GRAYSCALE_2/4/8)해서 먼저 시도
+#     → JPEG 디코딩 자체가 빨라지고, 작은 이미지라 검출도 빠름 (대부분 여기서 끝남)
+#   * 실패할 때만 단계별로 더 비싼 방법을 시도 (앞 단계에서 성공하면 뒤 단계는 안 함)
+#       reduced   : 축소 이미지 (긴 변 800px 이상 유지)
+#       full      : 원본 해상도 흑백
+#       roi       : 위치는 찾았는데 해독을 못 했으면 그 주변만 잘라서 확대
+#       clahe     : 대비 보정 (어두운 사진 / 반사광)
+#       threshold : 적응형 이진화 (조명 얼룩)
+#       upscale   : 2배 확대 (멀리서 찍어 QR 이 작을 때)
+#       rotate    : 45도 회전
+#   * 최근 인식 결과로 중앙값 시간 / 첫 시도 성공률 집계 (서버 프로세스 공용, 1장 스캔만)
+#   * 일괄 스캔(decode_qr_multi): 사진 1장에서 QR 여러 개를 한 번에
+#       - 위치는 축소 이미지(긴 변 1600px 이상)에서 한 번에 찾고, 읽기는 QR 마다 원본에서 잘라서
+#       - detectAndDecodeMulti 는 QR 이 많으면 수 초~수십 초 걸려서 위치 찾기/읽기를 나눔
+#
+#   res = decode_qr(img_file.getvalue())
+#   res.text, res.step, res.attempts, res.ms
+#   res = decode_qr_multi(img_file.getvalue())  → res.texts (중복 없음), res.missed (찾았지만 못 읽은 수)
+#   decode_stats()  → {"count", "median_ms", "p90_ms", "success_rate", "first_try_rate"}
+# ==========================================
+import io
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+REDUCE_TARGET = 800      # 축소 디코딩 후에도 긴 변이 이 크기 이상 되도록
+MULTI_REDUCE_TARGET = 1600   # 일괄 스캔은 QR 하나하나가 작아서 덜 줄임
+UPSCALE_MAX = 1600       # 이보다 큰 이미지는 2배 확대 단계 생략
+ROI_MIN = 600            # 잘라낸 QR 주변 영역을 최소 이 크기로 확대
+STATS_SIZE = 500         # 통계에 쓰는 최근 인식 건수
+
+_REDUCED = {2: cv2.IMREAD_REDUCED_GRAYSCALE_2, 4: cv2.IMREAD_REDUCED_GRAYSCALE_4, 8: cv2.IMREAD_REDUCED_GRAYSCALE_8}
+
+_local = threading.local()
+_stats = deque(maxlen=STATS_SIZE)   # (ms, 성공 여부, 시도 횟수)
+_stats_lock = threading.Lock()
+
+
+class DecodeResult:
+    def __init__(self, text, step, attempts, ms, points=None, texts=None, missed=0):
+        self.text = text            # 인식한 문자열 (실패하면 None)
+        self.texts = texts if texts is not None else ([text] if text else [])   # 일괄 스캔: 인식한 문자열 전부
+        self.step = step            # 성공한 단계 이름
+        self.attempts = attempts    # 시도한 단계 이름 목록
+        self.ms = ms
+        self.points = points        # 원본 좌표 기준 QR 꼭짓점 (없으면 None)
+        self.missed = missed        # 일괄 스캔: 위치는 찾았는데 못 읽은 QR 수
+
+
+def _detector():
+    # OpenCV 검출기는 스레드 간 공유하면 안전하지 않아서 스레드마다 1개
+    det = getattr(_local, "detector", None)
+    if det is None:
+        det = _local.detector = cv2.QRCodeDetector()
+    return det
+
+
+def _clahe():
+    c = getattr(_local, "clahe", None)
+    if c is None:
+        c = _local.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    return c
+
+
+def image_size(image_bytes):
+    # (가로, 세로) - 헤더만 읽음 (픽셀 디코딩 없음)
+    try:
+        from PIL import Image
+        return Image.open(io.BytesIO(image_bytes)).size
+    except Exception:
+        return None
+
+
+def reduce_factor(size, target=REDUCE_TARGET):
+    if not size:
+        return 1
+    long_side = max(size)
+    for f in (8, 4, 2):
+        if long_side // f >= target:
+            return f
+    return 1
+
+
+def _try(det, img):
+    if img is None or img.size == 0:
+        return None, None
+    try:
+        text, points, _ = det.detectAndDecode(img)
+    except cv2.error:
+        return None, None
+    return (text or None), points
+
+
+def _aruco():
+    # OpenCV 4.8+ 에만 있음 → 없으면 None (기본 검출기만 사용)
+    if not hasattr(cv2, "QRCodeDetectorAruco"):
+        return None
+    det = getattr(_local, "aruco", None)
+    if det is None:
+        det = _local.aruco = cv2.QRCodeDetectorAruco()
+    return det
+
+
+def _detect_multi(det, img):
+    if img is None or img.size == 0:
+        return []
+    try:
+        ok, points = det.detectMulti(img)
+    except cv2.error:
+        return []
+    return list(points) if ok and points is not None else []
+
+
+def _decode_at(det, img, points):
+    # 꼭짓점을 알려주고 읽기만 (검출 단계 생략)
+    try:
+        text, _ = det.decode(img, points)
+    except cv2.error:
+        return None
+    return text or None
+
+
+def _crop(gray, pts):
+    # 꼭짓점 주변(여백 25%)을 잘라서 확대 → (잘라낸 이미지, 잘라낸 이미지 기준 꼭짓점)
+    pts = pts.reshape(-1, 2)
+    x0, y0 = pts.min(axis=0)
+    x1, y1 = pts.max(axis=0)
+    mx, my = (x1 - x0) * 0.25 + 10, (y1 - y0) * 0.25 + 10
+    h, w = gray.shape[:2]
+    x0, y0 = int(max(0, x0 - mx)), int(max(0, y0 - my))
+    x1, y1 = int(min(w, x1 + mx)), int(min(h, y1 + my))
+    crop = gray[y0:y1, x0:x1]
+    if crop.size == 0:
+        return crop, None
+    scale = max(1.0, ROI_MIN / max(crop.shape[:2]))
+    if scale > 1:
+        crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    return crop, ((pts - [x0, y0]) * scale).astype(np.float32).reshape(1, -1, 2)
+
+
+def _roi(gray, hint):
+    # 찾은 QR 위치 주변만 잘라서 확대
+    if hint is None:
+        return None
+    crop, _ = _crop(gray, hint)
+    return crop if crop.size else None
+
+
+def _upscale(gray):
+    if max(gray.shape[:2]) > UPSCALE_MAX:
+        return None
+    return cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+
+
+def _rotate(gray, angle):
+    h, w = gray.shape[:2]
+    m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    cos, sin = abs(m[0, 0]), abs(m[0, 1])
+    nw, nh = int(h * sin + w * cos), int(h * cos + w * sin)
+    m[0, 2] += nw / 2 - w / 2
+    m[1, 2] += nh / 2 - h / 2
+    return cv2.warpAffine(gray, m, (nw, nh), borderValue=255)
+
+
+def decode_qr(image_bytes):
+    t0 = time.perf_counter()
+    if not image_bytes:
+        return _empty(t0)
+    det = _detector()
+    buf = np.frombuffer(image_bytes, np.uint8)
+    factor = reduce_factor(image_size(image_bytes))
+
+    state = {"full": None, "hint": None}
+
+    def full():
+        if state["full"] is None:
+            state["full"] = cv2.imdecode(buf, cv2.IMREAD_GRAYSCALE)
+        return state["full"]
+
+    # (단계 이름, 이미지 만드는 함수, 검출 좌표 → 원본 좌표 배율 / None 이면 좌표 안 씀)
+    steps = []
+    if factor > 1:
+        steps.append(("reduced", lambda: cv2.imdecode(buf, _REDUCED[factor]), factor))
+    steps += [
+        ("full", full, 1),
+        ("roi", lambda: _roi(full(), state["hint"]), None),
+        ("clahe", lambda: _clahe().apply(full()), 1),
+        ("threshold", lambda: cv2.adaptiveThreshold(full(), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5), 1),
+        ("upscale", lambda: _upscale(full()), 0.5),
+        ("rotate", lambda: _rotate(full(), 45), None),
+    ]
+
+    attempts = []
+    text = step = points = None
+    for name, make, scale in steps:
+        if name == "full" and full() is None:
+            # 이미지로 못 읽는 파일(깨진 업로드 등) → 뒤 단계는 모두 원본이 필요하므로 바로 끝
+            return _empty(t0)
+        if name == "roi" and state["hint"] is None:
+            continue
+        img = make()
+        if img is None:
+            continue
+        attempts.append(name)
+        text, pts = _try(det, img)
+        if pts is not None and scale is not None:
+            pts = pts * scale
+            if state["hint"] is None:
+                state["hint"] = pts
+        if text:
+            step, points = name, pts if scale is not None else state["hint"]
+            break
+
+    ms = (time.perf_counter() - t0) * 1000
+    _record(ms, text is not None, len(attempts))
+    return DecodeResult(text, step, attempts, ms, points)
+
+
+def decode_qr_multi(image_bytes):
+    # 사진 1장 안의 QR 전부
+    #   1) 위치 찾기: 축소 이미지에서 ArUco 기반 검출기(빠르고 여러 개를 잘 찾음) → 못 찾으면 기본 검출기
+    #   2) 읽기: 찾은 위치마다 원본 해상도에서 잘라서 1개씩 (그대로 → 꼭짓점 지정 → 대비 보정)
+    t0 = time.perf_counter()
+    if not image_bytes:
+        return _empty(t0, multi=True)
+    det = _detector()
+    buf = np.frombuffer(image_bytes, np.uint8)
+    full = cv2.imdecode(buf, cv2.IMREAD_GRAYSCALE)
+    if full is None:
+        return _empty(t0, multi=True)
+    factor = reduce_factor(image_size(image_bytes), MULTI_REDUCE_TARGET)
+
+    passes = []
+    if factor > 1:
+        passes.append(("reduced", lambda: cv2.imdecode(buf, _REDUCED[factor]), factor))
+    passes.append(("full", lambda: full, 1))
+
+    attempts = []
+    quads = []
+    for name, make, scale in passes:
+        img = make()
+        for det_name, finder in (("aruco", _aruco()), ("classic", det)):
+            if finder is None:
+                continue
+            attempts.append(f"{name}/{det_name}")
+            quads = [q * scale for q in _detect_multi(finder, img)]
+            if quads:
+                break
+        if quads:
+            break
+
+    found = {}   # 문자열 → 원본 좌표 꼭짓점
+    missed = 0
+    for q in quads:
+        crop, local = _crop(full, q)
+        text = None
+        for img in ((crop, _clahe().apply(crop)) if crop.size else ()):
+            text, _ = _try(det, img)
+            if not text:
+                text = _decode_at(det, img, local)
+            if text:
+                break
+        if text:
+            found.setdefault(text, q)
+        else:
+            missed += 1
+
+    ms = (time.perf_counter() - t0) * 1000
+    texts = list(found)
+    return DecodeResult(texts[0] if texts else None, attempts[-1] if quads else None, attempts, ms,
+                        list(found.values()), texts, missed)
+
+
+def _empty(t0, multi=False):
+    # 빈 파일 / 이미지로 못 읽는 파일 → 시도 없이 실패 결과
+    ms = (time.perf_counter() - t0) * 1000
+    if multi:
+        return DecodeResult(None, None, [], ms, [], [], 0)
+    _record(ms, False, 0)
+    return DecodeResult(None, None, [], ms)
+
+
+def _record(ms, ok, n_attempts):
+    with _stats_lock:
+        _stats.append((ms, ok, n_attempts))
+
+
+def decode_stats():
+    with _stats_lock:
+        rows = list(_stats)
+    if not rows:
+        return {"count": 0, "median_ms": 0.0, "p90_ms": 0.0, "success_rate": 0.0, "first_try_rate": 0.0}
+    ms = np.array([r[0] for r in rows])
+    return {
+        "count": len(rows),
+        "median_ms": float(np.median(ms)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "success_rate": sum(r[1] for r in rows) / len(rows),
+        "first_try_rate": sum(1 for r in rows if r[1] and r[2] == 1) / len(rows),
+    }
@@ -0,0 +1,269 @@
+# 파일명: scan_queue.py
+# ==========================================
+# 📮 작업자 스캔 저장 대기열 (현장 Wi-Fi 끊김 대비)
+#   * 저장 버튼 → 앱 서버의 SQLite 파일(BT_SCAN_QUEUE_PATH)에 바로 기록하고 끝 (네트워크 안 기다림)
+#     → 작업자는 바로 다음 제품 스캔
+#   * 백그라운드 전송 스레드 1개가 오래된 스캔부터 묶음(BT_SCAN_QUEUE_BATCH)으로 record_scans RPC 1번에 보냄
+#     - 실패하면 2초 → 4초 → … 최대 60초 간격으로 재시도 (스캔은 버리지 않음, 순서도 유지)
+#     - 서버가 묶음을 거부(오류 코드)하면 반씩 나눠 다시 보내서 문제 스캔 1건을 찾음
+#       → 그 앞 스캔은 저장되고, 문제 스캔만 거부 횟수를 셈
+#     - 스캔마다 고유 키 → 응답만 끊겨서 다시 보내도 DB 에 두 번 기록되지 않음 (sql/record_scans.sql)
+#     - record_scans 가 없는 DB 는 스캔마다 work_steps.record_step 으로 보냄 (키 중복 확인 없음)
+#   * 상태: pending(전송 대기) → synced(저장됨) / rejected(서버 확인에서 전부 제외 - 미등록/불량/이미 완료)
+#           failed: 서버가 같은 스캔을 MAX_ATTEMPTS 번 거부 → 뒤 스캔이 막히지 않도록 빼 둠 (파일에는 남음)
+#           (연결 끊김 / 시간 초과 같은 일시적 오류는 거부로 세지 않음 - attempts = 서버 거부 횟수)
+#   * 서버를 다시 켜도 파일에 남은 대기 스캔부터 이어서 보냄
+#
+#   queue = ScanQueue(QUEUE_PATH, supabase).start()
+#   key, added = queue.add(session, lots, step, level, data, worker, defect_type=None, source=img_file.file_id)
+#   queue.session_items(session) / queue.counts(session) / queue.pending_status() / queue.status()
+# ==========================================
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+from db_cache import invalidate
+from work_steps import RPC_MISSING_CODES, next_status, record_step
+
+ENABLED = os.environ.get("BT_SCAN_QUEUE", "1") != "0"
+QUEUE_PATH = os.environ.get("BT_SCAN_QUEUE_PATH", ".scan_queue.sqlite3")
+BATCH = int(os.environ.get("BT_SCAN_QUEUE_BATCH", "50"))
+RETRY_MIN_SEC = 2.0
+RETRY_MAX_SEC = 60.0
+MAX_ATTEMPTS = 5       # 서버가 같은 스캔을 거부(오류 코드)한 횟수 - 연결 끊김/일시적 오류는 무한 재시도
+IDLE_SEC = 5.0         # 보낼 스캔이 없을 때 확인 간격
+KEEP_DAYS = 7          # 전송 끝난 스캔 보관 기간 (화면 표시용)
+
+# 오류 코드가 있어도 스캔 내용과 상관없는 일시적 오류 (연결 끊김처럼 취급)
+#   57014 시간 초과 / 40001·40P01 동시 실행 충돌 / 08xxx 연결 / 53xxx 자원 부족 / 57P01~03 DB 재시작
+#   PGRST000~003 PostgREST ↔ DB 연결 문제
+TRANSIENT_CODES = ("57014", "40001", "40P01", "PGRST000", "PGRST001", "PGRST002", "PGRST003")
+TRANSIENT_PREFIXES = ("08", "53", "57P")
+
+_SCHEMA = """
+create table if not exists scans (
+    key         text primary key,
+    session     text not null,
+    payload     text not null,
+    lots        text not null,
+    step        text not null,
+    state       text not null default 'pending',
+    attempts    integer not null default 0,
+    error       text,
+    results     text,
+    created_at  real not null,
+    synced_at   real
+);
+create index if not exists scans_state_created_idx on scans (state, created_at);
+create index if not exists scans_session_created_idx on scans (session, created_at);
+"""
+
+
+def is_rejection(e):
+    # 서버가 이 스캔(묶음)을 거부했는지 - 오류 코드 없음(네트워크) / 일시적 오류면 False
+    code = str(getattr(e, 'code', None) or "")
+    if not code:
+        return False
+    return code not in TRANSIENT_CODES and not code.startswith(TRANSIENT_PREFIXES)
+
+
+def make_key(session, source, lots, step, defect_type):
+    # 같은 사진으로 같은 공정 저장을 두 번 눌러도 1건 / source 가 없으면 매번 새 키
+    if source is None:
+        return uuid.uuid4().hex
+    raw = json.dumps([session, str(source), sorted(lots), step, defect_type], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ScanQueue:
+    def __init__(self, path, supabase):
+        self.path = path
+        self.supabase = supabase
+        self.rpc_ok = True
+        self.last_error = None
+        self.last_sync = None      # time.time()
+        self._fails = 0            # 연속 전송 실패 횟수 (재시도 간격 계산)
+        self._retry_at = 0.0
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._prune()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="scan-queue", daemon=True)
+                self._thread.start()
+        return self
+
+    # ------------------------------------------
+    # 📥 화면 쪽 (세션 스레드)
+    # ------------------------------------------
+    def add(self, session, lots, step, level, data="-", worker=None, defect_type=None, source=None):
+        # 반환: (키, 새로 들어갔는지) - 같은 키가 이미 있으면 False
+        lots = list(dict.fromkeys(lots))
+        key = make_key(session, source, lots, step, defect_type)
+        item = {"key": key, "lots": lots, "step": step, "new_status": next_status(step, defect_type), "level": level,
+                "data": data, "worker": worker, "defect_type": defect_type}
+        with self._lock:
+            cur = self._db.execute(
+                "insert or ignore into scans (key, session, payload, lots, step, created_at) values (?, ?, ?, ?, ?, ?)",
+                (key, session, json.dumps(item, ensure_ascii=False), json.dumps(lots, ensure_ascii=False), step, time.time()))
+        self._wake.set()
+        return key, cur.rowcount == 1
+
+    def session_items(self, session, limit=20):
+        with self._lock:
+            rows = self._db.execute(
+                "select key, lots, step, state, attempts, error, results, created_at from scans"
+                " where session = ? order by created_at desc limit ?", (session, limit)).fetchall()
+        return [{"key": k, "lots": json.loads(lots), "step": step, "state": state, "attempts": attempts, "error": error,
+                 "results": json.loads(results) if results else None, "created_at": created_at}
+                for k, lots, step, state, attempts, error, results, created_at in rows]
+
+    def counts(self, session=None):
+        sql = "select state, count(*) from scans" + (" where session = ?" if session is not None else "") + " group by state"
+        with self._lock:
+            rows = self._db.execute(sql, (session,) if session is not None else ()).fetchall()
+        out = {"pending": 0, "synced": 0, "rejected": 0, "failed": 0}
+        out.update(dict(rows))
+        return out
+
+    def pending_status(self):
+        # {LOT: 전송 대기 중인 마지막 스캔이 반영되면 될 상태} - DB 상태보다 앞선 값 (중복 스캔 확인용)
+        with self._lock:
+            rows = self._db.execute("select payload from scans where state = 'pending' order by created_at").fetchall()
+        out = {}
+        for (payload,) in rows:
+            item = json.loads(payload)
+            for lot in item['lots']:
+                out[lot] = item['new_status']
+        return out
+
+    def status(self):
+        return {"last_error": self.last_error, "last_sync": self.last_sync,
+                "retry_in": max(0.0, self._retry_at - time.time()) if self.last_error else 0.0}
+
+    # ------------------------------------------
+    # 📤 전송 스레드
+    # ------------------------------------------
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                wait = self.flush()
+            except Exception as e:
+                self.last_error = str(e)
+                wait = RETRY_MIN_SEC
+            if wait > 0:
+                self._wake.wait(wait)
+
+    def flush(self):
+        # 묶음 1개 전송 / 반환: 다음 전송까지 기다릴 초 (0 = 바로 다음 묶음)
+        now = time.time()
+        if now < self._retry_at:
+            return self._retry_at - now
+        with self._lock:
+            rows = self._db.execute(
+                "select key, payload, attempts from scans where state = 'pending' order by created_at limit ?", (BATCH,)).fetchall()
+        if not rows:
+            return IDLE_SEC
+        items = [json.loads(p) for _, p, _ in rows]
+
+        results, error, bad = self._send_ordered(items)
+        if results:
+            self._mark_done(results, {it['key']: it for it in items})
+        if error is None:
+            self._fails = 0
+            self._retry_at = 0.0
+            self.last_error = None
+            self.last_sync = time.time()
+            return 0 if len(rows) == BATCH else IDLE_SEC
+
+        # 실패: 남은 스캔은 그대로 두고 전체 재시도 간격을 늘림 (앞 스캔이 먼저 들어가야 공정 순서가 맞음)
+        self._fails += 1
+        delay = min(RETRY_MAX_SEC, RETRY_MIN_SEC * 2 ** (self._fails - 1)) * random.uniform(0.8, 1.2)
+        self._retry_at = time.time() + delay
+        self.last_error = str(error)
+        if bad is not None:
+            # 서버가 거부한 스캔만 횟수를 셈 → 계속 거부하면 빼 두고 나머지 진행
+            attempts = {k: a for k, _, a in rows}[bad] + 1
+            state = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+            with self._lock:
+                self._db.execute("update scans set attempts = ?, state = ?, error = ? where key = ?",
+                                 (attempts, state, str(error)[:300], bad))
+            if state == "failed":
+                self._retry_at = 0.0
+                return 0
+        return delay
+
+    def _send_ordered(self, items):
+        # 앞에서부터 보내다가 실패하면 멈춤 / 반환: ({키: 결과}, 오류 또는 None, 서버가 거부한 스캔 키 또는 None)
+        #   * record_scans 는 묶음이 한 트랜잭션 → 스캔 1건이 거부되면 묶음 전체가 안 들어감
+        #     → 반씩 나눠 다시 보내서 문제 스캔을 찾음 (앞쪽 반이 성공해야 뒤쪽 반을 보냄 - 순서 유지)
+        #   * 스캔마다 보내는 대체 경로는 이미 들어간 스캔 결과가 있음 → 다음 스캔이 문제 스캔
+        results, error = self._send(items)
+        if error is None or not is_rejection(error):
+            return results, error, None
+        if results or len(items) == 1:
+            left = [it['key'] for it in items if it['key'] not in results]
+            return results, error, left[0] if left else None
+        half = len(items) // 2
+        results, error, bad = self._send_ordered(items[:half])
+        if error is not None:
+            return results, error, bad
+        rest, error, bad = self._send_ordered(items[half:])
+        results.update(rest)
+        return results, error, bad
+
+    def _send(self, items):
+        # 반환: ({키: record_step 결과 목록}, 오류 또는 None)
+        if self.rpc_ok:
+            try:
+                data = self.supabase.rpc("record_scans", {"items": items}).execute().data or []
+                return {r['key']: r['results'] for r in data}, None
+            except Exception as e:
+                if getattr(e, 'code', None) not in RPC_MISSING_CODES:
+                    return {}, e
+                self.rpc_ok = False
+        # [구버전 DB용] 스캔마다 record_step - 응답이 끊겼던 스캔은 다시 보내면 '이미 완료'로 돌아올 수 있음
+        out = {}
+        for it in items:
+            try:
+                out[it['key']] = record_step(self.supabase, it['lots'], it['step'], it['level'], it['data'], it['worker'], it['defect_type'])
+            except Exception as e:
+                return out, e
+        return out, None
+
+    def _mark_done(self, results, items):
+        now = time.time()
+        touched = {"production_logs": set(), "defects": set()}
+        with self._lock:
+            for key, res in results.items():
+                res = res or []
+                ok = [r['lot_no'] for r in res if r.get('result') == "ok"]
+                state = "synced" if ok else "rejected"
+                self._db.execute("update scans set state = ?, results = ?, error = null, synced_at = ? where key = ?",
+                                 (state, json.dumps(res, ensure_ascii=False), now, key))
+                item = items.get(key)
+                if item and ok:
+                    touched["defects" if item['defect_type'] else "production_logs"].update(ok)
+        lots = touched["production_logs"] | touched["defects"]
+        for table, t_lots in touched.items():
+            if t_lots:
+                invalidate(table, lots=list(t_lots))
+        if lots:
+            invalidate("work_orders", lots=list(lots))
+
+    def _prune(self):
+        with self._lock:
+            self._db.execute("delete from scans where state in ('synced', 'rejected') and created_at < ?",
+                             (time.time() - KEEP_DAYS * 86400,))
@@ -0,0 +1,36 @@
+-- 파일명: sql/consume_fabric.sql
+-- ==========================================
+-- 🧵 원단 사용량 원자적 차감 (Supabase SQL Editor 에서 1회 실행)
+--   * 여러 (원단 LOT, 사용 길이 m) 를 한 번의 RPC 호출로 차감
+--   * used_len = used_len + meters 를 DB 안에서 계산하므로
+--     관리자 두 명이 동시에 발행해도 차감분이 사라지지 않음
+--   * 호출: supabase.rpc("consume_fabric", {"items": [{"lot_no": "...", "meters": 1.2}, ...]})
+-- ==========================================
+
+create or replace function public.consume_fabric(items jsonb)
+returns table (
+    lot_no    text,
+    consumed  double precision,
+    used_len  double precision,
+    total_len double precision,
+    remaining double precision
+)
+language sql
+as $$
+    with req as (
+        select x.lot_no, sum(x.meters) as meters
+          from jsonb_to_recordset(items) as x(lot_no text, meters double precision)
+         group by x.lot_no
+    )
+    update public.fabric_stock f
+       set used_len = coalesce(f.used_len, 0) + req.meters
+      from req
+     where f.lot_no = req.lot_no
+    returning f.lot_no::text,
+              req.meters,
+              f.used_len::double precision,
+              f.total_len::double precision,
+              (coalesce(f.total_len, 0) - f.used_len)::double precision;
+$$;
+
+grant execute on function public.consume_fabric(jsonb) to anon, authenticated;
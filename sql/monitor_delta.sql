@@ -0,0 +1,35 @@
+-- 파일명: sql/monitor_delta.sql
+-- ==========================================
+-- 🖥️ 모니터 증분 조회용 변경 시각 컬럼 (Supabase SQL Editor 에서 1회 실행)
+--   * work_orders.updated_at : 행이 추가/수정될 때마다 DB 가 현재 시각으로 갱신
+--   * production_logs 는 추가만 하므로 created_at 을 그대로 기준으로 사용
+--   * 모니터는 "마지막으로 본 시각 이후" 행만 받아감 (monitor_sync.py)
+-- ==========================================
+
+alter table public.work_orders
+    add column if not exists updated_at timestamptz not null default now();
+
+-- 기존 행은 생성 시각으로 맞춰둠 (마이그레이션 시각으로 전부 '변경됨' 처리되지 않도록)
+update public.work_orders
+   set updated_at = created_at
+ where created_at is not null
+   and updated_at > created_at;
+
+create or replace function public.touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    -- now() 는 트랜잭션 시작 시각이라 clock_timestamp() 사용 (늦게 커밋된 행이 과거 시각으로 묻히는 것 방지)
+    new.updated_at := clock_timestamp();
+    return new;
+end;
+$$;
+
+drop trigger if exists work_orders_touch_updated_at on public.work_orders;
+create trigger work_orders_touch_updated_at
+    before update on public.work_orders
+    for each row execute function public.touch_updated_at();
+
+create index if not exists work_orders_updated_at_idx on public.work_orders (updated_at);
+create index if not exists production_logs_created_at_idx on public.production_logs (created_at);
@@ -0,0 +1,60 @@
+-- 파일명: sql/monitor_kpis.sql
+-- ==========================================
+-- 📊 모니터 상단 집계 박스 7개를 DB 에서 계산 (Supabase SQL Editor 에서 1회 실행)
+--   * 최근 100건 표본이 아니라 work_orders 전체 기준 → 작업이 많아도 숫자가 정확
+--   * 모니터는 행 수백 개 대신 (분류, 개수) 7줄만 받음
+--   * 분류 규칙은 monitor_engine.status_bucket 과 같아야 함 (순서 중요)
+--   * 호출: supabase.rpc("monitor_kpis", {"since": None}).execute()
+--          supabase.rpc("monitor_kpis_daily", {"since": "2026-10-01"}).execute()   -- 날짜별
+-- ==========================================
+
+create or replace function public.monitor_bucket(status text)
+returns text
+language sql
+immutable
+as $$
+    select case
+        when status like '%불량%' then null
+        when status like '%완료%' or status like '%출고%' then 'done'
+        when status like '%접합대기%' then 'lam_wait'
+        when status like '%접합%' then 'lam_ing'
+        when status like '%전극%' then 'elec'
+        when status like '%Half%' or status like '%하프%' then 'half'
+        when status like '%Full%' or status like '%풀%' or status like '%원단%' or status like '%Cut%' then 'full'
+        when status like '%대기%' then 'ready'
+        else null
+    end
+$$;
+
+-- since: 이 시각 이후 생성된 작업만 (null = 전체)
+create or replace function public.monitor_kpis(since timestamptz default null)
+returns table (bucket text, cnt bigint)
+language sql
+stable
+as $$
+    select public.monitor_bucket(w.status) as bucket, count(*) as cnt
+      from public.work_orders w
+     where since is null or w.created_at >= since
+     group by 1
+    having public.monitor_bucket(w.status) is not null
+$$;
+
+-- 날짜(한국 시간)별 집계
+create or replace function public.monitor_kpis_daily(since timestamptz default null)
+returns table (day date, bucket text, cnt bigint)
+language sql
+stable
+as $$
+    select (w.created_at at time zone 'Asia/Seoul')::date as day,
+           public.monitor_bucket(w.status) as bucket,
+           count(*) as cnt
+      from public.work_orders w
+     where since is null or w.created_at >= since
+     group by 1, 2
+    having public.monitor_bucket(w.status) is not null
+     order by 1, 2
+$$;
+
+grant execute on function public.monitor_bucket(text) to anon, authenticated;
+grant execute on function public.monitor_kpis(timestamptz) to anon, authenticated;
+grant execute on function public.monitor_kpis_daily(timestamptz) to anon, authenticated;
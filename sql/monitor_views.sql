@@ -0,0 +1,17 @@
+-- 파일명: sql/monitor_views.sql
+-- ==========================================
+-- 🔎 화면별 모니터 보기(공정/고객사/제품/기간)를 DB 에서 거르기 위한 컬럼 (Supabase SQL Editor 에서 1회 실행)
+--   * sql/monitor_kpis.sql 의 monitor_bucket() 이 먼저 있어야 함
+--   * work_orders.bucket : 상태값으로 계산되는 집계 분류 (ready/full/half/elec/lam_wait/lam_ing/done)
+--     → status 가 바뀌면 DB 가 같이 다시 계산 (앱에서 따로 저장할 필요 없음)
+--   * 모니터는 /Monitor?bucket=lam_wait,lam_ing 처럼 보기를 지정하면 bucket=in.(...) 로 해당 행만 받아감
+--     → 이 컬럼이 없으면 예전처럼 받아서 화면 서버에서 거름 (monitor_sync.MonitorView)
+-- ==========================================
+
+alter table public.work_orders
+    add column if not exists bucket text generated always as (public.monitor_bucket(status)) stored;
+
+-- 보기별 최신순 조회 (bucket / customer / product + created_at desc)
+create index if not exists work_orders_bucket_created_idx on public.work_orders (bucket, created_at desc);
+create index if not exists work_orders_customer_created_idx on public.work_orders (customer, created_at desc);
+create index if not exists work_orders_product_created_idx on public.work_orders (product, created_at desc);
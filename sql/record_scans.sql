@@ -0,0 +1,55 @@
+-- 파일명: sql/record_scans.sql
+-- ==========================================
+-- 📮 작업자 스캔 대기열(scan_queue.py) 일괄 전송용 RPC (Supabase SQL Editor 에서 1회 실행)
+--   * sql/record_step.sql 의 record_step() 이 먼저 있어야 함
+--   * 앱 서버가 현장 Wi-Fi 끊김 동안 모아 둔 스캔을 묶음으로 보냄 → 스캔마다 record_step 과 같은 처리
+--   * 스캔마다 고유 키(key)가 있음 - 처리한 키는 scan_receipts 에 결과와 같이 남김
+--     → 응답만 끊겨서 같은 묶음을 다시 보내도 두 번 기록하지 않고 처음 결과를 그대로 돌려줌
+--   * 호출: supabase.rpc("record_scans", {"items": [{"key": "...", "lots": ["A261018G01"], "step": "Half Cut",
+--            "new_status": "Half Cut", "level": 20, "data": "-", "worker": "김반장", "defect_type": null}, ...]}).execute()
+--   * 반환: 스캔마다 (key, results) - results 는 record_step 반환 행 목록(json)
+--   * 오래된 영수증 정리: delete from public.scan_receipts where created_at < now() - interval '30 days';
+-- ==========================================
+
+create table if not exists public.scan_receipts (
+    key        text primary key,
+    results    jsonb not null,
+    created_at timestamptz not null default now()
+);
+
+create or replace function public.record_scans(items jsonb)
+returns table (key text, results jsonb)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+    it  jsonb;
+    res jsonb;
+begin
+    for it in select value from jsonb_array_elements(items) loop
+        -- 같은 키가 동시에 두 번 오면 뒤에 온 쪽이 기다렸다가 영수증을 읽음
+        perform pg_advisory_xact_lock(hashtext(it->>'key'));
+
+        select r.results into res from public.scan_receipts r where r.key = it->>'key';
+        if not found then
+            select coalesce(jsonb_agg(to_jsonb(s)), '[]'::jsonb) into res
+              from public.record_step(
+                       array(select jsonb_array_elements_text(it->'lots')),
+                       it->>'step',
+                       it->>'new_status',
+                       (it->>'level')::int,
+                       coalesce(it->>'data', '-'),
+                       it->>'worker',
+                       it->>'defect_type'
+                   ) as s;
+            insert into public.scan_receipts (key, results) values (it->>'key', res);
+        end if;
+
+        key := it->>'key';
+        results := res;
+        return next;
+    end loop;
+end;
+$$;
+
+grant execute on function public.record_scans(jsonb) to anon, authenticated;
@@ -0,0 +1,87 @@
+-- 파일명: sql/record_step.sql
+-- ==========================================
+-- 👷 작업자 공정 저장을 DB 안에서 한 번에 (Supabase SQL Editor 에서 1회 실행)
+--   * 예전: 상태 조회 → production_logs insert → work_orders.status update (왕복 3번, 트랜잭션 아님)
+--     → 중간에 연결이 끊기면 로그만 있고 상태는 그대로(또는 반대)인 반쪽 저장이 남음
+--   * 지금: RPC 1번 - 행 잠금(for update) → 불량/보류·공정 순서 확인 → 로그(또는 불량 등록) → 상태 변경
+--     이 한 문장(한 트랜잭션) 안에서 처리 → 전부 되거나 전부 안 됨, 두 명이 동시에 저장해도 1번만 기록
+--   * 공정 순서 규칙은 work_steps.STEP_LEVEL / step_level 과 같아야 함 (순서 중요)
+--   * 호출: supabase.rpc("record_step", {"lots": ["A261018G01"], "step": "Half Cut", "new_status": "Half Cut",
+--                                        "level": 20, "data": "S:1.0 / M:2.0 / m:0.5", "worker": "김반장"}).execute()
+--          불량 등록: "defect_type": "이물질", "level": 999 (순서 확인 안 함), data = 상세 내용
+--   * 반환: LOT 마다 (lot_no, prev_status, status, result)
+--          result = ok(저장됨) / missing(미등록) / defect(불량·보류) / done(이미 완료된 공정)
+-- ==========================================
+
+create or replace function public.work_step_level(status text)
+returns int
+language sql
+immutable
+as $$
+    select case
+        when status like '%Full Cut%' then 10
+        when status like '%Half Cut%' then 20
+        when status like '%전극 완료%' then 30
+        when status like '%접합: 1. 준비 완료%' then 41
+        when status like '%접합: 2. 가열 시작%' then 42
+        when status like '%접합: 3. 공정 완료 (End)%' then 43
+        when status like '%📦 출고 완료%' then 50
+        else 0
+    end
+$$;
+
+create or replace function public.record_step(
+    lots        text[],
+    step        text,
+    new_status  text,
+    level       int,
+    data        text default '-',
+    worker      text default null,
+    defect_type text default null
+)
+returns table (lot_no text, prev_status text, status text, result text)
+language sql
+as $$
+    with req as (
+        select distinct x as lot_no from unnest(record_step.lots) as x
+    ),
+    cur as (
+        select w.lot_no, w.status
+          from public.work_orders w
+         where w.lot_no in (select req.lot_no from req)
+           for update
+    ),
+    chk as (
+        select req.lot_no, cur.status as prev_status,
+               case
+                   when cur.lot_no is null then 'missing'
+                   when cur.status like '%불량%' or cur.status like '%보류%' then 'defect'
+                   when public.work_step_level(cur.status) >= record_step.level then 'done'
+                   else 'ok'
+               end as result
+          from req left join cur on cur.lot_no = req.lot_no
+    ),
+    logs as (
+        insert into public.production_logs (lot_no, step, data, worker, result)
+        select chk.lot_no, record_step.step, record_step.data, record_step.worker, 'OK'
+          from chk
+         where chk.result = 'ok' and record_step.defect_type is null
+    ),
+    defects as (
+        insert into public.defects (lot_no, step, defect_type, note, status, worker)
+        select chk.lot_no, record_step.step, record_step.defect_type, record_step.data, '조치대기', record_step.worker
+          from chk
+         where chk.result = 'ok' and record_step.defect_type is not null
+    ),
+    upd as (
+        update public.work_orders w
+           set status = record_step.new_status
+          from chk
+         where w.lot_no = chk.lot_no and chk.result = 'ok'
+        returning w.lot_no, w.status
+    )
+    select chk.lot_no::text, chk.prev_status::text, coalesce(upd.status, chk.prev_status)::text, chk.result
+      from chk left join upd on upd.lot_no = chk.lot_no
+$$;
+
+grant execute on function public.record_step(text[], text, text, int, text, text, text) to anon, authenticated;
@@ -0,0 +1,105 @@
+-- 파일명: sql/work_order_progress.sql
+-- ==========================================
+-- 🧭 작업 지시별 '현재 공정' 요약 컬럼 (Supabase SQL Editor 에서 1회 실행)
+--   * work_orders 에 마지막 공정/시각/공정 단계/작업자/불량 여부를 같이 저장
+--   * production_logs / defects 에 행이 추가되면 같은 트랜잭션 안에서 트리거가 갱신
+--     → 모니터/관리자 화면은 로그를 뒤지지 않고 work_orders 한 번만 읽으면 됨
+--   * 로그 이력으로 언제든 다시 계산 가능: select public.rebuild_work_order_progress();
+--   * 단계 번호는 pages/Worker.py 의 STEP_LEVEL 과 같아야 함
+--   * sql/monitor_delta.sql 이 먼저 적용돼 있으면 갱신 시 updated_at 도 같이 바뀜 (모니터 증분 조회에 반영)
+-- ==========================================
+
+alter table public.work_orders add column if not exists last_step    text;
+alter table public.work_orders add column if not exists last_step_at timestamptz;
+alter table public.work_orders add column if not exists step_level   integer not null default 0;
+alter table public.work_orders add column if not exists last_worker  text;
+alter table public.work_orders add column if not exists has_defect   boolean not null default false;
+
+create index if not exists production_logs_lot_created_idx on public.production_logs (lot_no, created_at desc);
+create index if not exists defects_lot_idx on public.defects (lot_no);
+
+create or replace function public.step_level(step text)
+returns integer
+language sql
+immutable
+as $$
+    select case
+        when step like '%출고%' then 50
+        when step like '접합: 3.%' then 43
+        when step like '접합: 2.%' then 42
+        when step like '접합: 1.%' then 41
+        when step like '%전극%' then 30
+        when step like '%Half%' then 20
+        when step like '%Full%' then 10
+        else 0
+    end
+$$;
+
+-- 로그 1건 추가 → 해당 LOT 요약 갱신 (더 늦은 로그가 이미 반영돼 있으면 무시)
+create or replace function public.apply_production_log()
+returns trigger
+language plpgsql
+as $$
+begin
+    update public.work_orders w
+       set last_step    = new.step,
+           last_step_at = new.created_at,
+           step_level   = public.step_level(new.step),
+           last_worker  = new.worker
+     where w.lot_no = new.lot_no
+       and (w.last_step_at is null or w.last_step_at <= new.created_at);
+    return new;
+end;
+$$;
+
+drop trigger if exists production_logs_apply on public.production_logs;
+create trigger production_logs_apply
+    after insert on public.production_logs
+    for each row execute function public.apply_production_log();
+
+create or replace function public.apply_defect()
+returns trigger
+language plpgsql
+as $$
+begin
+    update public.work_orders set has_defect = true where lot_no = new.lot_no and not has_defect;
+    return new;
+end;
+$$;
+
+drop trigger if exists defects_apply on public.defects;
+create trigger defects_apply
+    after insert on public.defects
+    for each row execute function public.apply_defect();
+
+-- 로그/불량 이력 전체로 요약 컬럼 다시 계산 (최초 적용 시, 또는 수동 수정 후)
+create or replace function public.rebuild_work_order_progress()
+returns integer
+language sql
+as $$
+    with last_log as (
+        select distinct on (lot_no) lot_no, step, created_at, worker
+          from public.production_logs
+         order by lot_no, created_at desc
+    ), changed as (
+        update public.work_orders w
+           set last_step    = l.step,
+               last_step_at = l.created_at,
+               step_level   = coalesce(public.step_level(l.step), 0),
+               last_worker  = l.worker,
+               has_defect   = exists (select 1 from public.defects d where d.lot_no = w.lot_no)
+          from public.work_orders w2
+          left join last_log l on l.lot_no = w2.lot_no
+         where w.lot_no = w2.lot_no
+           and (w.last_step    is distinct from l.step
+             or w.last_step_at is distinct from l.created_at
+             or w.last_worker  is distinct from l.worker
+             or w.has_defect   is distinct from exists (select 1 from public.defects d where d.lot_no = w.lot_no))
+        returning 1
+    )
+    select count(*)::integer from changed
+$$;
+
+grant execute on function public.rebuild_work_order_progress() to authenticated;
+
+select public.rebuild_work_order_progress();
@@ -0,0 +1,100 @@
+# 파일명: work_steps.py
+# ==========================================
+# 👷 작업자 공정 저장 (pages/Worker.py 1장 스캔 / 일괄 스캔 공용)
+#   * 공정 순서 (STEP_LEVEL) 와 저장 가능 여부 판정 (check_lot)
+#   * record_step: sql/record_step.sql 의 RPC 1번으로 확인 + 로그(또는 불량 등록) + 상태 변경을 원자적으로 처리
+#     → RPC 가 아직 DB 에 없으면 예전 방식(조회 → insert → update, 트랜잭션 아님)으로 대체
+#   * 반환: [{"lot_no", "prev_status", "status", "result"}]
+#          result = ok / missing / defect / done (RESULT_TEXT 참고)
+# ==========================================
+
+# 공정 단계 정의 (순서 체크용) - sql/record_step.sql 의 work_step_level 과 같아야 함
+STEP_LEVEL = {
+    "Full Cut": 10,
+    "Half Cut": 20,
+    "전극 완료": 30,
+    "접합: 1. 준비 완료": 41,
+    "접합: 2. 가열 시작": 42,
+    "접합: 3. 공정 완료 (End)": 43,
+    "📦 출고 완료": 50
+}
+
+# 불량 등록은 순서 확인 안 함
+DEFECT_LEVEL = 999
+
+RESULT_TEXT = {
+    "ok": "✅ 등록",
+    "missing": "❌ 미등록 LOT",
+    "defect": "⛔ 불량/보류",
+    "done": "⚠️ 이미 완료된 공정",
+}
+
+# RPC 함수가 아직 DB에 설치되지 않았을 때 PostgREST/Postgres 가 돌려주는 코드
+RPC_MISSING_CODES = ("PGRST202", "42883")
+
+
+def step_level(status):
+    for key, val in STEP_LEVEL.items():
+        if key in status: return val
+    return 0
+
+
+def check_lot(prev_status, level):
+    # prev_status: 현재 DB 상태 (없으면 None = 미등록)
+    if prev_status is None:
+        return "missing"
+    if "불량" in prev_status or "보류" in prev_status:
+        return "defect"
+    if step_level(prev_status) >= level:
+        return "done"
+    return "ok"
+
+
+def next_status(step, defect_type=None):
+    # 불량 등록이면 '⛔ 불량(유형)', 출고 완료 시 DB 상태는 '출고'
+    if defect_type:
+        return f"⛔ 불량({defect_type})"
+    return "출고" if "출고" in step else step
+
+
+def record_step(supabase, lots, step, level, data="-", worker=None, defect_type=None):
+    # lots: LOT 목록 (1장 스캔이면 1개) / defect_type 을 주면 불량 등록 (level 은 DEFECT_LEVEL)
+    new_status = next_status(step, defect_type)
+    params = {"lots": list(lots), "step": step, "new_status": new_status, "level": level,
+              "data": data, "worker": worker, "defect_type": defect_type}
+    try:
+        return supabase.rpc("record_step", params).execute().data or []
+    except Exception as e:
+        # RPC 미설치일 때만 예전 방식으로 대체 (그 외 오류에서 다시 쓰면 이중 기록 위험)
+        if getattr(e, 'code', None) not in RPC_MISSING_CODES:
+            raise
+    return _record_step_legacy(supabase, **params)
+
+
+def _record_step_legacy(supabase, lots, step, new_status, level, data, worker, defect_type):
+    # [구버전 DB용] 조회 1번 → 로그(불량) bulk insert 1번 → 상태 update 1번
+    # ※ 트랜잭션이 아니라서 중간에 끊기면 반쪽 저장이 남을 수 있음
+    lots = list(dict.fromkeys(lots))
+    rows = supabase.table("work_orders").select("lot_no, status").in_("lot_no", lots).execute().data
+    status_of = {r['lot_no']: r['status'] for r in rows}
+    results = [{"lot_no": lot, "prev_status": status_of.get(lot), "status": status_of.get(lot),
+                "result": check_lot(status_of.get(lot), level)} for lot in lots]
+    ok = [r['lot_no'] for r in results if r['result'] == "ok"]
+    if not ok:
+        return results
+
+    if defect_type:
+        supabase.table("defects").insert([
+            {"lot_no": lot, "step": step, "defect_type": defect_type, "note": data, "status": "조치대기", "worker": worker}
+            for lot in ok
+        ]).execute()
+    else:
+        supabase.table("production_logs").insert([
+            {"lot_no": lot, "step": step, "data": data, "worker": worker, "result": "OK"}
+            for lot in ok
+        ]).execute()
+    supabase.table("work_orders").update({"status": new_status}).in_("lot_no", ok).execute()
+    for r in results:
+        if r['result'] == "ok":
+            r['status'] = new_status
+    return results